@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Plus,
   Video,
@@ -15,7 +15,19 @@ import {
   Trash2
 } from 'lucide-react';
 import { PropertyVideo, GenerationStatus, SystemLog } from '../types';
-import { apiService } from '../services/apiService';
+import { apiService, Job } from '../services/apiService';
+
+// Convert a backend job to the PropertyVideo shown in the table
+const toPropertyVideo = (job: Job): PropertyVideo => ({
+  id: job.id.toString(),
+  title: `Job #${job.id}`,
+  description: `Status: ${job.status}`,
+  thumbnailUrl: 'https://images.unsplash.com/photo-1560518883-ce09059eeffa?auto=format&fit=crop&q=80&w=400',
+  status: job.status as GenerationStatus,
+  createdAt: new Date(job.created_at),
+  language: job.target_language || 'en',
+  duration: 'N/A'
+});
 
 interface DashboardProps {
   onStartGenerating: () => void;
@@ -29,6 +41,10 @@ const Dashboard: React.FC<DashboardProps> = ({ onStartGenerating, recentVideos }
   const [isLogsExpanded, setIsLogsExpanded] = useState(false);
   const [stats, setStats] = useState<any>(null);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Once older pages are loaded, refreshes only replace the newest page
+  const loadedMore = useRef(false);
 
   const displayJobs = showAllJobs ? jobs : jobs.slice(0, 2);
 
@@ -36,25 +52,20 @@ const Dashboard: React.FC<DashboardProps> = ({ onStartGenerating, recentVideos }
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [fetchedJobs, fetchedLogs, fetchedStats] = await Promise.all([
-          apiService.getJobs(),
+        const [firstPage, fetchedLogs, fetchedStats] = await Promise.all([
+          apiService.getJobsPage(),
           apiService.getSystemLogs(10),
           apiService.getSystemStats()
         ]);
 
-        // Convert backend jobs to PropertyVideo format
-        const convertedJobs: PropertyVideo[] = fetchedJobs.map(job => ({
-          id: job.id.toString(),
-          title: `Job #${job.id}`,
-          description: `Status: ${job.status}`,
-          thumbnailUrl: 'https://images.unsplash.com/photo-1560518883-ce09059eeffa?auto=format&fit=crop&q=80&w=400',
-          status: job.status as GenerationStatus,
-          createdAt: new Date(job.created_at),
-          language: job.target_language || 'en',
-          duration: 'N/A'
-        }));
-
-        setJobs(convertedJobs);
+        const convertedJobs = firstPage.jobs.map(toPropertyVideo);
+        if (loadedMore.current) {
+          const oldestId = Math.min(...firstPage.jobs.map(job => job.id));
+          setJobs(current => [...convertedJobs, ...current.filter(video => parseInt(video.id) < oldestId)]);
+        } else {
+          setJobs(convertedJobs);
+          setNextCursor(firstPage.nextCursor);
+        }
         setLogs(fetchedLogs.map(log => ({
           ...log,
           timestamp: typeof log.timestamp === 'string' ? new Date(log.timestamp) : log.timestamp
@@ -73,6 +84,24 @@ const Dashboard: React.FC<DashboardProps> = ({ onStartGenerating, recentVideos }
     return () => clearInterval(interval);
   }, []);
 
+  const loadMoreJobs = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiService.getJobsPage(nextCursor);
+      loadedMore.current = true;
+      setJobs(current => {
+        const seen = new Set(current.map(video => video.id));
+        return [...current, ...page.jobs.map(toPropertyVideo).filter(video => !seen.has(video.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more jobs:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   return (
     <div className="space-y-10 max-w-[1400px] mx-auto animate-in fade-in duration-700">
       {/* Hero Section */}
@@ -196,6 +225,18 @@ const Dashboard: React.FC<DashboardProps> = ({ onStartGenerating, recentVideos }
                 </tbody>
               </table>
             </div>
+
+            {showAllJobs && nextCursor && (
+              <div className="flex justify-center pt-6">
+                <button
+                  onClick={loadMoreJobs}
+                  disabled={loadingMore}
+                  className="text-[10px] font-black uppercase tracking-widest text-zinc-500 hover:text-zinc-900 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load More'}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
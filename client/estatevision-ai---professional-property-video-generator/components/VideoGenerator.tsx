@@ -81,21 +81,21 @@ const VideoGenerator: React.FC<{ onComplete: (video: any) => void }> = ({ onComp
 
       setStatus(GenerationStatus.VOICEOVER);
 
-      // Poll for job status until completion
-      let currentStatus = await apiService.getJobStatus(result.id);
-      while (currentStatus.status !== 'COMPLETED' && currentStatus.status !== 'FAILED') {
-        await new Promise(resolve => setTimeout(resolve, 2000)); // Wait 2 seconds between polls
-        currentStatus = await apiService.getJobStatus(result.id);
+      // Follow job progress until completion
+      const currentStatus = await apiService.watchJobStatus(result.id, (update) => {
+        if (update.status === 'COMPLETED' || update.status === 'FAILED') {
+          return;
+        }
 
         // Update status based on progress
-        if (currentStatus.progress < 30) {
+        if (update.progress < 30) {
           setStatus(GenerationStatus.SCRIPTING);
-        } else if (currentStatus.progress < 60) {
+        } else if (update.progress < 60) {
           setStatus(GenerationStatus.VOICEOVER);
         } else {
           setStatus(GenerationStatus.VIDEO_GEN);
         }
-      }
+      });
 
       if (currentStatus.status === 'COMPLETED') {
         setStatus(GenerationStatus.COMPLETED);
@@ -28,6 +28,11 @@ export interface Job {
   updated_at: string;
 }
 
+export interface JobsPage {
+  jobs: Job[];
+  nextCursor: string | null;
+}
+
 export interface JobStatusResponse {
   id: number;
   status: string;
@@ -38,6 +43,10 @@ export interface JobStatusResponse {
   output_file_path?: string;
 }
 
+export type JobProgressEvent = Pick<JobStatusResponse, 'id' | 'status' | 'progress' | 'error_message' | 'output_file_path'>;
+
+const isFinished = (status: string) => status === 'COMPLETED' || status === 'FAILED';
+
 export interface VideoGenerationRequest {
   description_text: string;
   target_language: string;
@@ -98,6 +107,17 @@ export interface UserUpdateRequest {
   full_name?: string;
 }
 
+export interface UploadSession {
+  upload_id: string;
+  filename: string;
+  size: number;
+  offset: number;
+  status: string;
+  chunk_size: number;
+  sha256?: string;
+  expires_at: string;
+}
+
 export interface ChangePasswordRequest {
   current_password: string;
   new_password: string;
@@ -152,6 +172,41 @@ export const apiService = {
     return response.data;
   },
 
+  // Upload a video in resumable chunks. A failed chunk is retried from the
+  // offset the server reports, so a dropped connection only resends one chunk.
+  uploadVideoResumable: async (
+    videoFile: File,
+    onProgress?: (sentBytes: number, totalBytes: number) => void
+  ): Promise<UploadSession> => {
+    const created = await apiClient.post('/api/v1/uploads', { filename: videoFile.name, size: videoFile.size });
+    let session: UploadSession = created.data;
+    let failures = 0;
+
+    while (session.offset < session.size) {
+      const end = Math.min(session.offset + session.chunk_size, session.size);
+      try {
+        const response = await apiClient.put(`/api/v1/uploads/${session.upload_id}`, videoFile.slice(session.offset, end), {
+          headers: {
+            'Content-Type': 'application/octet-stream',
+            'Content-Range': `bytes ${session.offset}-${end - 1}/${session.size}`,
+          },
+        });
+        session = response.data;
+        failures = 0;
+      } catch (error) {
+        if (++failures > 5) {
+          throw error;
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+        session = (await apiClient.get(`/api/v1/uploads/${session.upload_id}`)).data;
+      }
+      onProgress?.(session.offset, session.size);
+    }
+
+    const completed = await apiClient.post(`/api/v1/uploads/${session.upload_id}/complete`);
+    return completed.data;
+  },
+
   // Submit a new video generation job
   submitVideoGeneration: async (
     videoFile: File,
@@ -160,19 +215,16 @@ export const apiService = {
     resolution: string = '720p',
     includeTTS: boolean = true
   ): Promise<{ id: number; status: string; progress: number }> => {
+    const upload = await apiService.uploadVideoResumable(videoFile);
+
     const formData = new FormData();
-    formData.append('video_file', videoFile);
+    formData.append('upload_id', upload.upload_id);
     formData.append('description_text', descriptionText);
     formData.append('target_language', targetLanguage);
     formData.append('resolution', resolution);
     formData.append('include_tts', includeTTS.toString());
 
-    const response = await apiClient.post('/api/v1/generate', formData, {
-      headers: {
-        'Content-Type': 'multipart/form-data',
-      },
-    });
-
+    const response = await apiClient.post('/api/v1/generate-from-upload', formData);
     return response.data;
   },
 
@@ -182,10 +234,46 @@ export const apiService = {
     return response.data;
   },
 
-  // Get list of jobs
-  getJobs: async (): Promise<Job[]> => {
-    const response = await apiClient.get('/api/v1/jobs');
-    return response.data;
+  // Follow a job until it completes or fails. Progress is pushed over
+  // server-sent events; if the stream is unavailable we fall back to polling.
+  watchJobStatus: (jobId: number, onUpdate: (update: JobProgressEvent) => void): Promise<JobProgressEvent> => {
+    const poll = async (): Promise<JobProgressEvent> => {
+      let currentStatus = await apiService.getJobStatus(jobId);
+      onUpdate(currentStatus);
+      while (!isFinished(currentStatus.status)) {
+        await new Promise(resolve => setTimeout(resolve, 2000)); // Wait 2 seconds between polls
+        currentStatus = await apiService.getJobStatus(jobId);
+        onUpdate(currentStatus);
+      }
+      return currentStatus;
+    };
+
+    if (typeof EventSource === 'undefined') {
+      return poll();
+    }
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${apiService.getBaseUrl()}/api/v1/status/${jobId}/stream`);
+      source.addEventListener('progress', (event) => {
+        const update: JobProgressEvent = JSON.parse((event as MessageEvent).data);
+        onUpdate(update);
+        if (isFinished(update.status)) {
+          source.close();
+          resolve(update);
+        }
+      });
+      source.onerror = () => {
+        source.close();
+        poll().then(resolve, reject);
+      };
+    });
+  },
+
+  // Get one page of jobs, newest first, and the cursor for the next page (null on the last page).
+  // The limit defaults to the server's page size
+  getJobsPage: async (cursor?: string, limit?: number): Promise<JobsPage> => {
+    const response = await apiClient.get('/api/v1/jobs', { params: { limit, cursor } });
+    return { jobs: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
   },
 
   // Get supported languages
@@ -3,8 +3,11 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from alembic import context
 from app.database import Base
-from app.models.job import Job, Language, Setting
+from app.models.job import Job, JobStage, Language, Setting
 from app.models.user import User, UserSession
+from app.models.system import SystemLog
+from app.models.translation import TranslationMemo
+from app.models.upload import UploadSession, StoredFile
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
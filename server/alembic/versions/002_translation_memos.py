@@ -0,0 +1,36 @@
+"""Add translation memo table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'translation_memos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('target_language', sa.String(length=10), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=False),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_hash', 'target_language', name='uq_translation_memos_source_language')
+    )
+    op.create_index(op.f('ix_translation_memos_id'), 'translation_memos', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_translation_memos_id'), table_name='translation_memos')
+    op.drop_table('translation_memos')
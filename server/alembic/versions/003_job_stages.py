@@ -0,0 +1,41 @@
+"""Add per-stage job timings
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('ended_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=False),
+        sa.Column('bytes_in', sa.BigInteger(), nullable=True),
+        sa.Column('bytes_out', sa.BigInteger(), nullable=True),
+        sa.Column('exit_code', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_stages_id'), 'job_stages', ['id'], unique=False)
+    op.create_index(op.f('ix_job_stages_job_id'), 'job_stages', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_stages_job_id'), table_name='job_stages')
+    op.drop_index(op.f('ix_job_stages_id'), table_name='job_stages')
+    op.drop_table('job_stages')
@@ -0,0 +1,35 @@
+"""Add indexes for job and system log listings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_jobs_status_id', 'jobs', ['status', 'id'], unique=False)
+    op.create_index(op.f('ix_jobs_created_at'), 'jobs', ['created_at'], unique=False)
+    # system_logs is created by create_all_tables rather than a migration
+    if _has_table('system_logs'):
+        op.create_index(op.f('ix_system_logs_timestamp'), 'system_logs', ['timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    if _has_table('system_logs'):
+        op.drop_index(op.f('ix_system_logs_timestamp'), table_name='system_logs')
+    op.drop_index(op.f('ix_jobs_created_at'), table_name='jobs')
+    op.drop_index('ix_jobs_status_id', table_name='jobs')
+
+
+def _has_table(name: str) -> bool:
+    return name in sa.inspect(op.get_bind()).get_table_names()
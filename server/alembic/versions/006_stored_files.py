@@ -0,0 +1,41 @@
+"""Add content-addressed input storage
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stored_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stored_files_id'), 'stored_files', ['id'], unique=False)
+    op.create_index(op.f('ix_stored_files_sha256'), 'stored_files', ['sha256'], unique=True)
+    op.add_column('jobs', sa.Column('input_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_jobs_input_sha256'), 'jobs', ['input_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_input_sha256'), table_name='jobs')
+    op.drop_column('jobs', 'input_sha256')
+    op.drop_index(op.f('ix_stored_files_sha256'), table_name='stored_files')
+    op.drop_index(op.f('ix_stored_files_id'), table_name='stored_files')
+    op.drop_table('stored_files')
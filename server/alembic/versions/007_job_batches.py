@@ -0,0 +1,26 @@
+"""Add batch id to jobs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('batch_id', sa.String(length=36), nullable=True))
+    op.create_index(op.f('ix_jobs_batch_id'), 'jobs', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_batch_id'), table_name='jobs')
+    op.drop_column('jobs', 'batch_id')
@@ -0,0 +1,24 @@
+"""Add parent stage to job stage timings
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('job_stages', sa.Column('parent', sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job_stages', 'parent')
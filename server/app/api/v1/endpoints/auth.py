@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from datetime import timedelta, datetime, timezone
 from typing import Optional, List
 from app.database import get_db
 from app.services.auth_service import auth_service
+from app.services.user_cache import user_cache
 from app.models.user import User
 from app.schemas.auth import (
     UserCreate,
@@ -21,28 +23,35 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+def credits_refresh_due(last_refresh: Optional[datetime], now: Optional[datetime] = None) -> bool:
+    """Check whether the daily credit refresh has not happened yet today (UTC)"""
+    if last_refresh is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    if last_refresh.tzinfo is None:
+        last_refresh = last_refresh.replace(tzinfo=timezone.utc)
+    return last_refresh.date() < now.date()
+
+
 def refresh_user_credits(db: Session, user: User):
     """Refresh user credits if it's a new day"""
-    now = datetime.now(timezone.utc)
+    if not credits_refresh_due(user.last_credits_refresh):
+        return
     
-    # If last_credits_refresh is None or it was before today (UTC)
-    should_refresh = False
-    if user.last_credits_refresh is None:
-        should_refresh = True
-    else:
-        # Check if last refresh was on a previous day
-        last_refresh = user.last_credits_refresh
-        if last_refresh.tzinfo is None:
-            last_refresh = last_refresh.replace(tzinfo=timezone.utc)
-        
-        if last_refresh.date() < now.date():
-            should_refresh = True
-            
-    if should_refresh:
-        user.credits = 1000
-        user.last_credits_refresh = now
-        db.commit()
-        db.refresh(user)
+    # Conditional so that concurrent requests refresh at most once per day
+    now = datetime.now(timezone.utc)
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    result = db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .where(or_(User.last_credits_refresh.is_(None), User.last_credits_refresh < start_of_day))
+        .values(credits=1000, last_credits_refresh=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        user_cache.invalidate(user.id)
+    db.refresh(user)
 
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
@@ -63,6 +72,12 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Recently seen users skip the query; the daily credit refresh only
+    # writes on the first request of the day
+    snapshot = user_cache.get(int(user_id))
+    if snapshot is not None and not credits_refresh_due(snapshot["last_credits_refresh"]):
+        return user_cache.attach(db, snapshot)
+    
     user = db.query(User).filter(User.id == int(user_id)).first()
     if user is None:
         raise HTTPException(
@@ -73,6 +88,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     
     # Refresh credits if needed
     refresh_user_credits(db, user)
+    user_cache.put(user)
     
     return user
 
@@ -94,7 +110,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         password = user_data.password or auth_service.generate_password()
         
         # Create the user
-        user, plain_password = auth_service.create_user(
+        user, plain_password = await auth_service.create_user_async(
             db,
             user_data.username,
             user_data.email,
@@ -125,7 +141,7 @@ async def login_user(
     db: Session = Depends(get_db)
 ):
     """Login a user and return access token"""
-    user = auth_service.authenticate_user(db, username, password)
+    user = await auth_service.authenticate_user_async(db, username, password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -226,7 +242,7 @@ async def change_password(
     db: Session = Depends(get_db)
 ):
     """Change user password"""
-    success = auth_service.change_password(
+    success = await auth_service.change_password_async(
         db,
         current_user.id,
         password_request.current_password,
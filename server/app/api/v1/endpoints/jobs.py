@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, SessionLocal
 from app.models.job import Job
-from app.schemas.job import JobCreate, JobResponse
+from app.schemas.job import JobCreate, JobResponse, JobStageResponse
 from app.workflows.video_generation import compiled_workflow
 from app.services.tts_service import TTSManager
 from app.services.video_service import VideoProcessor
+from app.utils.file_utils import stream_upload_to_file
+from app.utils.exceptions import UploadTooLargeError
+from app.config import settings
+from app.services.job_service import JobTracker
+from app.services.progress_broker import progress_broker, TERMINAL_STATUSES
 import os
+import json
 import tempfile
 from datetime import datetime
 
@@ -30,16 +37,88 @@ async def get_job_status(job_id: int, db: Session = Depends(get_db)):
         error_message=job.error_message,
         created_at=job.created_at,
         updated_at=job.updated_at,
-        output_file_path=job.output_file_path
+        output_file_path=job.output_file_path,
+        stages=[JobStageResponse.model_validate(stage) for stage in job.stages]
+    )
+
+
+def _format_sse(event: dict) -> str:
+    return f"event: progress\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _current_progress(job_id: int) -> Optional[dict]:
+    # Short-lived session: the stream itself must not hold a connection open
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            return None
+        return {
+            "id": job.id,
+            "status": job.status,
+            "progress": job.progress,
+            "error_message": job.error_message,
+            "output_file_path": job.output_file_path
+        }
+    finally:
+        db.close()
+
+
+@router.get("/status/{job_id}/stream", summary="Stream job progress")
+async def stream_job_status(job_id: int):
+    """
+    Stream progress updates for a job as server-sent events.
+
+    The current state is sent first, then one ``progress`` event per status
+    transition until the job completes or fails.
+    """
+    # Subscribe before reading so a transition between the read and the
+    # subscription can't be missed
+    queue = progress_broker.subscribe(job_id)
+    try:
+        snapshot = _current_progress(job_id)
+    except Exception:
+        progress_broker.unsubscribe(job_id, queue)
+        raise
+    if snapshot is None:
+        progress_broker.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        try:
+            yield _format_sse(snapshot)
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+            async for event in progress_broker.listen(queue, settings.progress_stream_keepalive_seconds):
+                yield ": keep-alive\n\n" if event is None else _format_sse(event)
+        finally:
+            progress_broker.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.get("/jobs", response_model=List[JobResponse], summary="Get all jobs")
-async def get_all_jobs(db: Session = Depends(get_db)):
+async def get_all_jobs(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Get all video generation jobs
+    Get video generation jobs, newest first, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
-    jobs = db.query(Job).order_by(Job.created_at.desc()).all()
+    try:
+        jobs, next_cursor = JobTracker(db).list_jobs_page(status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         JobResponse(
             id=job.id,
@@ -58,13 +137,10 @@ async def delete_job(job_id: int, db: Session = Depends(get_db)):
     """
     Delete a video generation job
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    # JobTracker also releases the job's stored input
+    if not JobTracker(db).delete_job(job_id):
         raise HTTPException(status_code=404, detail="Job not found")
     
-    db.delete(job)
-    db.commit()
-    
     return {"message": "Job deleted successfully"}
 
 
@@ -79,23 +155,21 @@ async def upload_video(video_file: UploadFile = File(...), db: Session = Depends
     if file_extension not in allowed_extensions:
         raise HTTPException(status_code=400, detail="Invalid video file format")
     
-    # Check file size (max 100MB)
-    video_file.file.seek(0, 2)  # Seek to end
-    file_size = video_file.file.tell()
-    video_file.file.seek(0)  # Seek back to beginning
-    
-    max_size_mb = 100  # From settings
-    if file_size > max_size_mb * 1024 * 1024:
-        raise HTTPException(status_code=400, detail=f"File size exceeds {max_size_mb}MB limit")
-    
-    # Save uploaded file temporarily
+    # Save uploaded file temporarily, streaming in chunks and enforcing the size limit as we go
+    max_size_mb = settings.max_video_size_mb
     with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-        contents = await video_file.read()
-        temp_file.write(contents)
         file_path = temp_file.name
     
+    try:
+        file_size, file_sha256 = await stream_upload_to_file(
+            video_file, file_path, max_bytes=max_size_mb * 1024 * 1024
+        )
+    except UploadTooLargeError:
+        raise HTTPException(status_code=400, detail=f"File size exceeds {max_size_mb}MB limit")
+    
     return {
         "filename": video_file.filename,
         "size": file_size,
-        "path": file_path
+        "path": file_path,
+        "sha256": file_sha256
     }
\ No newline at end of file
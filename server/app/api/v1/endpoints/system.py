@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.database import get_db
 from app.services.logging_service import logging_service
+from app.services.job_executor import job_executor
+from app.services.tts_cache import tts_cache
+from app.services.probe_service import probe_service
+from app.services.user_cache import user_cache
+from app.services.job_service import JobTracker
+from app.services.metrics import metrics
 from app.models.job import Job
 from app.models.system import SystemLog
 from sqlalchemy import func
@@ -12,15 +19,28 @@ router = APIRouter()
 
 
 @router.get("/logs", summary="Get system logs")
-async def get_system_logs(
-    limit: int = 50,
+def get_system_logs(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
     offset: int = 0,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ) -> List[Dict[str, Any]]:
     """
-    Retrieve recent system logs from the database
+    Retrieve recent system logs from the database, newest first.
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page;
+    ``offset`` is still accepted but reads every skipped row.
+    Declared sync so the log flush before the read runs in the threadpool.
     """
-    logs = logging_service.get_logs(db, limit, offset)
+    if offset and not cursor:
+        logs = logging_service.get_logs(db, limit, offset)
+    else:
+        try:
+            logs, next_cursor = logging_service.get_logs_page(db, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
     return [
         {
             "id": log.id,
@@ -53,7 +73,21 @@ async def get_system_stats(db: Session = Depends(get_db)) -> Dict[str, Any]:
             "completed_jobs": completed_jobs,
             "success_rate": f"{round(success_rate)}%",
             "network_uptime": "99.99%",  # Simulated for now
-            "stream_latency": "0.8ms"    # Simulated for now
+            "stream_latency": "0.8ms",   # Simulated for now
+            "job_queue": job_executor.stats(),
+            "tts_cache": tts_cache.stats(),
+            "probe_cache": probe_service.stats(),
+            "user_cache": user_cache.stats(),
+            "stage_timings": JobTracker(db).stage_percentiles()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """
+    Expose in-process counters and histograms in the Prometheus text format.
+    Scrapes only format values already held in memory; no database work is done.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
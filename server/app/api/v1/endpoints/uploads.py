@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.config import settings
+from app.models.user import User
+from app.models.upload import UploadSession
+from app.schemas.upload import UploadSessionCreate, UploadSessionResponse
+from app.api.v1.endpoints.auth import get_current_user
+from app.services.upload_service import upload_service, parse_content_range
+from app.utils.exceptions import UploadOffsetMismatchError, UploadTooLargeError
+
+router = APIRouter()
+
+
+def _session_response(upload: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=upload.id,
+        filename=upload.filename,
+        size=upload.total_size,
+        offset=upload.received_bytes,
+        status=upload.status,
+        chunk_size=settings.upload_chunk_size_kb * 1024,
+        sha256=upload.sha256,
+        expires_at=upload.expires_at
+    )
+
+
+def _get_upload(db: Session, upload_id: str, user: User) -> UploadSession:
+    upload = upload_service.get_session(db, upload_id, user.id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=201, summary="Start a resumable upload")
+async def create_upload(
+    upload_request: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable upload. Send the file in chunks with
+    PUT /uploads/{upload_id}, then finish with POST /uploads/{upload_id}/complete.
+    """
+    try:
+        upload = upload_service.create_session(db, current_user.id, upload_request.filename, upload_request.size)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=400, detail=f"File too large. Maximum size: {settings.max_video_size_mb}MB")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _session_response(upload)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionResponse, summary="Upload a chunk")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    content_range: str = Header(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Append a chunk. The body is the raw bytes and the Content-Range header
+    (``bytes start-end/total``) must start at the upload's current offset.
+    If the connection drops, GET the upload for the offset and resume there.
+    """
+    upload = _get_upload(db, upload_id, current_user)
+    try:
+        start, _, total = parse_content_range(content_range)
+        await upload_service.append_chunk(db, upload, start, total, request.stream())
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "offset": e.expected_offset}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _session_response(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse, summary="Get upload offset")
+async def get_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get how many bytes of an upload have been received
+    """
+    return _session_response(_get_upload(db, upload_id, current_user))
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=UploadSessionResponse, summary="Finish an upload")
+async def complete_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Finish an upload once every byte has been received. The upload id can
+    then be passed to /generate-from-upload.
+    """
+    upload = _get_upload(db, upload_id, current_user)
+    try:
+        await upload_service.complete(db, upload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _session_response(upload)
+
+
+@router.delete("/uploads/{upload_id}", summary="Cancel an upload")
+async def cancel_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Abandon an upload and delete what was received
+    """
+    upload_service.cancel(db, _get_upload(db, upload_id, current_user))
+    return {"message": "Upload cancelled"}
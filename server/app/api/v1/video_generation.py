@@ -2,21 +2,38 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, B
 from fastapi.responses import FileResponse
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional, Tuple
 import os
 import uuid
+import asyncio
+import shutil
 import subprocess
 from datetime import datetime
 
 from app.database import get_db
 from app.models.job import Job
 from app.models.user import User
-from app.schemas.request import VideoGenerationRequest, JobResponse, JobStatusResponse, UploadResponse
+from app.schemas.request import (
+    VideoGenerationRequest, JobResponse, JobStatusResponse, UploadResponse, BatchJobResponse, BatchResponse
+)
+from app.schemas.job import JobStageResponse
 from app.workflows.video_generation import VideoGenerationWorkflow
 from app.config import settings
-from app.services.video_service import VideoProcessingService
-from app.services.job_service import JobTracker
+from app.services.video_service import (
+    VideoProcessingService, VideoTranscode, build_multitrack_mux_command, build_narration_fanout_command,
+    build_narration_mux_command, build_stream_copy_command, build_transcode_command, parse_resolution,
+    plan_transcode
+)
+from app.services.probe_service import MediaInfo, probe_service
+from app.services.pipeline import StageTimer, run_concurrently
+from app.services.metrics import FFMPEG_DURATION, JOBS_TOTAL
+from app.services.job_service import JobProgressWriter, JobTracker
+from app.services.job_executor import job_executor
+from app.services.upload_service import upload_service
+from app.services.storage_service import content_store
 from app.api.v1.endpoints.auth import get_current_user
+from app.utils.file_utils import stream_upload_to_file
+from app.utils.exceptions import UploadTooLargeError
 from app.models.user import User
 from loguru import logger
 from app.services.simple_tts import TTSManager
@@ -38,36 +55,29 @@ logger.add("video_generation.log", rotation="10 MB")
 router = APIRouter()
 security = HTTPBearer()
 
+# "separate" writes one MP4 per language; "multitrack" writes one MP4 with a
+# language-tagged audio track per language, shared by every job in the batch
+BATCH_OUTPUT_MODES = ("separate", "multitrack")
+
 
 def save_upload_file(upload_file: UploadFile, destination: str) -> str:
     """Save uploaded file to destination path"""
     os.makedirs(os.path.dirname(destination), exist_ok=True)
     with open(destination, "wb") as buffer:
-        buffer.write(upload_file.file.read())
+        shutil.copyfileobj(upload_file.file, buffer, settings.upload_chunk_size_kb * 1024)
     return destination
 
 
-@router.post("/generate")
-async def generate_video(
-    description_text: str = Form(...),
-    target_language: str = Form("en"),
-    video_file: UploadFile = File(...),
-    resolution: str = Form("720p"),
-    include_tts: Optional[str] = Form("true"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Submit a video generation job
-    """
-    logger.info(f"Received video generation request from user {current_user.username}")
-    
+def _check_generation_request(current_user: User, description_text: str, videos: int = 1):
+    """Reject requests the user can't afford or with an oversized description"""
     # Check if user has enough credits (200 credits per video)
-    if current_user.credits < 200:
+    required = 200 * videos
+    if current_user.credits < required:
         logger.warning(f"User {current_user.username} has insufficient credits: {current_user.credits}")
+        what = "a video" if videos == 1 else f"{videos} videos"
         raise HTTPException(
             status_code=403,
-            detail=f"Insufficient credits. You need 200 credits to generate a video, but you have {current_user.credits}."
+            detail=f"Insufficient credits. You need {required} credits to generate {what}, but you have {current_user.credits}."
         )
     
     # Basic validation
@@ -76,7 +86,23 @@ async def generate_video(
             status_code=400,
             detail=f"Description text too long. Maximum length: {settings.max_description_length} characters"
         )
-    
+
+
+def _check_resolution(resolution: Optional[str]) -> str:
+    """Fall back to the configured quality and reject resolutions we can't produce"""
+    resolution = resolution or settings.video_processing_quality
+    try:
+        parse_resolution(resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return resolution
+
+
+async def _store_upload(db: Session, video_file: UploadFile, references: int = 1) -> Tuple[str, str]:
+    """
+    Stream an uploaded video into the content store, taking ``references``
+    references to it. Returns the stored path and the content hash.
+    """
     # Validate file is provided
     if not video_file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
@@ -89,50 +115,310 @@ async def generate_video(
     video_path = os.path.join(settings.upload_folder, unique_filename)
     
     try:
-        save_upload_file(video_file, video_path)
+        file_size, file_sha256 = await stream_upload_to_file(video_file, video_path)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {settings.max_video_size_mb}MB"
+        )
     except Exception as e:
         logger.error(f"Error saving uploaded file: {e}")
         raise HTTPException(status_code=500, detail="Error saving uploaded file")
     
-    # Create a job in the database
+    logger.info(f"Stored upload {unique_filename} ({file_size} bytes, sha256 {file_sha256})")
+    
     try:
-        job = Job(
-            status="PENDING",
-            progress=0,
-            input_file_path=video_path,
-            description_text=description_text,
-            target_language=target_language
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
-        
-        # Record job creation log
-        from app.services.logging_service import logging_service
-        logging_service.log(db, f"New video generation job #{job.id} initialized by {current_user.username}", level="INFO", module="JOBS")
-
-        logger.info(f"Created job {job.id} for video generation")
-        
-        # Start the video processing in the background
-        import asyncio
-        include_tts_bool = include_tts.lower() in ("true", "1", "yes", "on")
-        asyncio.create_task(process_video_with_narration(job.id, video_path, description_text, target_language, current_user.id, include_tts_bool))
-        
-        return {
-            "id": job.id,
-            "status": job.status,
-            "progress": job.progress
-        }
-        
+        # Identical videos are kept once and shared between jobs
+        return content_store.add(db, video_path, file_sha256, references).file_path, file_sha256
     except Exception as e:
-        # Clean up the saved file if DB operation fails
         if os.path.exists(video_path):
             os.remove(video_path)
+        logger.error(f"Error storing uploaded file: {e}")
+        raise HTTPException(status_code=500, detail="Error saving uploaded file")
+
+
+def _submit_job(db: Session, current_user: User, video_path: str, description_text: str,
+                target_language: str, include_tts: Optional[str], input_sha256: Optional[str] = None,
+                resolution: Optional[str] = None) -> dict:
+    """Create the job row for a stored video and queue it for processing"""
+    job = Job(
+        status="PENDING",
+        progress=0,
+        input_file_path=video_path,
+        input_sha256=input_sha256,
+        description_text=description_text,
+        target_language=target_language
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    
+    # Record job creation log
+    from app.services.logging_service import logging_service
+    logging_service.log(db, f"New video generation job #{job.id} initialized by {current_user.username}", level="INFO", module="JOBS")
+
+    logger.info(f"Created job {job.id} for video generation")
+    
+    # Hand the job to the worker pool so blocking ffmpeg/TTS work stays off the event loop
+    include_tts_bool = include_tts.lower() in ("true", "1", "yes", "on")
+    job_executor.submit(
+        job.id,
+        process_video_with_narration,
+        job.id, video_path, description_text, target_language, current_user.id, include_tts_bool, resolution
+    )
+    
+    return {
+        "id": job.id,
+        "status": job.status,
+        "progress": job.progress
+    }
+
+
+@router.post("/generate")
+async def generate_video(
+    description_text: str = Form(...),
+    target_language: str = Form("en"),
+    video_file: UploadFile = File(...),
+    resolution: Optional[str] = Form(None),
+    include_tts: Optional[str] = Form("true"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit a video generation job
+    """
+    logger.info(f"Received video generation request from user {current_user.username}")
+    _check_generation_request(current_user, description_text)
+    resolution = _check_resolution(resolution)
+    video_path, file_sha256 = await _store_upload(db, video_file)
+    
+    # Create a job in the database
+    try:
+        return _submit_job(db, current_user, video_path, description_text, target_language, include_tts,
+                           file_sha256, resolution)
+    except Exception as e:
+        # Drop the reference taken for this job; the file goes if nothing else uses it
+        db.rollback()
+        content_store.release(db, file_sha256)
+        logger.error(f"Error creating job in database: {e}")
+        raise HTTPException(status_code=500, detail="Error creating video generation job")
+
+
+@router.post("/generate-from-upload")
+async def generate_video_from_upload(
+    upload_id: str = Form(...),
+    description_text: str = Form(...),
+    target_language: str = Form("en"),
+    resolution: Optional[str] = Form(None),
+    include_tts: Optional[str] = Form("true"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit a video generation job for a completed resumable upload
+    """
+    logger.info(f"Received video generation request for upload {upload_id} from user {current_user.username}")
+    _check_generation_request(current_user, description_text)
+    resolution = _check_resolution(resolution)
+    
+    upload = upload_service.get_session(db, upload_id, current_user.id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    try:
+        upload_service.check_complete(upload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    input_sha256 = upload.sha256
+    try:
+        video_path = content_store.add(db, upload.file_path, input_sha256).file_path
+    except Exception as e:
+        # The upload is left complete, so the request can be retried
+        db.rollback()
+        logger.error(f"Error storing upload {upload_id}: {e}")
+        raise HTTPException(status_code=500, detail="Error saving uploaded file")
+    
+    try:
+        # The upload is handed over only once its file is safely in the store
+        upload_service.consume(db, upload)
+        return _submit_job(db, current_user, video_path, description_text, target_language, include_tts,
+                           input_sha256, resolution)
+    except Exception as e:
+        db.rollback()
+        content_store.release(db, input_sha256)
         logger.error(f"Error creating job in database: {e}")
         raise HTTPException(status_code=500, detail="Error creating video generation job")
 
 
-async def process_video_with_narration(job_id: int, video_path: str, description_text: str, target_language: str, user_id: int, include_tts_param: Optional[bool] = None):
+def _parse_languages(target_languages: str) -> List[str]:
+    """Split a comma-separated language list, dropping blanks and repeats"""
+    languages = []
+    for language in target_languages.split(","):
+        language = language.strip().lower()
+        if language and language not in languages:
+            languages.append(language)
+    if not languages:
+        raise HTTPException(status_code=400, detail="At least one target language is required")
+    if len(languages) > settings.max_batch_languages:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many target languages. Maximum per batch: {settings.max_batch_languages}"
+        )
+    return languages
+
+
+@router.post("/generate-batch", response_model=BatchResponse)
+async def generate_video_batch(
+    description_text: str = Form(...),
+    target_languages: str = Form(...),
+    video_file: UploadFile = File(...),
+    output_mode: str = Form("separate"),
+    resolution: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit one video narrated in several languages (``target_languages`` is
+    comma-separated, e.g. ``en,te,hi``). Each language gets its own job, and
+    the jobs share a batch id. With ``output_mode=multitrack`` every job
+    points at one MP4 carrying all the narrations as audio tracks.
+    """
+    if output_mode not in BATCH_OUTPUT_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported output mode. Allowed modes: {', '.join(BATCH_OUTPUT_MODES)}"
+        )
+    languages = _parse_languages(target_languages)
+    logger.info(f"Received batch generation request for {', '.join(languages)} from user {current_user.username}")
+    _check_generation_request(current_user, description_text, videos=len(languages))
+    resolution = _check_resolution(resolution)
+    
+    # One stored copy of the video, referenced by every job in the batch
+    video_path, file_sha256 = await _store_upload(db, video_file, references=len(languages))
+    
+    try:
+        batch_id = uuid.uuid4().hex
+        jobs = [
+            Job(
+                status="PENDING",
+                progress=0,
+                input_file_path=video_path,
+                input_sha256=file_sha256,
+                batch_id=batch_id,
+                description_text=description_text,
+                target_language=language
+            )
+            for language in languages
+        ]
+        db.add_all(jobs)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        content_store.release(db, file_sha256, references=len(languages))
+        logger.error(f"Error creating batch jobs in database: {e}")
+        raise HTTPException(status_code=500, detail="Error creating video generation jobs")
+    
+    job_ids = [job.id for job in jobs]
+    from app.services.logging_service import logging_service
+    logging_service.log(
+        db, f"New batch {batch_id} of jobs {job_ids} initialized by {current_user.username}",
+        level="INFO", module="JOBS"
+    )
+    logger.info(f"Created batch {batch_id} with jobs {job_ids}")
+    
+    # The whole batch runs as one unit of work so the video is probed and muxed once
+    job_executor.submit_batch(
+        job_ids,
+        process_batch_with_narration,
+        batch_id, job_ids, video_path, description_text, languages, current_user.id, output_mode, resolution
+    )
+    
+    return BatchResponse(batch_id=batch_id, jobs=[BatchJobResponse.model_validate(job) for job in jobs])
+
+
+@router.get("/batch/{batch_id}", response_model=BatchResponse)
+async def get_batch_status(batch_id: str, db: Session = Depends(get_db)):
+    """
+    Get the per-language jobs of a batch
+    """
+    jobs = db.query(Job).filter(Job.batch_id == batch_id).order_by(Job.id).all()
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return BatchResponse(batch_id=batch_id, jobs=[BatchJobResponse.model_validate(job) for job in jobs])
+
+
+async def generate_narration(job_id: int, timer: StageTimer, description_text: str,
+                             target_language: str, voice: str) -> str:
+    """
+    Translate and synthesize the narration for one language. Returns the path of the WAV file.
+    """
+    logger.info(f"Starting TTS generation for job {job_id}")
+    logger.info(f"Description text: {description_text[:100]}...")
+    logger.info(f"Target language: {target_language}")
+    
+    tts_manager = TTSManager()
+    
+    # Generate audio content (translation + synthesis are blocking network calls)
+    log_debug(f"Calling TTSManager for text length: {len(description_text)}")
+    with timer.stage("narration", bytes_in=len(description_text.encode("utf-8"))) as record:
+        audio_content = await asyncio.to_thread(
+            tts_manager.synthesize_speech,
+            description_text,
+            target_language,
+            voice
+        )
+        record["bytes_out"] = len(audio_content)
+    log_debug(f"TTSManager returned audio size: {len(audio_content)}")
+    
+    logger.info(f"Generated audio content size: {len(audio_content)} bytes")
+    
+    # Save audio to permanent file for debugging
+    audio_filename = f"narration_{uuid.uuid4()}.wav"
+    audio_path = os.path.join(settings.upload_folder, audio_filename)
+    
+    with open(audio_path, 'wb') as audio_file:
+        audio_file.write(audio_content)
+    
+    logger.info(f"Generated audio narration saved to: {audio_path}")
+    return audio_path
+
+
+async def transcode_video(timer: StageTimer, video_path: str, output_path: str, transcode: VideoTranscode) -> str:
+    """
+    Scale the video stream to the planned resolution into an intermediate file.
+    Runs ffmpeg off the event loop so the narration keeps generating meanwhile.
+    """
+    ffmpeg_cmd = build_transcode_command(video_path, output_path, transcode)
+    log_debug(f"Running ffmpeg command: {' '.join(ffmpeg_cmd)}")
+    with timer.stage("transcode", bytes_in=os.path.getsize(video_path)) as record:
+        result = await asyncio.to_thread(subprocess.run, ffmpeg_cmd, capture_output=True, text=True)
+        record["exit_code"] = result.returncode
+        if os.path.exists(output_path):
+            record["bytes_out"] = os.path.getsize(output_path)
+    FFMPEG_DURATION.observe(record["duration"], operation="transcode")
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg transcode error: {result.stderr}")
+    return output_path
+
+
+def _stage_progress(start: int, end: int, total: int, finished: int) -> int:
+    """
+    Progress once ``finished`` of ``total`` concurrent stages are done, moving
+    from ``start`` towards (but short of) ``end``
+    """
+    return start + (end - start) * finished // (total + 1)
+
+
+def _remove_intermediates(paths: List[str]):
+    for path in paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove intermediate file {path}: {e}")
+
+
+async def process_video_with_narration(job_id: int, video_path: str, description_text: str, target_language: str, user_id: int, include_tts_param: Optional[bool] = None, resolution: Optional[str] = None):
     """
     Process video with AI narration in the background
     """
@@ -141,6 +427,10 @@ async def process_video_with_narration(job_id: int, video_path: str, description
     
     db = next(get_db())
     settings_service = SettingsService(db)
+    timer = StageTimer(job_id)
+    progress = JobProgressWriter(db, job_id)
+    outcome = None
+    intermediates = []
     
     try:
         # Check if TTS is enabled
@@ -151,179 +441,90 @@ async def process_video_with_narration(job_id: int, video_path: str, description
             enable_tts = settings_service.get_setting_value("enable_tts", True)
         
         # Update job status to processing
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
+        if not db.query(Job.id).filter(Job.id == job_id).first():
             return
             
-        job.status = "PROCESSING"
-        job.progress = 10
-        db.commit()
+        progress.update("PROCESSING", 10)
         
         logger.info(f"Starting video processing for job {job_id}")
         
-        original_audio_path = None  # Keep track of original audio path for cleanup
-        audio_path = None
+        async def prepare_video() -> Tuple[MediaInfo, Optional[str]]:
+            with timer.stage("probe", bytes_in=os.path.getsize(video_path)) as record:
+                video_info = await probe_service.probe_async(video_path)
+                record["exit_code"] = 0
+            logger.info(f"Video duration: {video_info.duration} seconds")
+            # Scaling to the requested resolution runs alongside the narration
+            # so the mux afterwards only has to copy streams
+            transcode = plan_transcode(video_info, resolution)
+            if not transcode:
+                return video_info, None
+            scaled_path = os.path.join(settings.upload_folder, f"scaled_{uuid.uuid4()}.mp4")
+            intermediates.append(scaled_path)
+            return video_info, await transcode_video(timer, video_path, scaled_path, transcode)
+        
+        # Step 1 + 2: Narration and video preparation don't depend on each other,
+        # so they run concurrently and join at the merge
+        stages = {"video": prepare_video()}
         if enable_tts:
-            # Step 1: Generate audio narration using simple TTS
-            job.status = "GENERATING_AUDIO"
-            job.progress = 30
-            db.commit()
-            
-            logger.info(f"Starting TTS generation for job {job_id}")
-            logger.info(f"Description text: {description_text[:100]}...")
-            logger.info(f"Target language: {target_language}")
-            
             # Get default voice from settings
             default_voice = settings_service.get_setting_value("default_tts_voice", "nova")
-            
-            tts_manager = TTSManager()
-            
-            # Generate audio content
-            log_debug(f"Calling TTSManager for text length: {len(description_text)}")
-            audio_content = tts_manager.synthesize_speech(
-                description_text,
-                target_language,
-                default_voice
-            )
-            log_debug(f"TTSManager returned audio size: {len(audio_content)}")
-            
-            logger.info(f"Generated audio content size: {len(audio_content)} bytes")
-            
-            # Save audio to permanent file for debugging
-            audio_filename = f"narration_{uuid.uuid4()}.wav"
-            audio_path = os.path.join(settings.upload_folder, audio_filename)
-            original_audio_path = audio_path  # Store original path
-            
-            with open(audio_path, 'wb') as audio_file:
-                audio_file.write(audio_content)
-            
-            logger.info(f"Generated audio narration saved to: {audio_path}")
-            
-            # Get audio duration for logging
-            audio_duration_cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', audio_path
-            ]
-            audio_duration_result = subprocess.run(audio_duration_cmd, capture_output=True, text=True)
-            if audio_duration_result.returncode == 0:
-                audio_duration = float(audio_duration_result.stdout.strip())
-                logger.info(f"Generated audio duration: {audio_duration} seconds")
-            else:
-                logger.warning("Could not determine audio duration")
+            stages["audio_path"] = generate_narration(job_id, timer, description_text, target_language, default_voice)
+            progress.update("GENERATING_AUDIO", 30)
         else:
             logger.info(f"TTS is disabled via settings. Skipping narration for job {job_id}")
+            progress.update("ANALYZING_VIDEO", 50)
         
-        # Step 2: Get video duration first
-        job.status = "ANALYZING_VIDEO"
-        job.progress = 50
-        db.commit()
-        
-        # Get video duration using ffprobe
-        duration_cmd = [
-            'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-            '-of', 'csv=p=0', video_path
-        ]
-        duration_result = subprocess.run(duration_cmd, capture_output=True, text=True)
+        # Each stage that finishes moves the progress on without changing the status
+        started_at = 30 if enable_tts else 50
+        finished = 0
         
-        if duration_result.returncode != 0:
-            raise Exception(f"Failed to get video duration: {duration_result.stderr}")
+        async def tracked(stage):
+            nonlocal finished
+            result = await stage
+            finished += 1
+            progress.report(_stage_progress(started_at, 70, len(stages), finished))
+            return result
         
-        video_duration = float(duration_result.stdout.strip())
-        logger.info(f"Video duration: {video_duration} seconds")
+        results = await run_concurrently(**{name: tracked(stage) for name, stage in stages.items()})
+        audio_path = results.get("audio_path")
+        video_info, scaled_path = results["video"]
+        video_duration = video_info.duration
+        video_source = scaled_path or video_path
         
         # Step 3: Merge audio with video using ffmpeg
-        job.status = "MERGING_VIDEO"
-        job.progress = 70
-        db.commit()
+        progress.update("MERGING_VIDEO", 70)
         
         # Create output filename
         output_filename = f"output_{uuid.uuid4()}.mp4"
         output_path = os.path.join(settings.upload_folder, output_filename)
         
         if audio_path:
-            # Get audio duration to compare with video duration
-            audio_duration_cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', audio_path
-            ]
-            audio_duration_result = subprocess.run(audio_duration_cmd, capture_output=True, text=True)
-            audio_duration = 0
-            if audio_duration_result.returncode == 0:
-                audio_duration = float(audio_duration_result.stdout.strip())
-                logger.info(f"Audio duration: {audio_duration} seconds")
-            
-            # Adjust audio to match video duration before merging
-            adjusted_audio_path = audio_path
-            if audio_duration != video_duration and abs(audio_duration - video_duration) > 0.1:  # If durations are significantly different
-                logger.info(f"Adjusting audio duration from {audio_duration}s to {video_duration}s")
-                
-                # Create adjusted audio file path
-                adjusted_audio_path = audio_path.replace('.wav', '_adjusted.wav')
-                
-                if audio_duration > video_duration:
-                    # Trim audio to video duration
-                    adjust_cmd = [
-                        'ffmpeg',
-                        '-i', audio_path,
-                        '-t', str(video_duration),
-                        '-y',
-                        adjusted_audio_path
-                    ]
-                    logger.info(f"Trimming audio from {audio_duration}s to {video_duration}s")
-                else:
-                    # Pad audio with silence to match video duration
-                    adjust_cmd = [
-                        'ffmpeg',
-                        '-i', audio_path,
-                        '-af', f'apad=pad_dur={video_duration-audio_duration}',
-                        '-y',
-                        adjusted_audio_path
-                    ]
-                    logger.info(f"Padding audio from {audio_duration}s to {video_duration}s")
-                
-                # Run the adjustment command
-                adjust_result = subprocess.run(adjust_cmd, capture_output=True, text=True)
-                if adjust_result.returncode != 0:
-                    logger.warning(f"Audio adjustment failed: {adjust_result.stderr}, using original audio")
-                    adjusted_audio_path = audio_path  # Fall back to original audio
-                else:
-                    # Use the adjusted audio for merging
-                    audio_path = adjusted_audio_path
-            
-            # Use the (potentially adjusted) audio for merging
-            ffmpeg_cmd = [
-                'ffmpeg', '-y',  # -y to overwrite output file
-                '-i', video_path,  # Input video (index 0)
-                '-i', audio_path,  # Input audio (index 1)
-                '-map', '0:v:0',   # Map video from first input
-                '-map', '1:a:0',   # Map audio from second input (AI narration)
-                '-c:v', 'copy',    # Copy video stream
-                '-c:a', 'aac',     # Encode audio as AAC
-                '-b:a', '192k',    # Higher audio bitrate for better quality
-                output_path
-            ]
+            # Pad or trim the narration to the video duration inside the filtergraph
+            # and mux it in the same ffmpeg pass
+            ffmpeg_cmd = build_narration_mux_command(video_source, audio_path, output_path, video_duration)
         else:
             # If no narration, just copy the original video (or process as needed)
-            # For now, we'll just copy it to the output path to keep things consistent
-            ffmpeg_cmd = [
-                'ffmpeg', '-y',
-                '-i', video_path,
-                '-c', 'copy',
-                output_path
-            ]
+            # For now, we'll just copy it to the output path to keep things consistent.
+            # A scaled intermediate has no audio, so that comes from the original
+            ffmpeg_cmd = build_stream_copy_command(video_source, output_path,
+                                                   audio_source=video_path if scaled_path else None)
         
         # Run ffmpeg
         log_debug(f"Running ffmpeg command: {' '.join(ffmpeg_cmd)}")
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+        mux_input_bytes = os.path.getsize(video_source) + (os.path.getsize(audio_path) if audio_path else 0)
+        with timer.stage("mux", bytes_in=mux_input_bytes) as record:
+            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+            record["exit_code"] = result.returncode
+            if os.path.exists(output_path):
+                record["bytes_out"] = os.path.getsize(output_path)
+        FFMPEG_DURATION.observe(record["duration"], operation="mux")
         log_debug(f"FFmpeg return code: {result.returncode}")
         if result.stderr:
             log_debug(f"FFmpeg stderr: {result.stderr}")
         
         if result.returncode == 0:
             # Success
-            job.status = "COMPLETED"
-            job.progress = 100
-            job.output_file_path = output_path
+            outcome = {"status": "COMPLETED", "progress": 100, "output_file_path": output_path}
             
             # Deduct credits from user
             user = db.query(User).filter(User.id == user_id).first()
@@ -337,35 +538,199 @@ async def process_video_with_narration(job_id: int, video_path: str, description
             logging_service.log(db, f"Job #{job_id} processing completed successfully. 150 credits deducted.", level="SUCCESS", module="JOBS")
 
             logger.info(f"Successfully completed video processing for job {job_id}")
+            JOBS_TOTAL.inc(outcome="completed")
         else:
             # Error
-            job.status = "FAILED"
-            job.error_message = f"FFmpeg error: {result.stderr}"
+            outcome = {"status": "FAILED", "error_message": f"FFmpeg error: {result.stderr}"}
             logger.error(f"FFmpeg failed for job {job_id}: {result.stderr}")
+            JOBS_TOTAL.inc(outcome="failed")
         
         # Don't clean up audio file for debugging
         # if os.path.exists(audio_path):
         #     os.remove(audio_path)
-        # Also clean up any adjusted audio files that were created
-        if audio_path and audio_path != original_audio_path:
-            # If we used an adjusted version, clean it up
-            if os.path.exists(audio_path):
-                logger.info(f"Cleaning up adjusted audio file: {audio_path}")
-                # os.remove(audio_path)  # Uncomment when ready for production
         logger.info(f"Audio file kept for debugging: {audio_path}")
             
     except Exception as e:
         logger.error(f"Error processing video for job {job_id}: {str(e)}")
-        job.status = "FAILED"
-        job.error_message = str(e)
+        JOBS_TOTAL.inc(outcome="failed")
+        outcome = {"status": "FAILED", "error_message": str(e)}
         
         # Record job failure log
         from app.services.logging_service import logging_service
         logging_service.log(db, f"Error processing job #{job_id}: {str(e)}", level="ERROR", module="JOBS")
         
     finally:
-        db.commit()
+        _remove_intermediates(intermediates)
+        timer.log()
+        if timer.stages:
+            try:
+                JobTracker(db).record_stages(job_id, timer.stages)
+            except Exception as e:
+                logger.warning(f"Could not record stage timings for job {job_id}: {e}")
+                db.rollback()
+        # The final status is written after the stages so readers see both
+        if outcome:
+            try:
+                progress.update(**outcome)
+            except Exception as e:
+                logger.error(f"Could not record final status for job {job_id}: {e}")
         db.close()
+    # Lets the worker pool count the job as failed
+    return outcome["status"] if outcome else None
+
+
+async def process_batch_with_narration(batch_id: str, job_ids: List[int], video_path: str,
+                                       description_text: str, languages: List[str], user_id: int,
+                                       output_mode: str = "separate", resolution: Optional[str] = None):
+    """
+    Process a batch in the background: probe the video once, narrate every
+    language concurrently, then mux all narrations in a single ffmpeg run,
+    either with one output per language or as the audio tracks of one output.
+    """
+    from app.database import get_db
+    from app.services.settings_service import SettingsService
+    from app.services.logging_service import logging_service
+    
+    db = next(get_db())
+    settings_service = SettingsService(db)
+    jobs = dict(zip(languages, job_ids))
+    writers = {language: JobProgressWriter(db, job_id) for language, job_id in jobs.items()}
+    timers = {language: StageTimer(job_id) for language, job_id in jobs.items()}
+    # Probe and mux run once for the whole batch and are recorded on every job
+    shared = StageTimer(job_ids[0])
+    outcomes = {}
+    intermediates = []
+    # Each language waits on its own narration and the shared video preparation
+    finished = {language: 0 for language in languages}
+    
+    def stage_finished(language: str):
+        finished[language] += 1
+        writers[language].report(_stage_progress(30, 70, 2, finished[language]))
+    
+    try:
+        default_voice = settings_service.get_setting_value("default_tts_voice", "nova")
+        for writer in writers.values():
+            writer.update("PROCESSING", 10)
+        
+        logger.info(f"Starting batch {batch_id} for {', '.join(languages)}")
+        
+        async def narrate(language: str) -> Optional[str]:
+            try:
+                audio_path = await generate_narration(jobs[language], timers[language], description_text,
+                                                      language, default_voice)
+            except Exception as e:
+                # One language failing doesn't hold back the rest of the batch
+                logger.error(f"Narration failed for job {jobs[language]} ({language}): {e}")
+                outcomes[language] = {"status": "FAILED", "error_message": str(e)}
+                return None
+            stage_finished(language)
+            return audio_path
+        
+        async def prepare_video() -> Tuple[MediaInfo, Optional[str]]:
+            with shared.stage("probe", bytes_in=os.path.getsize(video_path)) as record:
+                video_info = await probe_service.probe_async(video_path)
+                record["exit_code"] = 0
+            logger.info(f"Video duration: {video_info.duration} seconds")
+            transcode = plan_transcode(video_info, resolution)
+            scaled_path = None
+            if transcode:
+                scaled_path = os.path.join(settings.upload_folder, f"scaled_{uuid.uuid4()}.mp4")
+                intermediates.append(scaled_path)
+                await transcode_video(shared, video_path, scaled_path, transcode)
+            for language in languages:
+                if language not in outcomes:
+                    stage_finished(language)
+            return video_info, scaled_path
+        
+        stages = {"video": prepare_video()}
+        for index, language in enumerate(languages):
+            writers[language].update("GENERATING_AUDIO", 30)
+            stages[f"audio_{index}"] = narrate(language)
+        results = await run_concurrently(**stages)
+        video_info, scaled_path = results["video"]
+        video_duration = video_info.duration
+        video_source = scaled_path or video_path
+        narrations = {
+            language: results[f"audio_{index}"]
+            for index, language in enumerate(languages)
+            if results[f"audio_{index}"]
+        }
+        
+        if narrations:
+            for language in narrations:
+                writers[language].update("MERGING_VIDEO", 70)
+            
+            if output_mode == "multitrack":
+                output_path = os.path.join(settings.upload_folder, f"output_{uuid.uuid4()}.mp4")
+                outputs = {language: output_path for language in narrations}
+                ffmpeg_cmd = build_multitrack_mux_command(
+                    video_source, list(narrations.items()), output_path, video_duration
+                )
+            else:
+                outputs = {
+                    language: os.path.join(settings.upload_folder, f"output_{uuid.uuid4()}.mp4")
+                    for language in narrations
+                }
+                ffmpeg_cmd = build_narration_fanout_command(
+                    video_source,
+                    [(narrations[language], outputs[language]) for language in narrations],
+                    video_duration
+                )
+            log_debug(f"Running ffmpeg command: {' '.join(ffmpeg_cmd)}")
+            mux_input_bytes = os.path.getsize(video_source) + sum(os.path.getsize(path) for path in narrations.values())
+            with shared.stage("mux", bytes_in=mux_input_bytes) as record:
+                result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+                record["exit_code"] = result.returncode
+                record["bytes_out"] = sum(os.path.getsize(path) for path in set(outputs.values()) if os.path.exists(path))
+            FFMPEG_DURATION.observe(record["duration"], operation="mux")
+            
+            if result.returncode == 0:
+                for language in narrations:
+                    outcomes[language] = {"status": "COMPLETED", "progress": 100, "output_file_path": outputs[language]}
+                
+                # Deduct credits for the videos that were produced
+                user = db.query(User).filter(User.id == user_id).first()
+                if user:
+                    user.credits -= 200 * len(narrations)
+                    db.commit()
+                    logger.info(f"Deducted {200 * len(narrations)} credits from user {user.username}. Remaining: {user.credits}")
+                
+                logging_service.log(db, f"Batch {batch_id} produced {len(narrations)} of {len(languages)} videos.",
+                                    level="SUCCESS", module="JOBS")
+            else:
+                logger.error(f"FFmpeg failed for batch {batch_id}: {result.stderr}")
+                for language in narrations:
+                    outcomes[language] = {"status": "FAILED", "error_message": f"FFmpeg error: {result.stderr}"}
+    
+    except Exception as e:
+        logger.error(f"Error processing batch {batch_id}: {str(e)}")
+        for language in languages:
+            outcomes.setdefault(language, {"status": "FAILED", "error_message": str(e)})
+        logging_service.log(db, f"Error processing batch {batch_id}: {str(e)}", level="ERROR", module="JOBS")
+    
+    finally:
+        _remove_intermediates(intermediates)
+        shared.log()
+        tracker = JobTracker(db)
+        for language, job_id in jobs.items():
+            timers[language].log()
+            try:
+                tracker.record_stages(job_id, shared.stages + timers[language].stages)
+            except Exception as e:
+                logger.warning(f"Could not record stage timings for job {job_id}: {e}")
+                db.rollback()
+            outcome = outcomes.get(language)
+            if outcome:
+                JOBS_TOTAL.inc(outcome=outcome["status"].lower())
+                try:
+                    writers[language].update(**outcome)
+                except Exception as e:
+                    logger.error(f"Could not record final status for job {job_id}: {e}")
+        db.close()
+    # The batch counts as failed in the worker pool unless every language completed
+    if all(outcomes.get(language, {}).get("status") == "COMPLETED" for language in languages):
+        return "COMPLETED"
+    return "FAILED"
 
 
 async def run_video_generation_workflow(input_data: dict, job_id: int):
@@ -430,7 +795,8 @@ async def get_job_status(job_id: int, db: Session = Depends(get_db)):
         progress=job.progress,
         error_message=job.error_message,
         created_at=job.created_at,
-        updated_at=job.updated_at
+        updated_at=job.updated_at,
+        stages=[JobStageResponse.model_validate(stage) for stage in job.stages]
     )
 
 
@@ -450,27 +816,20 @@ async def upload_video(video_file: UploadFile = File(...)):
             detail=f"Unsupported file format. Allowed formats: {', '.join(settings.allowed_video_formats)}"
         )
     
-    # Validate file size
-    video_file.file.seek(0, 2)  # Seek to end of file
-    file_size = video_file.file.tell()
-    video_file.file.seek(0)  # Seek back to beginning
-    
-    max_size_bytes = settings.max_video_size_mb * 1024 * 1024
-    if file_size > max_size_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {settings.max_video_size_mb}MB"
-        )
-    
     # Create upload directory if it doesn't exist
     os.makedirs(settings.upload_folder, exist_ok=True)
     
-    # Save the uploaded video file
+    # Save the uploaded video file, enforcing the size limit while streaming
     unique_filename = f"{uuid.uuid4()}_{video_file.filename}"
     video_path = os.path.join(settings.upload_folder, unique_filename)
     
     try:
-        save_upload_file(video_file, video_path)
+        file_size, file_sha256 = await stream_upload_to_file(video_file, video_path)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {settings.max_video_size_mb}MB"
+        )
     except Exception as e:
         logger.error(f"Error saving uploaded file: {e}")
         raise HTTPException(status_code=500, detail="Error saving uploaded file")
@@ -478,7 +837,8 @@ async def upload_video(video_file: UploadFile = File(...)):
     return UploadResponse(
         filename=unique_filename,
         size=file_size,
-        path=video_path
+        path=video_path,
+        sha256=file_sha256
     )
 
 
@@ -494,30 +854,6 @@ async def get_supported_languages():
     ]
 
 
-@router.get("/jobs")
-async def list_jobs(status: Optional[str] = None, limit: int = 100, offset: int = 0, db: Session = Depends(get_db)):
-    """
-    List video generation jobs with optional filtering
-    """
-    job_tracker = JobTracker(db)
-    jobs = job_tracker.list_jobs(
-        status=status,
-        limit=limit,
-        offset=offset
-    )
-    
-    return [
-        JobStatusResponse(
-            id=job.id,
-            status=job.status,
-            progress=job.progress,
-            error_message=job.error_message,
-            created_at=job.created_at,
-            updated_at=job.updated_at
-        ) for job in jobs
-    ]
-
-
 @router.delete("/jobs/{job_id}")
 async def delete_job(job_id: int, db: Session = Depends(get_db)):
     """
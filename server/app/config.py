@@ -7,6 +7,15 @@ import json
 class Settings(BaseSettings):
     # Database settings
     database_url: str = "sqlite:///./estatevision_ai.db"
+    sqlite_journal_mode: str = "WAL"  # WAL lets API reads proceed while jobs commit progress
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size_mb: int = 256
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 10  # Pool settings apply to server databases (PostgreSQL/MySQL)
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
     
     # API Keys
     openai_api_key: Optional[str] = None
@@ -18,6 +27,9 @@ class Settings(BaseSettings):
     # Security
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
+    user_cache_ttl_seconds: float = 30.0  # How long an authenticated user is served without a query
+    user_cache_max_entries: int = 1024
+    password_hash_workers: int = 4  # Concurrent bcrypt hashes/verifications, run off the event loop
     access_token_expire_minutes: int = 30
     
     # CORS settings
@@ -39,19 +51,43 @@ class Settings(BaseSettings):
         # Default CORS origins
         return ["http://localhost:3000", "http://localhost:5173", "http://localhost:8000", "https://*.onrender.com"]  # Update for production deployment
     
+    # Outbound HTTP settings (Gemini / OpenAI)
+    http_pool_connections: int = 10  # Number of hosts to keep pools for
+    http_pool_maxsize: int = 10  # Keep-alive connections per host
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 30.0
+    
     # TTS settings
     default_tts_voice: str = "nova"
+    enable_tts_cache: bool = True
+    tts_chunk_max_chars: int = 600  # Narration is synthesized in sentence-aligned chunks of this size
+    tts_chunk_workers: int = 4
+    tts_cache_max_mb: int = 512
     
     # Video processing settings
     max_video_size_mb: int = 100
+    upload_chunk_size_kb: int = 1024
+    upload_session_ttl_hours: int = 24  # Unfinished resumable uploads are purged after this
+    probe_cache_max_entries: int = 256  # ffprobe results kept in memory, keyed by path, size and mtime
     max_description_length: int = 5000
-    video_processing_quality: str = "720p"
+    max_batch_languages: int = 8  # Target languages accepted by one /generate-batch request
+    video_processing_quality: str = "720p"  # Output resolution when a request doesn't give one
+    enable_video_transcode: bool = False  # Scale sources larger than the requested resolution
+    video_transcode_preset: str = "veryfast"  # x264 preset
+    video_transcode_crf: int = 23
+    video_transcode_threads: int = 0  # 0 lets x264 use every core
     upload_folder: str = "./uploads"
     allowed_video_formats: List[str] = ["mp4", "avi", "mov", "mkv", "webm", "flv", "3gp", "wmv"]
     
     # System settings
     enable_tts_fallback: bool = True
     tts_fallback_service: str = "google"
+    log_batch_size: int = 100  # System log rows written per bulk insert
+    log_flush_interval_seconds: float = 1.0
+    log_queue_max: int = 10000  # Rows buffered before log() applies back-pressure
+    log_enqueue_timeout_seconds: float = 0.5  # How long log() waits for room off the event loop before dropping
+    job_progress_min_interval_seconds: float = 1.0  # Minimum time between progress-only job writes
+    progress_stream_keepalive_seconds: float = 15.0  # Idle time before an SSE comment keeps the stream open
     
     # Email settings
     enable_email_notifications: bool = False
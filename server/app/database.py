@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from loguru import logger
 
 # Create database URL
 if settings.database_url.startswith("sqlite"):
@@ -11,11 +14,54 @@ else:
     # For PostgreSQL/MySQL, use the provided URL
     SQLALCHEMY_DATABASE_URL = settings.database_url
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    # Add connect_args for SQLite to allow multiple threads
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-)
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """
+    Pragmas applied to every new SQLite connection
+    """
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "busy_timeout": settings.sqlite_busy_timeout_ms
+    }
+
+
+def create_db_engine(url: str, pragmas: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Create an engine with the configured performance profile.
+
+    SQLite connections get the pragmas from ``sqlite_pragmas`` (or
+    ``pragmas``) as they are opened; other databases get an explicitly
+    sized connection pool.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(
+            url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping
+        )
+
+    # Allow connections to be used from worker threads
+    sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(sqlite_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return sqlite_engine
+
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -24,10 +70,24 @@ Base = declarative_base()
 # Create all tables
 def create_all_tables():
     # Import models here to avoid circular imports
-    from app.models.job import Job, Language, Setting
+    from app.models.job import Job, JobStage, Language, Setting
     from app.models.user import User, UserSession
     from app.models.system import SystemLog
+    from app.models.translation import TranslationMemo
+    from app.models.upload import UploadSession, StoredFile
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips tables that already exist, so add indexes introduced since.
+    # New columns on existing tables come from the alembic migrations
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            missing = [column.name for column in index.columns if column.name not in existing]
+            if missing:
+                logger.warning(f"{table.name} has no {', '.join(missing)} column; run `alembic upgrade head`")
+                continue
+            index.create(bind=engine, checkfirst=True)
 
 
 def get_db():
@@ -3,8 +3,11 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse
 from app.api.v1.api import api_router
-from app.database import create_all_tables
+from app.database import SessionLocal, create_all_tables
 from app.config import settings
+from app.services.job_executor import job_executor
+from app.services.job_service import JobTracker
+from app.services.logging_service import logging_service
 from seed_user import seed_admin_user
 import os
 from pathlib import Path
@@ -26,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor for /jobs and /logs
 )
 
 # Include API router (must be before static files)
@@ -45,6 +49,22 @@ if FRONTEND_DIST.exists():
     if assets_path.exists():
         app.mount("/assets", StaticFiles(directory=str(assets_path)), name="frontend_assets")
 
+@app.on_event("shutdown")
+def shutdown_job_executor():
+    """Let running video jobs finish and fail the queued ones that will never start"""
+    cancelled = job_executor.shutdown(wait=True, cancel_futures=True)
+    if cancelled:
+        db = SessionLocal()
+        try:
+            JobTracker(db).fail_unfinished(cancelled, "Server shut down before the job started")
+        finally:
+            db.close()
+
+@app.on_event("shutdown")
+def shutdown_logging_service():
+    """Write buffered system logs (including those from finishing jobs)"""
+    logging_service.shutdown()
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "message": "API is running"}
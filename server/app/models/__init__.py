@@ -1,4 +1,4 @@
-from .job import Job, Language
+from .job import Job, JobStage, Language
 from .base import Base
 
-__all__ = ["Job", "Language", "Base"]
\ No newline at end of file
+__all__ = ["Job", "JobStage", "Language", "Base"]
\ No newline at end of file
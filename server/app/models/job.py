@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -34,17 +35,43 @@ class Setting(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves status-filtered listings paginated newest first by id
+        Index("ix_jobs_status_id", "status", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     status = Column(String(50), default="PENDING", nullable=False)
     input_file_path = Column(String(500), nullable=False)
+    input_sha256 = Column(String(64), nullable=True, index=True)  # Set when the input is in the content store
+    batch_id = Column(String(36), nullable=True, index=True)  # Shared by the per-language jobs of one batch
     description_text = Column(Text, nullable=False)
     target_language = Column(String(10), nullable=False)
     output_file_path = Column(String(500), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     error_message = Column(Text, nullable=True)
     progress = Column(Integer, default=0)  # 0-100 percentage
     
+    stages = relationship("JobStage", cascade="all, delete-orphan", order_by="JobStage.id")
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, status='{self.status}', target_language='{self.target_language}')>"
+
+
+class JobStage(Base):
+    __tablename__ = "job_stages"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), index=True, nullable=False)
+    stage = Column(String(50), nullable=False)  # narration, translate, synthesize:gtts, probe, mux, ...
+    parent = Column(String(50), nullable=True)  # Enclosing stage for nested stages; None at the top level
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=False)
+    duration = Column(Float, nullable=False)  # Seconds
+    bytes_in = Column(BigInteger, nullable=True)
+    bytes_out = Column(BigInteger, nullable=True)
+    exit_code = Column(Integer, nullable=True)  # Subprocess exit code, when the stage ran one
+    
     def __repr__(self):
-        return f"<Job(id={self.id}, status='{self.status}', target_language='{self.target_language}')>"
\ No newline at end of file
+        return f"<JobStage(job_id={self.job_id}, stage='{self.stage}', duration={self.duration:.3f})>"
\ No newline at end of file
@@ -10,7 +10,7 @@ class SystemLog(Base):
     level = Column(String(20), default="INFO")  # INFO, SUCCESS, ERROR, WARNING
     module = Column(String(100))  # AUTH, API, JOBS, SYSTEM
     message = Column(Text, nullable=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     def __repr__(self):
         return f"<SystemLog(level='{self.level}', module='{self.module}', message='{self.message[:20]}...')>"
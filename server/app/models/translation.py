@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class TranslationMemo(Base):
+    __tablename__ = "translation_memos"
+    __table_args__ = (
+        UniqueConstraint("source_hash", "target_language", name="uq_translation_memos_source_language"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_hash = Column(String(64), nullable=False)  # sha256 of the normalized source sentence
+    target_language = Column(String(10), nullable=False)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<TranslationMemo(target_language='{self.target_language}', source='{self.source_text[:20]}...')>"
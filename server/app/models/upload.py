@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(36), primary_key=True)  # Random, unguessable upload id
+    user_id = Column(Integer, nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    file_path = Column(String(500), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    received_bytes = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="UPLOADING")  # UPLOADING, COMPLETE, CONSUMED
+    sha256 = Column(String(64), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<UploadSession(id='{self.id}', received={self.received_bytes}/{self.total_size}, status='{self.status}')>"
+
+
+class StoredFile(Base):
+    __tablename__ = "stored_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    file_path = Column(String(500), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Jobs using this file as their input
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<StoredFile(sha256='{self.sha256[:12]}...', ref_count={self.ref_count})>"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -8,6 +8,20 @@ class JobCreate(BaseModel):
     target_language: str = "en"
 
 
+class JobStageResponse(BaseModel):
+    stage: str
+    parent: Optional[str] = None
+    started_at: datetime
+    ended_at: datetime
+    duration: float
+    bytes_in: Optional[int] = None
+    bytes_out: Optional[int] = None
+    exit_code: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
 class JobResponse(BaseModel):
     id: int
     status: str
@@ -16,6 +30,7 @@ class JobResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     output_file_path: Optional[str] = None
+    stages: List[JobStageResponse] = []
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from app.schemas.job import JobStageResponse
 
 
 class JobStatus(str, Enum):
@@ -41,6 +42,7 @@ class JobStatusResponse(BaseModel):
     error_message: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    stages: List[JobStageResponse] = []
     
     class Config:
         from_attributes = True
@@ -49,4 +51,20 @@ class JobStatusResponse(BaseModel):
 class UploadResponse(BaseModel):
     filename: str
     size: int
-    path: str
\ No newline at end of file
+    path: str
+    sha256: Optional[str] = None
+
+class BatchJobResponse(BaseModel):
+    id: int
+    target_language: str
+    status: str
+    progress: int = 0
+    error_message: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    jobs: List[BatchJobResponse]
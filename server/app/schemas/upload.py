@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int = Field(..., gt=0, description="Total size of the file in bytes")
+
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    offset: int = Field(..., description="Bytes received so far; the next chunk starts here")
+    status: str
+    chunk_size: int = Field(..., description="Suggested chunk size in bytes")
+    sha256: Optional[str] = None
+    expires_at: datetime
@@ -0,0 +1,94 @@
+import io
+import time
+import struct
+import subprocess
+import wave
+from typing import List, Optional
+from app.services.metrics import FFMPEG_DURATION
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = 44100, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Wrap raw little-endian PCM samples in a WAV header
+    """
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    header = struct.pack('<4sI4s4sIHHIIHH4sI',
+        b'RIFF',
+        36 + len(pcm),  # File size
+        b'WAVE',
+        b'fmt ',
+        16,  # PCM format chunk size
+        1,   # PCM format
+        channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        sample_width * 8,  # Bits per sample
+        b'data',
+        len(pcm)  # Data size
+    )
+    return header + pcm
+
+
+def read_wav(data: bytes):
+    """
+    Return ((channels, sample_width, sample_rate), pcm_frames) for a WAV file
+    """
+    with wave.open(io.BytesIO(data), 'rb') as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        frames = wav.readframes(wav.getnframes())
+    return params, frames
+
+
+def concat_wav(parts: List[bytes]) -> bytes:
+    """
+    Join WAV files with identical formats by concatenating their PCM frames.
+    No decoding or re-encoding takes place, so the joins are sample-exact.
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    params = None
+    frames = []
+    for part in parts:
+        part_params, part_frames = read_wav(part)
+        if params is None:
+            params = part_params
+        elif part_params != params:
+            raise ValueError(f"Cannot join WAV chunks with different formats: {params} vs {part_params}")
+        frames.append(part_frames)
+
+    channels, sample_width, sample_rate = params
+    return pcm_to_wav(b"".join(frames), sample_rate, channels, sample_width)
+
+
+def decode_to_wav(
+    data: bytes,
+    input_format: Optional[str] = None,
+    sample_rate: int = 44100,
+    channels: int = 1
+) -> bytes:
+    """
+    Decode compressed audio (MP3, OGG, ...) to 16-bit PCM WAV entirely in memory.
+    The bytes are piped through ffmpeg's stdin and raw PCM is read back from stdout,
+    so no temporary files are written. The WAV header is built here because ffmpeg
+    cannot seek back to fill in sizes when writing WAV to a pipe.
+    """
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+    if input_format:
+        cmd += ['-f', input_format]
+    cmd += [
+        '-i', 'pipe:0',
+        '-f', 's16le', '-acodec', 'pcm_s16le',
+        '-ar', str(sample_rate), '-ac', str(channels),
+        'pipe:1'
+    ]
+
+    started = time.perf_counter()
+    result = subprocess.run(cmd, input=data, capture_output=True)
+    FFMPEG_DURATION.observe(time.perf_counter() - started, operation="decode")
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"ffmpeg audio decode failed: {result.stderr.decode(errors='replace')}")
+
+    return pcm_to_wav(result.stdout, sample_rate=sample_rate, channels=channels)
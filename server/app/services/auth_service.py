@@ -1,22 +1,66 @@
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+import asyncio
 import secrets
 import string
+import threading
+import time
 from app.models.user import User, UserSession
 from app.config import settings
+from app.services.metrics import metrics
 import jwt
 
 
 import bcrypt
 
 
+PASSWORD_HASH_DURATION = metrics.histogram(
+    "password_hash_duration_seconds", "Time spent hashing or verifying passwords", ["operation"]
+)
+
+
 class AuthService:
-    def __init__(self):
+    def __init__(self, password_workers: Optional[int] = None):
         self.algorithm = "HS256"
         self.secret_key = settings.secret_key
         self.access_token_expire_minutes = settings.access_token_expire_minutes
+        self.password_workers = max(1, password_workers or settings.password_hash_workers)
+        self._password_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _run_password_task(self, operation: str, func, *args):
+        """
+        Run a bcrypt call on the bounded password pool.
+        bcrypt releases the GIL, so the event loop keeps serving other
+        requests while at most ``password_workers`` hashes run.
+        """
+        if self._password_pool is None:
+            with self._pool_lock:
+                if self._password_pool is None:
+                    self._password_pool = ThreadPoolExecutor(
+                        max_workers=self.password_workers,
+                        thread_name_prefix="password-hash"
+                    )
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation=operation)
+
+        return asyncio.get_running_loop().run_in_executor(self._password_pool, timed)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await self._run_password_task("verify", self.verify_password, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await self._run_password_task("hash", self.get_password_hash, password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a plain password against the hashed password using bcrypt"""
@@ -64,6 +108,13 @@ class AuthService:
             return None
         return user
 
+    async def authenticate_user_async(self, db: Session, username: str, password: str) -> Optional[User]:
+        """Authenticate a user, verifying the password on the password pool"""
+        user = self.get_user_by_username(db, username)
+        if not user or not await self.verify_password_async(password, user.hashed_password):
+            return None
+        return user
+
     def get_user_by_username(self, db: Session, username: str) -> Optional[User]:
         """Get a user by username"""
         return db.query(User).filter(User.username == username).first()
@@ -76,8 +127,15 @@ class AuthService:
         """Create a new user with auto-generated password"""
         # Hash the password
         hashed_password = self.get_password_hash(password)
+        # Return user and plain password for initial login
+        return self._insert_user(db, username, email, hashed_password, full_name), password
+
+    async def create_user_async(self, db: Session, username: str, email: str, password: str, full_name: str = None) -> Tuple[User, str]:
+        """Create a new user, hashing the password on the password pool"""
+        hashed_password = await self.get_password_hash_async(password)
+        return self._insert_user(db, username, email, hashed_password, full_name), password
 
-        # Create the user
+    def _insert_user(self, db: Session, username: str, email: str, hashed_password: str, full_name: Optional[str]) -> User:
         user = User(
             username=username,
             email=email,
@@ -89,7 +147,7 @@ class AuthService:
             db.add(user)
             db.commit()
             db.refresh(user)
-            return user, password  # Return user and plain password for initial login
+            return user
         except IntegrityError:
             db.rollback()
             raise ValueError("Username or email already exists")
@@ -125,6 +183,19 @@ class AuthService:
         db.commit()
         return True
 
+    async def change_password_async(self, db: Session, user_id: int, current_password: str, new_password: str) -> bool:
+        """Change user password, running bcrypt on the password pool"""
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return False
+
+        if not await self.verify_password_async(current_password, user.hashed_password):
+            return False
+
+        user.hashed_password = await self.get_password_hash_async(new_password)
+        db.commit()
+        return True
+
     def generate_password(self, length: int = 12) -> str:
         """Generate a random password"""
         alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
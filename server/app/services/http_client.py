@@ -0,0 +1,101 @@
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+from app.config import settings
+
+
+class HTTPClientPool:
+    """
+    Shared, pooled HTTP clients for the external AI APIs.
+
+    A single ``requests.Session`` keeps connections alive between Gemini calls
+    so each request after the first skips the TCP and TLS handshake. The OpenAI
+    SDK client is built once per API key on top of a pooled httpx client with
+    the same limits.
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None
+    ):
+        self.pool_connections = pool_connections or settings.http_pool_connections
+        self.pool_maxsize = pool_maxsize or settings.http_pool_maxsize
+        self.connect_timeout = connect_timeout or settings.http_connect_timeout
+        self.read_timeout = read_timeout or settings.http_read_timeout
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._openai_clients = {}
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def session(self) -> requests.Session:
+        """
+        Get the shared keep-alive session, creating it on first use
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=True
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        POST through the pooled session using the configured timeouts by default
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session().post(url, **kwargs)
+
+    def openai_client(self, api_key: Optional[str] = None):
+        """
+        Get a shared OpenAI client for the API key, backed by a pooled httpx client
+        """
+        import httpx
+        import openai
+
+        api_key = api_key or settings.openai_api_key
+        with self._lock:
+            client = self._openai_clients.get(api_key)
+            if client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_maxsize,
+                        max_keepalive_connections=self.pool_maxsize
+                    ),
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+                )
+                client = openai.OpenAI(api_key=api_key, http_client=http_client)
+                self._openai_clients[api_key] = client
+            return client
+
+    def close(self):
+        """
+        Close pooled connections
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            for client in self._openai_clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.warning(f"Error closing OpenAI client: {e}")
+            self._openai_clients = {}
+
+
+# Global HTTP client pool instance
+http_client = HTTPClientPool()
@@ -0,0 +1,176 @@
+import time
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from loguru import logger
+from app.config import settings
+from app.schemas.request import JobStatus
+from app.services.metrics import JOB_DURATION, JOBS_QUEUED, JOBS_RUNNING
+
+
+class JobExecutor:
+    """
+    Bounded worker pool for video generation jobs.
+
+    Jobs run on dedicated worker threads instead of the API event loop, so the
+    blocking ffmpeg/ffprobe, TTS and HTTP calls they make never stall request
+    handling. At most ``max_workers`` jobs run at once; the rest wait in the
+    pool's queue.
+
+    Job functions handle their own errors, so besides raising they can report
+    a failure by returning ``JobStatus.FAILED``; both count as failed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or settings.max_concurrent_jobs)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="job-worker"
+        )
+        self._lock = threading.Lock()
+        self._active: Dict[int, str] = {}
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled: List[int] = []
+        self._futures: Dict[int, Future] = {}
+
+    def submit(self, job_id: int, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue ``func`` for execution on a worker thread.
+
+        Coroutine functions are driven to completion on a private event loop
+        owned by the worker thread.
+        """
+        return self.submit_batch([job_id], func, *args, **kwargs)
+
+    def submit_batch(self, job_ids: List[int], func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue ``func`` as one unit of work that carries every job in ``job_ids``.
+
+        The jobs share a worker and a future, but the queued/running/finished
+        counts and ``/metrics`` account for each job, and ``when_finished``
+        works for any of them. The unit's outcome counts for all its jobs.
+        """
+        job_ids = list(job_ids)
+        # Count the jobs before handing them over: a free worker may start
+        # them (and decrement the count) before _pool.submit returns
+        with self._lock:
+            self._queued += len(job_ids)
+            for job_id in job_ids:
+                self._active[job_id] = "QUEUED"
+            JOBS_QUEUED.set(self._queued)
+
+        try:
+            future = self._pool.submit(self._run, job_ids, func, *args, **kwargs)
+        except RuntimeError:
+            # The pool has been shut down; the jobs were never queued
+            with self._lock:
+                self._queued -= len(job_ids)
+                for job_id in job_ids:
+                    self._active.pop(job_id, None)
+                JOBS_QUEUED.set(self._queued)
+            raise
+
+        with self._lock:
+            for job_id in job_ids:
+                self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._on_done(job_ids, done))
+        logger.info(f"Queued jobs {job_ids} ({self._queued} queued, {self._running} running)")
+        return future
+
+    def _run(self, job_ids: List[int], func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self._queued -= len(job_ids)
+            self._running += len(job_ids)
+            for job_id in job_ids:
+                self._active[job_id] = "RUNNING"
+            JOBS_QUEUED.set(self._queued)
+            JOBS_RUNNING.set(self._running)
+
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            if inspect.iscoroutinefunction(func):
+                result = asyncio.run(func(*args, **kwargs))
+            else:
+                result = func(*args, **kwargs)
+            succeeded = result != JobStatus.FAILED
+            return result
+        except Exception as e:
+            logger.error(f"Jobs {job_ids} raised in worker: {e}")
+            raise
+        finally:
+            JOB_DURATION.observe(time.perf_counter() - started)
+            with self._lock:
+                self._running -= len(job_ids)
+                JOBS_RUNNING.set(self._running)
+                if succeeded:
+                    self._completed += len(job_ids)
+                else:
+                    self._failed += len(job_ids)
+                for job_id in job_ids:
+                    self._active.pop(job_id, None)
+
+    def _on_done(self, job_ids: List[int], future: Future):
+        with self._lock:
+            for job_id in job_ids:
+                if self._futures.get(job_id) is future:
+                    del self._futures[job_id]
+            # Queued jobs cancelled by shutdown never reach _run
+            if not future.cancelled():
+                return
+            self._queued -= len(job_ids)
+            for job_id in job_ids:
+                self._active.pop(job_id, None)
+            self._cancelled.extend(job_ids)
+            JOBS_QUEUED.set(self._queued)
+
+    def when_finished(self, job_id: int, callback: Callable[[], Any]) -> bool:
+        """
+        Call ``callback`` once the queued or running job ``job_id`` has finished
+        or been cancelled. Returns False, without calling it, if this pool isn't
+        holding the job.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            return False
+        # Runs straight away if the job finished in the meantime
+        future.add_done_callback(lambda _: callback())
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the pool's queued/running/finished accounting
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": len(self._cancelled),
+                "active_jobs": dict(self._active)
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> List[int]:
+        """
+        Stop accepting jobs and optionally wait for running ones to finish.
+        With ``cancel_futures`` queued jobs are dropped instead of started;
+        returns the ids of every job that was cancelled this way.
+        """
+        logger.info("Shutting down job executor")
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+        with self._lock:
+            if self._cancelled:
+                logger.warning(f"Cancelled {len(self._cancelled)} queued jobs: {self._cancelled}")
+            return list(self._cancelled)
+
+
+# Global job executor instance
+job_executor = JobExecutor()
@@ -1,10 +1,17 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
-from app.models.job import Job
+import time
+from app.database import SessionLocal
+from app.models.job import Job, JobStage
 from app.schemas.request import JobStatus
 from app.config import settings
+from app.utils.pagination import keyset_page
+from app.services.progress_broker import progress_broker, TERMINAL_STATUSES
+from app.services.storage_service import content_store
+from app.services.job_executor import job_executor
 from loguru import logger
 
 
@@ -58,6 +65,7 @@ class JobTracker:
         
         self.db.commit()
         self.db.refresh(job)
+        progress_broker.publish_job(job)
         
         logger.info(f"Updated job {job_id} status to {job.status}, progress: {job.progress}%")
         return job
@@ -75,31 +83,114 @@ class JobTracker:
         """
         return self.get_job(job_id)
     
-    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100, offset: int = 0) -> List[Job]:
+    def list_jobs_page(self, status: Optional[JobStatus] = None, limit: int = 50,
+                       cursor: Optional[str] = None) -> Tuple[List[Job], Optional[str]]:
         """
-        List jobs with optional filtering by status
+        List jobs newest first using keyset pagination.
+        Returns the page and the cursor for the next one (None on the last page).
         """
         query = self.db.query(Job)
         
         if status:
-            query = query.filter(Job.status == status.value if isinstance(status, JobStatus) else status)
+            query = query.filter(Job.status == (status.value if isinstance(status, JobStatus) else status))
         
-        jobs = query.offset(offset).limit(limit).all()
-        return jobs
+        return keyset_page(query, Job.id, limit, cursor)
     
     def delete_job(self, job_id: int) -> bool:
         """
-        Delete a job by ID
+        Delete a job by ID. If a worker still holds the job, its stored input
+        is released once the worker has finished with it.
         """
         job = self.db.query(Job).filter(Job.id == job_id).first()
         if not job:
             return False
         
+        input_sha256 = job.input_sha256
         self.db.delete(job)
         self.db.commit()
+        if input_sha256:
+            if job_executor.when_finished(job_id, lambda: _release_input(input_sha256)):
+                logger.info(f"Job {job_id} is still queued or running; its input is released when it finishes")
+            else:
+                content_store.release(self.db, input_sha256)
         logger.info(f"Deleted job with ID: {job_id}")
         return True
     
+    def fail_unfinished(self, job_ids: List[int], error_message: str) -> int:
+        """
+        Mark the given jobs, and the rest of any batch they head, FAILED unless
+        they already finished. Used for jobs that will never run, e.g. when the
+        worker pool is shut down with jobs still queued.
+        """
+        batch_ids = {
+            batch_id for (batch_id,) in
+            self.db.query(Job.batch_id).filter(Job.id.in_(job_ids), Job.batch_id.isnot(None))
+        }
+        query = self.db.query(Job).filter(Job.status.notin_(TERMINAL_STATUSES))
+        if batch_ids:
+            query = query.filter(Job.id.in_(job_ids) | Job.batch_id.in_(batch_ids))
+        else:
+            query = query.filter(Job.id.in_(job_ids))
+        
+        jobs = query.all()
+        for job in jobs:
+            job.status = JobStatus.FAILED.value
+            job.error_message = error_message
+            job.updated_at = datetime.utcnow()
+        self.db.commit()
+        for job in jobs:
+            progress_broker.publish_job(job)
+        
+        if jobs:
+            logger.warning(f"Marked unfinished jobs {[job.id for job in jobs]} as FAILED: {error_message}")
+        return len(jobs)
+    
+    def record_stages(self, job_id: int, stages: List[Dict[str, Any]]):
+        """
+        Persist stage timings collected by a StageTimer
+        """
+        for record in stages:
+            self.db.add(JobStage(
+                job_id=job_id,
+                stage=record["stage"],
+                parent=record.get("parent"),
+                started_at=record["started_at"],
+                ended_at=record["ended_at"],
+                duration=record["duration"],
+                bytes_in=record.get("bytes_in"),
+                bytes_out=record.get("bytes_out"),
+                exit_code=record.get("exit_code")
+            ))
+        self.db.commit()
+    
+    def get_job_stages(self, job_id: int) -> List[JobStage]:
+        """
+        Get the recorded stages of a job in the order they finished
+        """
+        return self.db.query(JobStage).filter(JobStage.job_id == job_id).order_by(JobStage.id).all()
+    
+    def stage_percentiles(self, window: int = 1000) -> Dict[str, Dict[str, float]]:
+        """
+        p50/p95/p99 duration per stage over the most recent ``window`` stage records.
+        Nested stages are reported as ``parent/stage`` so they aren't mixed
+        with top-level stages of the same name.
+        """
+        rows = self.db.query(JobStage.stage, JobStage.parent, JobStage.duration) \
+            .order_by(JobStage.id.desc()).limit(window).all()
+        
+        durations: Dict[str, List[float]] = {}
+        for stage, parent, duration in rows:
+            durations.setdefault(f"{parent}/{stage}" if parent else stage, []).append(duration)
+        
+        return {
+            stage: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99)
+            } for stage, values in sorted(durations.items())
+        }
+    
     def cleanup_old_jobs(self, days_old: int = 7) -> int:
         """
         Clean up completed jobs older than specified days
@@ -114,31 +205,146 @@ class JobTracker:
         ).all()
         
         deleted_count = 0
+        released = []
+        outputs = set()
         for job in old_jobs:
-            # Delete associated files if they exist
-            if job.input_file_path and os.path.exists(job.input_file_path):
+            # Inputs in the content store may be shared; they are released
+            # once the jobs are gone and deleted with their last reference
+            if job.input_sha256:
+                released.append(job.input_sha256)
+            elif job.input_file_path and os.path.exists(job.input_file_path):
                 try:
                     os.remove(job.input_file_path)
                     logger.info(f"Deleted input file for job {job.id}: {job.input_file_path}")
                 except Exception as e:
                     logger.error(f"Error deleting input file for job {job.id}: {e}")
             
-            if job.output_file_path and os.path.exists(job.output_file_path):
-                try:
-                    os.remove(job.output_file_path)
-                    logger.info(f"Deleted output file for job {job.id}: {job.output_file_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting output file for job {job.id}: {e}")
+            if job.output_file_path:
+                outputs.add(job.output_file_path)
             
             # Delete the job record
             self.db.delete(job)
             deleted_count += 1
         
         self.db.commit()
+        for input_sha256 in released:
+            content_store.release(self.db, input_sha256)
+        for output_path in outputs:
+            # A multi-track output is shared by every job of its batch
+            if self.db.query(Job.id).filter(Job.output_file_path == output_path).first():
+                continue
+            if os.path.exists(output_path):
+                try:
+                    os.remove(output_path)
+                    logger.info(f"Deleted output file {output_path}")
+                except Exception as e:
+                    logger.error(f"Error deleting output file {output_path}: {e}")
         logger.info(f"Cleaned up {deleted_count} old jobs")
         return deleted_count
 
 
+def _release_input(sha256: str):
+    # Called from a worker thread, after the request's session is gone
+    db = SessionLocal()
+    try:
+        content_store.release(db, sha256)
+    except Exception as e:
+        logger.error(f"Could not release stored input {sha256}: {e}")
+    finally:
+        db.close()
+
+
+class JobProgressWriter:
+    """
+    Coalescing writer for a running job's status and progress.
+
+    Keeps the job id and the latest values in memory instead of re-loading the
+    row for every transition. A status change is written straight away with a
+    single UPDATE; progress-only updates (see ``report``) are written when at
+    least ``min_interval`` seconds have passed since the previous write, and
+    those in between are merged and written by the next write or ``flush``.
+    Every update is published to the progress broker whether or not it was
+    written.
+    """
+    
+    def __init__(self, db: Session, job_id: int, min_interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.db = db
+        self.job_id = job_id
+        self.min_interval = min_interval if min_interval is not None else settings.job_progress_min_interval_seconds
+        self._clock = clock
+        self._pending: Dict[str, Any] = {}
+        self._written: Dict[str, Any] = {}
+        self._last_write: Optional[float] = None
+        self.writes = 0
+    
+    def update(self, status: JobStatus, progress: Optional[int] = None, error_message: Optional[str] = None,
+               output_file_path: Optional[str] = None) -> bool:
+        """
+        Record a transition. Returns True if it was written to the database.
+        """
+        status = status.value if isinstance(status, JobStatus) else status
+        self._pending["status"] = status
+        if progress is not None:
+            self._pending["progress"] = progress
+        if error_message is not None:
+            self._pending["error_message"] = error_message
+        if output_file_path is not None:
+            self._pending["output_file_path"] = output_file_path
+        
+        # Only progress is coalesced; readers polling the row must see every status
+        due = self._last_write is None or self._clock() - self._last_write >= self.min_interval
+        written = self.flush() if due or status != self._written.get("status") else False
+        
+        current = {**self._written, **self._pending}
+        progress_broker.publish(
+            self.job_id, current["status"], current.get("progress"), current.get("error_message"),
+            output_file_path=current.get("output_file_path")
+        )
+        return written
+    
+    def report(self, progress: int) -> bool:
+        """
+        Record a progress-only update under the current status. Returns True if
+        it was written to the database.
+        """
+        return self.update(self._pending.get("status", self._written.get("status")), progress)
+    
+    def flush(self) -> bool:
+        """
+        Write pending values now. Returns True if an UPDATE was issued.
+        """
+        changes = {key: value for key, value in self._pending.items() if self._written.get(key) != value}
+        if not changes:
+            self._pending.clear()
+            return False
+        
+        try:
+            self.db.execute(
+                update(Job).where(Job.id == self.job_id).values(**changes, updated_at=datetime.utcnow())
+            )
+            self.db.commit()
+        except Exception:
+            # Keep the pending values so the next write retries them
+            self.db.rollback()
+            raise
+        
+        self._written.update(changes)
+        self._pending.clear()
+        self._last_write = self._clock()
+        self.writes += 1
+        return True
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a non-empty list
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(n * pct / 100)
+    return round(ordered[int(rank) - 1], 3)
+
+
 # Global job tracker instance (in production, you'd want to use dependency injection)
 def get_job_tracker(db: Session) -> JobTracker:
     """
@@ -1,30 +1,166 @@
+import queue
+import asyncio
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from loguru import logger
+from app.config import settings
+from app.database import SessionLocal
 from app.models.system import SystemLog
-from typing import List, Optional
+from app.services.metrics import metrics
+from app.utils.pagination import keyset_page
+
+
+LOG_ROWS_WRITTEN = metrics.counter("system_log_rows_written_total", "System log rows flushed to the database")
+LOG_ROWS_DROPPED = metrics.counter("system_log_rows_dropped_total", "System log rows dropped because the sink was full")
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
 
 
 class LoggingService:
-    def log(self, db: Session, message: str, level: str = "INFO", module: str = "SYSTEM"):
-        """Record a system log in the database"""
+    """
+    Buffered sink for system log rows.
+
+    ``log`` only enqueues the row; a background thread writes queued rows in
+    bulk, on its own session, once ``batch_size`` rows are waiting or
+    ``flush_interval`` seconds have passed. The caller's session and
+    transaction are never touched. When the queue is full, callers off the
+    event loop wait up to ``enqueue_timeout`` seconds for room; on an event
+    loop ``log`` never blocks. Rows that still don't fit are dropped and
+    counted.
+
+    ``get_logs``/``get_logs_page`` flush before reading and so do blocking
+    I/O; call them from a worker thread, not the event loop.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        enqueue_timeout: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.log_batch_size
+        self.flush_interval = flush_interval or settings.log_flush_interval_seconds
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else settings.log_enqueue_timeout_seconds
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue or settings.log_queue_max)
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def log(self, db: Optional[Session], message: str, level: str = "INFO", module: str = "SYSTEM"):
+        """
+        Queue a system log row. ``db`` is accepted for compatibility with
+        existing callers but is not used; rows are written by the sink.
+        """
+        row = {
+            "message": message,
+            "level": level,
+            "module": module,
+            "timestamp": datetime.utcnow()
+        }
+        self._ensure_started()
         try:
-            new_log = SystemLog(
-                message=message,
-                level=level,
-                module=module
-            )
-            db.add(new_log)
-            db.commit()
-            db.refresh(new_log)
-            return new_log
-        except Exception as e:
-            print(f"Error recording log: {e}")
-            db.rollback()
+            if _on_event_loop():
+                # Waiting for room would stall every request on the loop
+                self._queue.put_nowait(row)
+            else:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            if self._queue.qsize() >= self.batch_size:
+                self._wakeup.set()
+            return row
+        except queue.Full:
+            LOG_ROWS_DROPPED.inc()
+            logger.warning(f"System log sink is full, dropping log: {message[:80]}")
             return None
 
     def get_logs(self, db: Session, limit: int = 50, offset: int = 0) -> List[SystemLog]:
         """Retrieve recent system logs"""
+        self.flush()
         return db.query(SystemLog).order_by(SystemLog.timestamp.desc()).offset(offset).limit(limit).all()
 
+    def get_logs_page(self, db: Session, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[SystemLog], Optional[str]]:
+        """Retrieve a page of system logs, newest first, and the cursor for the next page"""
+        self.flush()
+        return keyset_page(db.query(SystemLog), SystemLog.id, limit, cursor)
+
+    def flush(self) -> int:
+        """
+        Write every queued row now. Returns the number of rows written.
+        """
+        # Holding the lock across drain and write means a caller that flushes
+        # (e.g. get_logs) also waits for a batch the flusher has in hand
+        with self._write_lock:
+            written = 0
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def shutdown(self):
+        """
+        Stop the background flusher and write whatever is still queued
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self):
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._thread.start()
+
+    def _drain(self, limit: int) -> List[dict]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        # Flush when a full batch is waiting or the interval elapses, whichever is first
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write(self, batch: List[dict]) -> int:
+        db = self.session_factory()
+        try:
+            db.execute(insert(SystemLog), batch)
+            db.commit()
+            LOG_ROWS_WRITTEN.inc(len(batch))
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} system logs: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
 
 # Global logging service instance
 logging_service = LoggingService()
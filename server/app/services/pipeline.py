@@ -0,0 +1,111 @@
+import time
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Awaitable, Dict, List, Optional
+from loguru import logger
+from app.services.metrics import STAGE_DURATION
+
+
+# The timer and stage that code running on behalf of a job reports into.
+# asyncio tasks and asyncio.to_thread copy these, so services called from a
+# stage can record nested stages without having the timer passed to them.
+_current_timer: ContextVar[Optional["StageTimer"]] = ContextVar("stage_timer", default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar("current_stage", default=None)
+
+
+class StageTimer:
+    """
+    Wall-clock timings for the stages of one job.
+
+    Stages may overlap, so the sum of stage durations can exceed the job's
+    elapsed time; the difference is the time saved by running them
+    concurrently. Stages opened inside another stage (e.g. translation inside
+    narration) are recorded with their parent and left out of that sum.
+    """
+
+    def __init__(self, job_id: Optional[int] = None):
+        self.job_id = job_id
+        self.stages: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, bytes_in: Optional[int] = None):
+        """
+        Time the enclosed block as stage ``name``.
+        The yielded record can be given ``bytes_out`` and ``exit_code``.
+        """
+        record = {
+            "stage": name,
+            "parent": _current_stage.get(),
+            "started_at": datetime.utcnow(),
+            "start": time.perf_counter() - self._started,
+            "bytes_in": bytes_in,
+            "bytes_out": None,
+            "exit_code": None
+        }
+        timer_token = _current_timer.set(self)
+        stage_token = _current_stage.set(name)
+        try:
+            yield record
+        finally:
+            _current_stage.reset(stage_token)
+            _current_timer.reset(timer_token)
+            record["end"] = time.perf_counter() - self._started
+            record["duration"] = record["end"] - record["start"]
+            record["ended_at"] = datetime.utcnow()
+            self.stages.append(record)
+            STAGE_DURATION.observe(record["duration"], stage=name)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-stage durations plus total elapsed and sequential (summed) time
+        """
+        return {
+            "stages": {record["stage"]: round(record["duration"], 3) for record in self.stages},
+            "elapsed": round(self.elapsed(), 3),
+            "sequential": round(sum(record["duration"] for record in self.stages if record["parent"] is None), 3)
+        }
+
+    def log(self):
+        summary = self.summary()
+        stages = ", ".join(f"{name}={duration:.2f}s" for name, duration in summary["stages"].items())
+        logger.info(
+            f"Job {self.job_id} stage timings: {stages}; "
+            f"elapsed {summary['elapsed']:.2f}s vs {summary['sequential']:.2f}s sequential"
+        )
+
+
+@contextmanager
+def timed_stage(name: str, bytes_in: Optional[int] = None):
+    """
+    Record a stage on the timer of the job being processed, if there is one.
+    Outside of a timed job this only yields a throwaway record.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield {}
+        return
+    with timer.stage(name, bytes_in=bytes_in) as record:
+        yield record
+
+
+async def run_concurrently(**stages: Awaitable) -> Dict[str, Any]:
+    """
+    Run independent stages at the same time and wait for all of them.
+
+    Returns each stage's result by name. If any stage fails, the others are
+    cancelled and the first error is raised as-is.
+    """
+    tasks = {}
+    try:
+        async with asyncio.TaskGroup() as group:
+            for name, awaitable in stages.items():
+                tasks[name] = group.create_task(awaitable)
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0]
+    return {name: task.result() for name, task in tasks.items()}
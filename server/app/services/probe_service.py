@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import asyncio
+import subprocess
+import threading
+from concurrent.futures import Future
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+from app.config import settings
+from app.services.metrics import FFMPEG_DURATION
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """Metadata for a media file, parsed from a single ffprobe run"""
+    path: str
+    duration: float
+    format_name: Optional[str] = None
+    size: Optional[int] = None
+    video_codec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    frame_rate: Optional[float] = None
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    raw: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+    @classmethod
+    def from_ffprobe(cls, path: str, data: Dict[str, Any]) -> "MediaInfo":
+        streams = data.get("streams", [])
+        fmt = data.get("format", {})
+        video = next((s for s in streams if s.get("codec_type") == "video"), {})
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+
+        duration = _to_float(fmt.get("duration"))
+        if duration is None:
+            stream_durations = [_to_float(s.get("duration")) for s in streams]
+            duration = max((d for d in stream_durations if d is not None), default=0.0)
+
+        return cls(
+            path=path,
+            duration=duration,
+            format_name=fmt.get("format_name"),
+            size=_to_int(fmt.get("size")),
+            video_codec=video.get("codec_name"),
+            width=_to_int(video.get("width")),
+            height=_to_int(video.get("height")),
+            frame_rate=_parse_rate(video.get("avg_frame_rate")),
+            audio_codec=audio.get("codec_name"),
+            sample_rate=_to_int(audio.get("sample_rate")),
+            channels=_to_int(audio.get("channels")),
+            raw=data
+        )
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_rate(value) -> Optional[float]:
+    if not value or "/" not in str(value):
+        return _to_float(value)
+    num, den = str(value).split("/", 1)
+    num, den = _to_float(num), _to_float(den)
+    return num / den if num is not None and den else None
+
+
+class ProbeService:
+    """
+    Runs ffprobe at most once per file version and shares the result.
+
+    Results are cached in-process keyed by (real path, size, mtime), so a file
+    that is rewritten is probed again while repeated lookups during a job are
+    free. The cache holds at most ``max_entries`` results and evicts the least
+    recently used.
+
+    Concurrent misses for the same file version are coalesced: the first
+    caller runs ffprobe and the others wait on its result, whether they come
+    from worker threads (``probe``) or the event loop (``probe_async``).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.probe_cache_max_entries
+        self._cache: "OrderedDict[Tuple[str, int, int], MediaInfo]" = OrderedDict()
+        self._pending: Dict[Tuple[str, int, int], Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def command(path: str):
+        return [
+            'ffprobe',
+            '-v', 'quiet',
+            '-print_format', 'json',
+            '-show_format',
+            '-show_streams',
+            path
+        ]
+
+    @staticmethod
+    def _identity(path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+
+    def _claim(self, key) -> Tuple[Optional[MediaInfo], Optional[Future]]:
+        """
+        Return ``(info, None)`` on a cache hit, ``(None, future)`` when another
+        caller is already probing this file version, and ``(None, None)`` when
+        the caller must run ffprobe and pass the outcome to ``_settle``.
+        """
+        with self._lock:
+            info = self._cache.get(key)
+            if info is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return info, None
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return None, pending
+            self.misses += 1
+            pending = self._pending[key] = Future()
+            pending.set_running_or_notify_cancel()
+            return None, None
+
+    def _settle(self, key, info: Optional[MediaInfo] = None, error: Optional[BaseException] = None):
+        with self._lock:
+            if info is not None:
+                self._cache[key] = info
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            pending = self._pending.pop(key)
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(info)
+
+    def _parse(self, path: str, returncode: int, stdout: bytes, stderr: bytes) -> MediaInfo:
+        if returncode != 0:
+            error_msg = stderr.decode(errors="replace")
+            logger.error(f"ffprobe error: {error_msg}")
+            raise RuntimeError(f"ffprobe failed with error: {error_msg}")
+        return MediaInfo.from_ffprobe(path, json.loads(stdout.decode()))
+
+    def probe(self, path: str) -> MediaInfo:
+        """
+        Probe a file, blocking the calling thread on a cache miss
+        """
+        key = self._identity(path)
+        info, pending = self._claim(key)
+        if info is not None:
+            return info
+        if pending is not None:
+            return pending.result()
+
+        try:
+            started = time.perf_counter()
+            result = subprocess.run(self.command(path), capture_output=True)
+            FFMPEG_DURATION.observe(time.perf_counter() - started, operation="ffprobe")
+            info = self._parse(path, result.returncode, result.stdout, result.stderr)
+        except BaseException as e:
+            self._settle(key, error=e)
+            raise
+        self._settle(key, info)
+        return info
+
+    async def probe_async(self, path: str) -> MediaInfo:
+        """
+        Probe a file without blocking the event loop on a cache miss
+        """
+        key = self._identity(path)
+        info, pending = self._claim(key)
+        if info is not None:
+            return info
+        if pending is not None:
+            return await asyncio.wrap_future(pending)
+
+        try:
+            started = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                *self.command(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            FFMPEG_DURATION.observe(time.perf_counter() - started, operation="ffprobe")
+            info = self._parse(path, process.returncode, stdout, stderr)
+        except BaseException as e:
+            self._settle(key, error=e)
+            raise
+        self._settle(key, info)
+        return info
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# Global probe service instance
+probe_service = ProbeService()
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from loguru import logger
+from app.services.metrics import metrics
+
+
+TERMINAL_STATUSES = {"COMPLETED", "FAILED"}
+
+PROGRESS_SUBSCRIBERS = metrics.gauge("progress_subscribers", "Open job progress streams")
+PROGRESS_EVENTS = metrics.counter("progress_events_published_total", "Job progress updates published to the broker")
+
+
+class ProgressBroker:
+    """
+    In-process publish/subscribe hub for job progress.
+
+    Workers publish status transitions from any thread (job workers run their
+    own event loops); each subscriber is an asyncio queue owned by the loop
+    that serves its stream, and events are handed over with
+    ``call_soon_threadsafe``. Subscriber queues are bounded; when a slow client
+    falls behind, the oldest update is dropped since each event is a full
+    snapshot of the job's state.
+    """
+
+    def __init__(self, queue_size: int = 32):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, job_id: int, status: str, progress: Optional[int] = None,
+                error_message: Optional[str] = None, **extra: Any):
+        """
+        Send a progress snapshot to every subscriber of the job
+        """
+        event = {"id": job_id, "status": status, "progress": progress, "error_message": error_message, **extra}
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        PROGRESS_EVENTS.inc()
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has closed; it is removed when its stream ends
+                logger.debug(f"Dropping progress event for job {job_id}: subscriber loop closed")
+
+    def publish_job(self, job):
+        """
+        Publish the committed state of a Job row
+        """
+        self.publish(job.id, job.status, job.progress, job.error_message,
+                     output_file_path=job.output_file_path)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: Dict[str, Any]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def subscribe(self, job_id: int) -> asyncio.Queue:
+        """
+        Register a queue on the running loop that receives the job's events
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(entry)
+        PROGRESS_SUBSCRIBERS.inc()
+        return queue
+
+    def unsubscribe(self, job_id: int, queue: asyncio.Queue):
+        with self._lock:
+            entries = self._subscribers.get(job_id, [])
+            remaining = [entry for entry in entries if entry[1] is not queue]
+            if remaining:
+                self._subscribers[job_id] = remaining
+            else:
+                self._subscribers.pop(job_id, None)
+            removed = len(entries) - len(remaining)
+        if removed:
+            PROGRESS_SUBSCRIBERS.dec(removed)
+
+    async def listen(self, queue: asyncio.Queue, keepalive: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield events from a subscription until a terminal status arrives.
+        Yields None when ``keepalive`` seconds pass without an event.
+        """
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield event
+            if event["status"] in TERMINAL_STATUSES:
+                return
+
+    def subscriber_count(self, job_id: Optional[int] = None) -> int:
+        with self._lock:
+            if job_id is not None:
+                return len(self._subscribers.get(job_id, ()))
+            return sum(len(entries) for entries in self._subscribers.values())
+
+
+# Global progress broker instance
+progress_broker = ProgressBroker()
@@ -1,11 +1,17 @@
 import os
-import requests
 import json
 from app.config import settings
-from typing import Optional
+from typing import List, Optional
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
+from app.services.tts_cache import tts_cache
+from app.services.translation_cache import translation_cache, split_sentences
+from app.services.http_client import http_client
+from app.services.audio_utils import concat_wav, decode_to_wav, pcm_to_wav
+from app.services.pipeline import timed_stage
+from app.services.metrics import TTS_ENGINE_ATTEMPTS, TTS_REQUESTS
 import datetime
 
 def log_debug(msg):
@@ -16,6 +22,30 @@ def log_debug(msg):
     except Exception:
         pass
 
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, breaking at sentence boundaries.
+    Sentences longer than max_chars are broken at word boundaries.
+    """
+    pieces = []
+    for sentence, _ in split_sentences(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks or [text]
+
 class SimpleTTSService:
     """
     Simple TTS service using Google Gemini for translation and system TTS
@@ -27,7 +57,7 @@ class SimpleTTSService:
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
     
     def translate_text(self, text: str, target_language: str) -> str:
-        """Translate text using Google Gemini"""
+        """Translate text using Google Gemini, reusing memoized sentence translations"""
         if not self.api_key or self.api_key == "your_google_api_key_here":
             # If no API key, return original text
             return text
@@ -35,6 +65,19 @@ class SimpleTTSService:
         if target_language == "en":
             return text
         
+        try:
+            return translation_cache.translate(
+                text,
+                target_language,
+                lambda chunk: self._request_translation(chunk, target_language)
+            )
+        except Exception as e:
+            print(f"Translation error: {str(e)}")
+            log_debug(f"Translation error: {str(e)}")
+            return text
+    
+    def _request_translation(self, text: str, target_language: str) -> str:
+        """Send one translation request to Gemini, raising on failure"""
         language_names = {
             "te": "Telugu", "es": "Spanish", "fr": "French", "de": "German",
             "it": "Italian", "pt": "Portuguese", "ru": "Russian", "ja": "Japanese",
@@ -43,7 +86,10 @@ class SimpleTTSService:
         
         target_lang_name = language_names.get(target_language, target_language)
         
-        prompt = f"Translate this text to {target_lang_name}. Return only the translation:\n\n{text}"
+        prompt = (
+            f"Translate this text to {target_lang_name}. Keep any [n] line markers. "
+            f"Return only the translation:\n\n{text}"
+        )
         
         headers = {"Content-Type": "application/json"}
         data = {
@@ -51,77 +97,99 @@ class SimpleTTSService:
             "generationConfig": {"temperature": 0.1, "maxOutputTokens": 1000}
         }
         
-        try:
-            log_debug(f"Translating to {target_lang_name} using Gemini...")
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                headers=headers,
-                data=json.dumps(data),
-                timeout=30
-            )
-            
-            log_debug(f"Gemini API Response: {response.status_code}")
-            if response.status_code != 200:
-                log_debug(f"Gemini Error Body: {response.text}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    trans = result["candidates"][0]["content"]["parts"][0]["text"].strip()
-                    log_debug(f"Translation success: {trans[:50]}...")
-                    return trans
-            
-            print(f"Translation failed: {response.status_code}")
-            log_debug(f"Translation failed: {response.status_code}")
-            return text
-            
-        except Exception as e:
-            print(f"Translation error: {str(e)}")
-            log_debug(f"Translation error: {str(e)}")
-            return text
+        log_debug(f"Translating to {target_lang_name} using Gemini...")
+        response = http_client.post(
+            f"{self.base_url}?key={self.api_key}",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        
+        log_debug(f"Gemini API Response: {response.status_code}")
+        if response.status_code != 200:
+            log_debug(f"Gemini Error Body: {response.text}")
+        
+        if response.status_code == 200:
+            result = response.json()
+            if "candidates" in result and len(result["candidates"]) > 0:
+                trans = result["candidates"][0]["content"]["parts"][0]["text"].strip()
+                log_debug(f"Translation success: {trans[:50]}...")
+                return trans
+        
+        print(f"Translation failed: {response.status_code}")
+        log_debug(f"Translation failed: {response.status_code}")
+        raise Exception(f"Translation failed: {response.status_code}")
     
     def synthesize_speech(self, text: str, language_code: str, voice_name: str) -> bytes:
         """Generate speech using system TTS or OpenAI"""
         
+        # Engines in order of preference: (name, generate, max chunk length, parallel workers)
+        chunk_chars = settings.tts_chunk_max_chars
+        workers = settings.tts_chunk_workers
+        engines = [("gtts", lambda t: self._generate_gtts(t, language_code), chunk_chars, workers)]
+        if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here":
+            engines.append(("openai", self._generate_openai_tts, min(chunk_chars, 4000), workers))  # OpenAI limit
+        engines.append(("pyttsx3", self._generate_pyttsx3_tts, chunk_chars, 1))  # pyttsx3 is not thread-safe
+        
+        # A cached narration for the same description skips both translation and synthesis
+        if settings.enable_tts_cache:
+            cached_audio = tts_cache.lookup(text, language_code, voice_name, [engine[0] for engine in engines])
+            if cached_audio is not None:
+                log_debug(f"TTS cache hit. Audio size: {len(cached_audio)}")
+                TTS_REQUESTS.inc(source="cache")
+                return cached_audio
+        
         # First translate if needed
         if language_code != "en":
-            translated_text = self.translate_text(text, language_code)
+            with timed_stage("translate", bytes_in=len(text.encode("utf-8"))) as record:
+                translated_text = self.translate_text(text, language_code)
+                record["bytes_out"] = len(translated_text.encode("utf-8"))
         else:
             translated_text = text
         
         log_debug(f"Generating TTS for: {translated_text[:100]}...")
         print(f"Generating TTS for: {translated_text[:100]}...")
         
-        # Try different TTS methods in order of preference
-        
-        # Method 1: Try Google TTS (gTTS) - requires internet
-        try:
-            log_debug("Attempting gTTS...")
-            return self._generate_gtts(translated_text, language_code)
-        except Exception as e:
-            log_debug(f"Google TTS failed: {e}")
-            logger.warning(f"Google TTS failed: {e}")
-        
-        # Method 2: Try OpenAI TTS if API key is available
-        if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here":
+        # Try different TTS methods in order of preference:
+        # Google TTS (gTTS, requires internet), OpenAI TTS if an API key is available,
+        # then pyttsx3 (offline TTS)
+        for position, (engine_name, generate, max_chars, max_workers) in enumerate(engines):
             try:
-                return self._generate_openai_tts(translated_text)
+                log_debug(f"Attempting {engine_name}...")
+                chunks = chunk_text(translated_text, max_chars)
+                with timed_stage(f"synthesize:{engine_name}", bytes_in=len(translated_text.encode("utf-8"))) as record:
+                    audio_content = self._synthesize_chunks(generate, chunks, max_workers)
+                    record["bytes_out"] = len(audio_content)
             except Exception as e:
-                logger.warning(f"OpenAI TTS failed: {e}")
-        
-        # Method 3: Try pyttsx3 (offline TTS)
-        try:
-            log_debug("Attempting pyttsx3...")
-            return self._generate_pyttsx3_tts(translated_text)
-        except Exception as e:
-            log_debug(f"Pyttsx3 TTS failed: {e}")
-            logger.warning(f"Pyttsx3 TTS failed: {e}")
+                log_debug(f"{engine_name} TTS failed: {e}")
+                logger.warning(f"{engine_name} TTS failed: {e}")
+                TTS_ENGINE_ATTEMPTS.inc(engine=engine_name, outcome="failure")
+                continue
+            
+            TTS_ENGINE_ATTEMPTS.inc(engine=engine_name, outcome="success")
+            TTS_REQUESTS.inc(source="primary" if position == 0 else "fallback")
+            # The cache is keyed on the source text, so don't store untranslated
+            # speech under a target language when translation fell back
+            translation_fell_back = language_code != "en" and translated_text == text
+            if settings.enable_tts_cache and not translation_fell_back:
+                tts_cache.store(text, language_code, voice_name, engine_name, audio_content)
+            return audio_content
         
         # Fallback: Create a longer silent audio with text info
         log_debug("All TTS methods failed! Creating silent audio fallback.")
         logger.error("All TTS methods failed! Creating silent audio fallback.")
+        TTS_REQUESTS.inc(source="silent")
         return self._create_text_based_audio(translated_text)
     
+    def _synthesize_chunks(self, generate, chunks: List[str], max_workers: int) -> bytes:
+        """Synthesize text chunks concurrently and join their PCM in order"""
+        if len(chunks) == 1:
+            return generate(chunks[0])
+        
+        log_debug(f"Synthesizing {len(chunks)} chunks with {max_workers} workers")
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            parts = list(pool.map(generate, chunks))
+        return concat_wav(parts)
+    
     def _generate_gtts(self, text: str, language_code: str = "en") -> bytes:
         """Generate TTS using Google Text-to-Speech"""
         from gtts import gTTS
@@ -147,40 +215,16 @@ class SimpleTTSService:
         lang = lang_map.get(language_code, "en")
         
         # Create gTTS object
-        tts = gTTS(text=text[:1000], lang=lang, slow=False)  # Limit text length
+        tts = gTTS(text=text, lang=lang, slow=False)
         
         # Save to bytes
         mp3_fp = io.BytesIO()
         tts.write_to_fp(mp3_fp)
-        mp3_fp.seek(0)
-        
-        # Convert MP3 to WAV using ffmpeg
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as mp3_file:
-            mp3_file.write(mp3_fp.read())
-            mp3_path = mp3_file.name
-        
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_file:
-            wav_path = wav_file.name
         
-        # Convert MP3 to WAV
-        cmd = ['ffmpeg', '-y', '-i', mp3_path, '-acodec', 'pcm_s16le', '-ar', '44100', wav_path]
-        result = subprocess.run(cmd, capture_output=True)
-        
-        if result.returncode == 0 and os.path.exists(wav_path):
-            with open(wav_path, 'rb') as f:
-                audio_content = f.read()
-            os.unlink(mp3_path)
-            os.unlink(wav_path)
-            log_debug(f"gTTS success. Audio size: {len(audio_content)}")
-            return audio_content
-        
-        # Cleanup and raise error
-        if os.path.exists(mp3_path):
-            os.unlink(mp3_path)
-        if os.path.exists(wav_path):
-            os.unlink(wav_path)
-        
-        raise Exception(f"gTTS conversion failed: {result.stderr}")
+        # Convert MP3 to WAV through ffmpeg pipes, without temp files
+        audio_content = decode_to_wav(mp3_fp.getvalue(), input_format="mp3")
+        log_debug(f"gTTS success. Audio size: {len(audio_content)}")
+        return audio_content
     
     def _generate_pyttsx3_tts(self, text: str) -> bytes:
         """Generate TTS using pyttsx3 (offline)"""
@@ -195,7 +239,7 @@ class SimpleTTSService:
             engine.setProperty('volume', 0.9)  # Volume
             
             # Save to file
-            engine.save_to_file(text[:500], temp_path)
+            engine.save_to_file(text, temp_path)
             engine.runAndWait()
             
             if os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
@@ -212,17 +256,17 @@ class SimpleTTSService:
         raise Exception("Pyttsx3 produced no audio")
     def _generate_openai_tts(self, text: str) -> bytes:
         """Generate TTS using OpenAI API"""
-        import openai
-        
-        client = openai.OpenAI(api_key=settings.openai_api_key)
+        client = http_client.openai_client()
         
+        # Raw 24 kHz 16-bit mono PCM, so chunks can be joined without decoding
         response = client.audio.speech.create(
             model="tts-1",
             voice="nova",
-            input=text[:4000]  # OpenAI limit
+            input=text[:4000],  # OpenAI limit
+            response_format="pcm"
         )
         
-        return response.content
+        return pcm_to_wav(response.content, sample_rate=24000)
     
     def _generate_espeak_tts(self, text: str) -> bytes:
         """Generate TTS using espeak"""
@@ -296,32 +340,13 @@ class SimpleTTSService:
     
     def _create_silent_wav(self, duration: float) -> bytes:
         """Create a silent WAV file of specified duration"""
-        import struct
-        
         sample_rate = 44100
         num_samples = int(sample_rate * duration)
         
-        # WAV header
-        header = struct.pack('<4sI4s4sIHHIIHH4sI',
-            b'RIFF',
-            36 + num_samples * 2,  # File size
-            b'WAVE',
-            b'fmt ',
-            16,  # PCM format chunk size
-            1,   # PCM format
-            1,   # Mono
-            sample_rate,
-            sample_rate * 2,  # Byte rate
-            2,   # Block align
-            16,  # Bits per sample
-            b'data',
-            num_samples * 2  # Data size
-        )
-        
         # Silent audio data (all zeros)
         audio_data = b'\x00\x00' * num_samples
         
-        return header + audio_data
+        return pcm_to_wav(audio_data, sample_rate=sample_rate)
 
 
 class TTSManager:
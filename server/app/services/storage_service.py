@@ -0,0 +1,135 @@
+import os
+import threading
+from typing import Optional
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from loguru import logger
+from app.config import settings
+from app.models.upload import StoredFile
+from app.services.metrics import metrics
+
+
+STORED_INPUTS = metrics.counter(
+    "stored_inputs_total", "Input videos added to the content store, by whether the bytes were new", ["result"]
+)
+
+
+class ContentStore:
+    """
+    Content-addressed storage for input videos.
+
+    Files are stored once per SHA-256 under ``root`` and shared by every job
+    whose input has that content; ``ref_count`` counts those jobs. A file is
+    deleted when its last reference is released. Every method commits its own
+    change, so callers add a reference before creating a job and release it
+    after the job is gone: a crash in between leaves a file kept too long,
+    never one deleted while in use.
+
+    Reference counts only change through ``UPDATE ... SET ref_count =
+    ref_count ± n``, and the row stays locked by that UPDATE until the commit,
+    so several server processes can share one store.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.upload_folder, "objects")
+        # Keeps threads of this process from queueing on the database lock;
+        # across processes the row lock taken by each UPDATE does the work
+        self._lock = threading.Lock()
+
+    def path_for(self, sha256: str, extension: str = "") -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}{extension.lower()}")
+
+    def add(self, db: Session, source_path: str, sha256: str, references: int = 1) -> StoredFile:
+        """
+        Take the file at ``source_path`` into the store and add ``references``
+        references (one per job that will use it). If the content is already
+        stored, ``source_path`` is deleted instead.
+        """
+        with self._lock:
+            stored = self._increment(db, sha256, references)
+            if stored is not None and os.path.exists(stored.file_path):
+                if os.path.abspath(source_path) != os.path.abspath(stored.file_path) and os.path.exists(source_path):
+                    os.remove(source_path)
+                STORED_INPUTS.inc(result="duplicate")
+                logger.info(f"Reusing stored input {sha256} ({stored.ref_count} references)")
+                return stored
+
+            destination = self.path_for(sha256, os.path.splitext(source_path)[1])
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(source_path, destination)
+
+            if stored is not None:
+                # The row outlived its file; point it at the new copy
+                stored.file_path = destination
+            else:
+                stored = StoredFile(sha256=sha256, file_path=destination,
+                                    size=os.path.getsize(destination), ref_count=references)
+                db.add(stored)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process stored the same content first
+                db.rollback()
+                stored = self._increment(db, sha256, references)
+            STORED_INPUTS.inc(result="new")
+            return stored
+
+    def release(self, db: Session, sha256: str, references: int = 1) -> bool:
+        """
+        Drop ``references`` references. Returns True if the file was deleted.
+        """
+        with self._lock:
+            result = db.execute(
+                update(StoredFile)
+                .where(StoredFile.sha256 == sha256)
+                .values(ref_count=StoredFile.ref_count - references)
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                db.commit()
+                return False
+            # The UPDATE holds the row until commit, so this read and the
+            # delete below can't interleave with another process's add()
+            stored = db.query(StoredFile).filter(StoredFile.sha256 == sha256).populate_existing().first()
+            if stored.ref_count > 0:
+                db.commit()
+                return False
+
+            file_path = stored.file_path
+            db.execute(
+                delete(StoredFile)
+                .where(StoredFile.sha256 == sha256)
+                .execution_options(synchronize_session=False)
+            )
+            try:
+                # Delete the file before the row goes: an add() waiting on the
+                # row then finds no row and stores a fresh copy, instead of
+                # its copy being removed here afterwards
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            logger.info(f"Deleted unreferenced input {file_path}")
+            return True
+
+    def get(self, db: Session, sha256: str) -> Optional[StoredFile]:
+        return db.query(StoredFile).filter(StoredFile.sha256 == sha256).first()
+
+    def _increment(self, db: Session, sha256: str, references: int = 1) -> Optional[StoredFile]:
+        result = db.execute(
+            update(StoredFile)
+            .where(StoredFile.sha256 == sha256)
+            .values(ref_count=StoredFile.ref_count + references)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            return None
+        db.commit()
+        return self.get(db, sha256)
+
+
+# Global content store instance
+content_store = ContentStore()
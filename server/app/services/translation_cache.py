@@ -0,0 +1,192 @@
+import re
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from loguru import logger
+from app.database import SessionLocal
+from app.models.translation import TranslationMemo
+from app.services.metrics import TRANSLATION_DURATION, TRANSLATION_SENTENCES
+
+
+# Split after sentence-ending punctuation (including the Devanagari danda),
+# keeping the whitespace so the translated text preserves paragraph breaks
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?।])(\s+)')
+NUMBERED_LINE = re.compile(r'^\s*\[(\d+)\]\s*(.*)$')
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """
+    Split text into (sentence, trailing_whitespace) pairs
+    """
+    parts = SENTENCE_BOUNDARY.split(text.strip())
+    pairs = []
+    for i in range(0, len(parts), 2):
+        sentence = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        if sentence.strip():
+            pairs.append((sentence.strip(), separator))
+    return pairs
+
+
+def normalize_sentence(sentence: str) -> str:
+    return " ".join(sentence.split())
+
+
+class TranslationCache:
+    """
+    Sentence-level translation memo backed by the database.
+
+    Descriptions are split into sentences and each (sentence, target_language)
+    pair is looked up in the ``translation_memos`` table. Only the misses are
+    sent to the translation backend, in a single numbered request when there
+    are several of them.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(sentence: str) -> str:
+        return hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+
+    def get_many(self, sentences: List[str], target_language: str) -> Dict[str, str]:
+        """
+        Return cached translations for the given sentences
+        """
+        hashes = {self._hash(s): s for s in sentences}
+        db = self.session_factory()
+        try:
+            rows = db.query(TranslationMemo).filter(
+                TranslationMemo.target_language == target_language,
+                TranslationMemo.source_hash.in_(list(hashes.keys()))
+            ).all()
+            return {hashes[row.source_hash]: row.translated_text for row in rows}
+        except Exception as e:
+            logger.warning(f"Translation memo lookup failed: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def put_many(self, translations: Dict[str, str], target_language: str):
+        """
+        Persist sentence translations in one statement and one commit, ignoring
+        ones another worker stored first
+        """
+        rows = {}
+        for source, translated in translations.items():
+            source_hash = self._hash(source)
+            rows[source_hash] = {
+                "source_hash": source_hash,
+                "target_language": target_language,
+                "source_text": normalize_sentence(source),
+                "translated_text": translated
+            }
+        if not rows:
+            return
+
+        db = self.session_factory()
+        try:
+            insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if insert is not None:
+                db.execute(
+                    insert(TranslationMemo).values(list(rows.values())).on_conflict_do_nothing(
+                        index_elements=["source_hash", "target_language"]
+                    )
+                )
+            else:
+                db.add_all(TranslationMemo(**row) for row in rows.values())
+            db.commit()
+        except IntegrityError:
+            # Only reachable without ON CONFLICT: a concurrent worker stored some
+            # of these first, and the memo is a cache, so the batch is dropped
+            logger.debug("Translation memo batch already stored by another worker")
+            db.rollback()
+        except Exception as e:
+            logger.warning(f"Translation memo write failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def translate(self, text: str, target_language: str, translate_fn: Callable[[str], str]) -> str:
+        """
+        Translate text sentence by sentence, calling translate_fn only for misses.
+        translate_fn must raise on failure so that failures are never memoized.
+        """
+        pairs = split_sentences(text)
+        if not pairs:
+            return text
+
+        unique_sentences = list(dict.fromkeys(sentence for sentence, _ in pairs))
+        known = self.get_many(unique_sentences, target_language)
+        missing = [s for s in unique_sentences if s not in known]
+
+        with self._lock:
+            self.hits += len(unique_sentences) - len(missing)
+            self.misses += len(missing)
+        TRANSLATION_SENTENCES.inc(len(unique_sentences) - len(missing), result="hit")
+        TRANSLATION_SENTENCES.inc(len(missing), result="miss")
+
+        if missing:
+            fresh = translate_sentences(missing, translate_fn)
+            self.put_many(fresh, target_language)
+            known.update(fresh)
+
+        return "".join(known[sentence] + separator for sentence, separator in pairs).strip()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def translate_sentences(sentences: List[str], translate_fn: Callable[[str], str]) -> Dict[str, str]:
+    """
+    Translate several sentences with as few backend calls as possible.
+    Sentences are sent as one numbered block; if the reply cannot be matched
+    back line by line, each sentence is translated on its own.
+    """
+    translate_fn = _timed(translate_fn)
+    if len(sentences) == 1:
+        return {sentences[0]: translate_fn(sentences[0])}
+
+    block = "\n".join(f"[{i}] {sentence}" for i, sentence in enumerate(sentences, start=1))
+    parsed = _parse_numbered_block(translate_fn(block), len(sentences))
+    if parsed is not None:
+        return dict(zip(sentences, parsed))
+
+    logger.info("Numbered translation reply did not line up, translating sentences individually")
+    return {sentence: translate_fn(sentence) for sentence in sentences}
+
+
+def _timed(translate_fn: Callable[[str], str]) -> Callable[[str], str]:
+    """Wrap a translation backend call so its latency is recorded"""
+    def timed_translate(text: str) -> str:
+        started = time.perf_counter()
+        try:
+            return translate_fn(text)
+        finally:
+            TRANSLATION_DURATION.observe(time.perf_counter() - started)
+    return timed_translate
+
+
+def _parse_numbered_block(reply: str, expected: int) -> Optional[List[str]]:
+    found = {}
+    for line in reply.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match and match.group(2).strip():
+            found[int(match.group(1))] = match.group(2).strip()
+    if sorted(found) != list(range(1, expected + 1)):
+        return None
+    return [found[i] for i in range(1, expected + 1)]
+
+
+# Global translation cache instance
+translation_cache = TranslationCache()
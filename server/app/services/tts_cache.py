@@ -0,0 +1,143 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+from loguru import logger
+from app.config import settings
+
+
+class TTSCache:
+    """
+    Content-addressed on-disk cache for synthesized narration audio.
+
+    Entries are keyed by a hash of (text, language, voice, engine) and stored as
+    one file each under ``settings.temp_folder``. The cache is bounded by total
+    size and evicts least recently used entries; file mtimes record recency so
+    the LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.path.join(settings.temp_folder, "tts_cache")
+        self.max_bytes = max_bytes if max_bytes is not None else settings.tts_cache_max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    @staticmethod
+    def make_key(text: str, language: str, voice: str, engine: str) -> str:
+        """
+        Build the cache key for a narration request
+        """
+        payload = json.dumps([text, language, voice, engine], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.audio")
+
+    def _load(self):
+        """Index entries already on disk, oldest access first"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            found = []
+            for filename in os.listdir(self.cache_dir):
+                if not filename.endswith(".audio"):
+                    continue
+                stat = os.stat(os.path.join(self.cache_dir, filename))
+                found.append((stat.st_mtime, filename[:-len(".audio")], stat.st_size))
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self._total_bytes += size
+        except Exception as e:
+            logger.warning(f"Could not index TTS cache at {self.cache_dir}: {e}")
+
+    def lookup(self, text: str, language: str, voice: str, engines: Iterable[str]) -> Optional[bytes]:
+        """
+        Return cached audio produced by any of the given engines, or None
+        """
+        for engine in engines:
+            key = self.make_key(text, language, voice, engine)
+            with self._lock:
+                if key not in self._entries:
+                    continue
+                self._entries.move_to_end(key)
+            try:
+                path = self._path(key)
+                with open(path, "rb") as f:
+                    audio = f.read()
+                os.utime(path)
+            except OSError:
+                self._forget(key)
+                continue
+            with self._lock:
+                self.hits += 1
+            return audio
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def store(self, text: str, language: str, voice: str, engine: str, audio: bytes):
+        """
+        Store synthesized audio and evict old entries beyond the size bound
+        """
+        if not audio or len(audio) > self.max_bytes:
+            return
+
+        key = self.make_key(text, language, voice, engine)
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            self._total_bytes += len(audio)
+            victims = []
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                victim, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                victims.append(victim)
+
+        for victim in victims:
+            try:
+                os.remove(self._path(victim))
+            except OSError:
+                pass
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters and current occupancy
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+# Global TTS cache instance
+tts_cache = TTSCache()
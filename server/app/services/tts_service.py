@@ -3,8 +3,9 @@ import openai
 from abc import ABC, abstractmethod
 from app.config import settings
 from app.models.job import Language
+from app.services.translation_cache import translation_cache
+from app.services.http_client import http_client
 from sqlalchemy.orm import Session
-import requests
 import json
 from typing import Optional
 
@@ -17,7 +18,7 @@ class TTSInterface(ABC):
 
 class OpenAITTSService(TTSInterface):
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = http_client.openai_client()
 
     def synthesize_speech(self, text: str, language_code: str, voice_name: str) -> bytes:
         try:
@@ -86,11 +87,21 @@ class GoogleGeminiTranslationService:
     
     def translate_text(self, text: str, target_language: str) -> str:
         """
-        Translate text using Google Gemini
+        Translate text using Google Gemini, reusing memoized sentence translations
         """
         if not self.api_key:
             raise Exception("Google Gemini API key not configured")
         
+        return translation_cache.translate(
+            text,
+            target_language,
+            lambda chunk: self._request_translation(chunk, target_language)
+        )
+    
+    def _request_translation(self, text: str, target_language: str) -> str:
+        """
+        Send one translation request to Gemini
+        """
         # Map language codes to names for better prompting
         language_names = {
             "en": "English",
@@ -118,7 +129,7 @@ class GoogleGeminiTranslationService:
         
         prompt = f"""
         Translate the following text to {target_lang_name}. 
-        Only return the translated text, nothing else:
+        Keep any [n] line markers. Only return the translated text, nothing else:
         
         {text}
         """
@@ -142,7 +153,7 @@ class GoogleGeminiTranslationService:
         }
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}?key={self.api_key}",
                 headers=headers,
                 data=json.dumps(data)
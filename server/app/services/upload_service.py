@@ -0,0 +1,203 @@
+import os
+import re
+import uuid
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from loguru import logger
+from app.config import settings
+from app.models.upload import UploadSession
+from app.services.metrics import UPLOAD_BYTES, UPLOADS_TOTAL
+from app.utils.exceptions import UploadOffsetMismatchError, UploadTooLargeError
+from app.utils.file_utils import file_sha256
+
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+def _open_at(file_path: str, offset: int) -> BinaryIO:
+    """Open an upload's file for appending at ``offset``, dropping anything past it"""
+    f = open(file_path, "r+b")
+    f.seek(offset)
+    f.truncate()
+    return f
+
+
+def parse_content_range(header: str) -> Tuple[int, int, int]:
+    """
+    Parse a ``Content-Range: bytes start-end/total`` header, raising ValueError
+    """
+    match = _CONTENT_RANGE.match((header or "").strip())
+    if not match:
+        raise ValueError(f"Invalid Content-Range header: {header}")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end >= total:
+        raise ValueError(f"Invalid byte range in Content-Range header: {header}")
+    return start, end, total
+
+
+class UploadService:
+    """
+    Resumable uploads for large videos.
+
+    A session reserves a file in the upload folder. Chunks are PUT with a
+    Content-Range and appended to that file in place, and the session
+    records how many bytes have arrived, so a client whose connection drops
+    asks for the offset and carries on from there. Bytes written before a
+    chunk was interrupted are kept. Completing the session checksums the
+    file; it can then be used as the input of a generation job.
+    """
+
+    def __init__(self, upload_folder: Optional[str] = None, max_bytes: Optional[int] = None,
+                 ttl_hours: Optional[int] = None):
+        self.upload_folder = upload_folder or settings.upload_folder
+        self.max_bytes = max_bytes or settings.max_video_size_mb * 1024 * 1024
+        self.ttl = timedelta(hours=ttl_hours or settings.upload_session_ttl_hours)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def create_session(self, db: Session, user_id: int, filename: str, total_size: int) -> UploadSession:
+        """
+        Start an upload of ``total_size`` bytes
+        """
+        filename = os.path.basename(filename or "")
+        extension = os.path.splitext(filename)[1].lstrip(".").lower()
+        if extension not in settings.allowed_video_formats:
+            raise ValueError(f"Unsupported video format: {extension or filename}")
+        if total_size <= 0:
+            raise ValueError("Upload size must be positive")
+        if total_size > self.max_bytes:
+            UPLOADS_TOTAL.inc(outcome="too_large")
+            raise UploadTooLargeError(self.max_bytes)
+
+        self.purge_expired(db)
+
+        upload_id = uuid.uuid4().hex
+        file_path = os.path.join(self.upload_folder, f"{upload_id}_{filename}")
+        os.makedirs(self.upload_folder, exist_ok=True)
+        open(file_path, "wb").close()
+
+        upload = UploadSession(
+            id=upload_id,
+            user_id=user_id,
+            filename=filename,
+            file_path=file_path,
+            total_size=total_size,
+            received_bytes=0,
+            status="UPLOADING",
+            expires_at=datetime.now(timezone.utc) + self.ttl
+        )
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+        logger.info(f"Started upload {upload_id} of {filename} ({total_size} bytes) for user {user_id}")
+        return upload
+
+    def get_session(self, db: Session, upload_id: str, user_id: int) -> Optional[UploadSession]:
+        """
+        Get an upload owned by ``user_id``
+        """
+        return db.query(UploadSession).filter(
+            UploadSession.id == upload_id,
+            UploadSession.user_id == user_id
+        ).first()
+
+    async def append_chunk(self, db: Session, upload: UploadSession, start: int, total: int,
+                           chunks: AsyncIterator[bytes]) -> UploadSession:
+        """
+        Write a chunk that starts at byte ``start`` straight into the upload's file.
+        The received offset is updated even if the chunk is cut short. File I/O
+        runs in worker threads so a large chunk doesn't stall the event loop.
+        """
+        lock = self._locks.setdefault(upload.id, asyncio.Lock())
+        async with lock:
+            # Another request may have appended while this one waited
+            db.refresh(upload)
+            if upload.status != "UPLOADING":
+                raise ValueError(f"Upload {upload.id} is already {upload.status.lower()}")
+            if total != upload.total_size:
+                raise ValueError(f"Content-Range total {total} does not match the upload size {upload.total_size}")
+            if start != upload.received_bytes:
+                raise UploadOffsetMismatchError(upload.received_bytes, start)
+
+            written = 0
+            try:
+                f = await asyncio.to_thread(_open_at, upload.file_path, start)
+                try:
+                    async for chunk in chunks:
+                        if start + written + len(chunk) > upload.total_size:
+                            raise ValueError("Chunk runs past the declared upload size")
+                        await asyncio.to_thread(f.write, chunk)
+                        written += len(chunk)
+                        UPLOAD_BYTES.inc(len(chunk))
+                finally:
+                    await asyncio.to_thread(f.close)
+            finally:
+                upload.received_bytes = start + written
+                db.commit()
+        return upload
+
+    async def complete(self, db: Session, upload: UploadSession) -> UploadSession:
+        """
+        Finish an upload once every byte has arrived
+        """
+        if upload.status != "UPLOADING":
+            return upload
+        if upload.received_bytes != upload.total_size:
+            raise ValueError(f"Upload has {upload.received_bytes} of {upload.total_size} bytes")
+
+        upload.sha256 = await asyncio.to_thread(file_sha256, upload.file_path)
+        upload.status = "COMPLETE"
+        db.commit()
+        self._locks.pop(upload.id, None)
+        UPLOADS_TOTAL.inc(outcome="stored")
+        logger.info(f"Completed upload {upload.id} ({upload.total_size} bytes, sha256 {upload.sha256})")
+        return upload
+
+    def check_complete(self, upload: UploadSession):
+        """
+        Raise ValueError unless the upload is complete and not yet consumed
+        """
+        if upload.status != "COMPLETE":
+            raise ValueError(f"Upload {upload.id} is {upload.status.lower()}, not complete")
+
+    def consume(self, db: Session, upload: UploadSession) -> str:
+        """
+        Hand a completed upload's file to a job. Returns the file path.
+        """
+        self.check_complete(upload)
+        upload.status = "CONSUMED"
+        db.commit()
+        return upload.file_path
+
+    def cancel(self, db: Session, upload: UploadSession):
+        """
+        Abandon an upload and delete its file
+        """
+        if upload.status != "CONSUMED" and os.path.exists(upload.file_path):
+            os.remove(upload.file_path)
+        self._locks.pop(upload.id, None)
+        db.delete(upload)
+        db.commit()
+
+    def purge_expired(self, db: Session) -> int:
+        """
+        Delete expired upload sessions, and the files of those that never became a job
+        """
+        expired = db.query(UploadSession).filter(UploadSession.expires_at < datetime.now(timezone.utc)).all()
+        for upload in expired:
+            try:
+                if upload.status != "CONSUMED" and os.path.exists(upload.file_path):
+                    os.remove(upload.file_path)
+            except OSError as e:
+                logger.warning(f"Could not delete expired upload {upload.id}: {e}")
+            self._locks.pop(upload.id, None)
+            db.delete(upload)
+        if expired:
+            db.commit()
+            logger.info(f"Purged {len(expired)} expired uploads")
+        return len(expired)
+
+
+# Global upload service instance
+upload_service = UploadService()
@@ -0,0 +1,88 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.config import settings
+from app.models.user import User
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users, keyed by token subject.
+
+    Entries are column snapshots rather than ORM instances, so they can be
+    shared across sessions and threads. ``attach`` rebuilds a User from a
+    snapshot and adds it to the request's session as an already-loaded row,
+    without a SELECT. Any ORM update or delete of a user (credit deductions,
+    profile and password changes) drops its entry; the TTL bounds how stale
+    an entry can get when the row is changed by another process.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl if ttl is not None else settings.user_cache_ttl_seconds
+        self.max_entries = max_entries or settings.user_cache_max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached snapshot for a user, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= self._clock():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, user: User):
+        """
+        Cache a snapshot of the user's loaded columns
+        """
+        snapshot = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            self._entries[user.id] = (self._clock() + self.ttl, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def attach(db: Session, snapshot: Dict[str, Any]) -> User:
+        """
+        Rebuild a User from a snapshot as a persistent instance of ``db``
+        """
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global user cache instance
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
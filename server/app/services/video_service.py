@@ -1,11 +1,220 @@
 import os
+import re
 import subprocess
 import tempfile
 import asyncio
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from loguru import logger
 from app.config import settings
+from app.services.probe_service import MediaInfo, probe_service
+
+
+# ISO 639-2 codes for the narration languages, used to tag audio tracks
+ISO_639_2 = {
+    "en": "eng", "te": "tel", "hi": "hin", "es": "spa", "fr": "fra", "de": "deu", "it": "ita",
+    "pt": "por", "ru": "rus", "ja": "jpn", "ko": "kor", "zh": "zho", "ar": "ara"
+}
+
+_RESOLUTION = re.compile(r"^(\d{3,4})p$")
+_RESOLUTION_ALIASES = {"4k": 2160, "2k": 1440, "hd": 720, "fullhd": 1080}
+
+
+def iso639_2(language: str) -> str:
+    """
+    Map a language code to the ISO 639-2 code MP4 stores per track ("und" if unknown)
+    """
+    language = language.strip().lower()
+    if len(language) == 3:
+        return language
+    return ISO_639_2.get(language, "und")
+
+
+def parse_resolution(resolution: str) -> Optional[int]:
+    """
+    Parse a resolution such as "720p" or "4k" into the target length of the
+    video's shorter side. "original" means keep the source resolution (None).
+    Raises ValueError for anything else.
+    """
+    value = (resolution or "").strip().lower()
+    if value in ("original", "source"):
+        return None
+    if value in _RESOLUTION_ALIASES:
+        return _RESOLUTION_ALIASES[value]
+    match = _RESOLUTION.match(value)
+    if not match or not 144 <= int(match.group(1)) <= 4320:
+        raise ValueError(f"Unsupported resolution: {resolution}")
+    return int(match.group(1))
+
+
+@dataclass(frozen=True)
+class VideoTranscode:
+    """Re-encode settings for scaling the video's shorter side to ``height`` pixels"""
+    height: int
+    preset: str = "veryfast"
+    crf: int = 23
+    threads: int = 0  # 0 lets x264 pick from the CPU count
+
+    @classmethod
+    def from_settings(cls, height: int) -> "VideoTranscode":
+        return cls(
+            height=height,
+            preset=settings.video_transcode_preset,
+            crf=settings.video_transcode_crf,
+            threads=settings.video_transcode_threads
+        )
+
+    def scale_filter(self) -> str:
+        # Scale whichever side is shorter (after rotation is applied), keeping
+        # the aspect ratio and an even length on the other side
+        return f"scale='if(gt(iw,ih),-2,{self.height})':'if(gt(iw,ih),{self.height},-2)'"
+
+    def codec_args(self) -> List[str]:
+        return [
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-crf', str(self.crf),
+            '-threads', str(self.threads),
+            '-pix_fmt', 'yuv420p'
+        ]
+
+
+def plan_transcode(video_info: MediaInfo, resolution: Optional[str]) -> Optional[VideoTranscode]:
+    """
+    Decide whether the video has to be scaled down to ``resolution``.
+    Returns None (stream copy) when transcoding is disabled, the resolution is
+    "original", or the source is already at or below the target.
+    """
+    if not settings.enable_video_transcode or not resolution:
+        return None
+    height = parse_resolution(resolution)
+    if height is None or not video_info.width or not video_info.height:
+        return None
+    if min(video_info.width, video_info.height) <= height:
+        logger.info(f"Source is {video_info.width}x{video_info.height}; no transcode needed for {resolution}")
+        return None
+    return VideoTranscode.from_settings(height)
+
+
+def _fit_narrations_filter(count: int, video_duration: float) -> str:
+    """
+    Filtergraph that pads/trims inputs 1..count to the video duration as [narration1]..[narrationN]
+    """
+    return ";".join(
+        f"[{index}:a:0]apad,atrim=end={video_duration:.3f},asetpts=PTS-STARTPTS[narration{index}]"
+        for index in range(1, count + 1)
+    )
+
+
+def build_narration_mux_command(
+    video_path: str,
+    audio_path: str,
+    output_path: str,
+    video_duration: float,
+    audio_bitrate: str = "192k"
+) -> List[str]:
+    """
+    Build a single ffmpeg invocation that fits the narration to the video and muxes it.
+    The narration is padded with silence and trimmed to the video duration inside the
+    filtergraph, so no intermediate audio file or extra probe of the audio is needed.
+    The video stream is copied untouched.
+    """
+    return build_narration_fanout_command(
+        video_path, [(audio_path, output_path)], video_duration, audio_bitrate
+    )
+
+
+def build_narration_fanout_command(
+    video_path: str,
+    narrations: List[Tuple[str, str]],
+    video_duration: float,
+    audio_bitrate: str = "192k"
+) -> List[str]:
+    """
+    Build one ffmpeg invocation that muxes each ``(audio_path, output_path)``
+    narration with the same video. The video is read and demuxed once and its
+    stream is copied into every output, instead of one ffmpeg run per output.
+    """
+    cmd = ['ffmpeg', '-y', '-i', video_path]    # Input video (index 0)
+    for audio_path, _ in narrations:
+        cmd += ['-i', audio_path]               # Narrations (index 1..N)
+
+    # Fit every narration to the video duration inside one filtergraph
+    cmd += ['-filter_complex', _fit_narrations_filter(len(narrations), video_duration)]
+
+    for index, (_, output_path) in enumerate(narrations, start=1):
+        cmd += [
+            '-map', '0:v:0',                    # Video from first input
+            '-map', f'[narration{index}]',      # Fitted narration from the filtergraph
+            '-c:v', 'copy',                     # Copy video stream
+            '-c:a', 'aac',                      # Encode audio as AAC
+            '-b:a', audio_bitrate,
+            output_path
+        ]
+    return cmd
+
+
+def build_multitrack_mux_command(
+    video_path: str,
+    narrations: List[Tuple[str, str]],
+    output_path: str,
+    video_duration: float,
+    audio_bitrate: str = "192k"
+) -> List[str]:
+    """
+    Build one ffmpeg invocation that muxes each ``(language, audio_path)``
+    narration into a single MP4 as its own language-tagged audio track.
+    The video stream is copied once, so the output holds the video bytes a
+    single time however many languages it carries. The first track is the
+    default; players offer the others as alternative audio.
+    """
+    cmd = ['ffmpeg', '-y', '-i', video_path]    # Input video (index 0)
+    for _, audio_path in narrations:
+        cmd += ['-i', audio_path]               # Narrations (index 1..N)
+    cmd += [
+        '-filter_complex', _fit_narrations_filter(len(narrations), video_duration),
+        '-map', '0:v:0'                         # Video from first input
+    ]
+    for index in range(1, len(narrations) + 1):
+        cmd += ['-map', f'[narration{index}]']  # One audio track per narration
+    cmd += ['-c:v', 'copy', '-c:a', 'aac', '-b:a', audio_bitrate]
+    for track, (language, _) in enumerate(narrations):
+        cmd += [
+            f'-metadata:s:a:{track}', f'language={iso639_2(language)}',
+            f'-disposition:a:{track}', 'default' if track == 0 else '0'
+        ]
+    cmd.append(output_path)
+    return cmd
+
+
+def build_transcode_command(video_path: str, output_path: str, transcode: VideoTranscode) -> List[str]:
+    """
+    Build an ffmpeg invocation that scales and re-encodes only the video stream.
+    The result is an intermediate file that the mux then stream-copies, so the
+    encode can run while the narration is still being generated.
+    """
+    return [
+        'ffmpeg', '-y', '-i', video_path,
+        '-map', '0:v:0',
+        '-vf', transcode.scale_filter(),
+        *transcode.codec_args(),
+        '-an',                                  # Audio comes from the original or the narration
+        output_path
+    ]
+
+
+def build_stream_copy_command(video_path: str, output_path: str,
+                              audio_source: Optional[str] = None) -> List[str]:
+    """
+    Build an ffmpeg invocation that copies every stream of the input unchanged.
+    With ``audio_source`` the video comes from ``video_path`` (e.g. a transcoded
+    intermediate) and any audio from ``audio_source``, both copied.
+    """
+    if audio_source:
+        return ['ffmpeg', '-y', '-i', video_path, '-i', audio_source,
+                '-map', '0:v:0', '-map', '1:a?', '-c', 'copy', output_path]
+    return ['ffmpeg', '-y', '-i', video_path, '-c', 'copy', output_path]
 
 
 class VideoProcessingService:
@@ -98,29 +307,8 @@ class VideoProcessingService:
         Extract duration of audio file using FFmpeg
         """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-show_entries', 'format=duration',
-                '-of', 'csv=p=0',
-                audio_path
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode()
-                logger.error(f"ffprobe error: {error_msg}")
-                raise RuntimeError(f"ffprobe failed with error: {error_msg}")
-            
-            duration = float(stdout.decode().strip())
-            return duration
+            info = await probe_service.probe_async(audio_path)
+            return info.duration
             
         except Exception as e:
             logger.error(f"Error extracting audio duration: {e}")
@@ -131,29 +319,8 @@ class VideoProcessingService:
         Extract duration of video file using FFmpeg
         """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-show_entries', 'format=duration',
-                '-of', 'csv=p=0',
-                video_path
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode()
-                logger.error(f"ffprobe error: {error_msg}")
-                raise RuntimeError(f"ffprobe failed with error: {error_msg}")
-            
-            duration = float(stdout.decode().strip())
-            return duration
+            info = await probe_service.probe_async(video_path)
+            return info.duration
             
         except Exception as e:
             logger.error(f"Error extracting video duration: {e}")
@@ -282,31 +449,8 @@ class VideoProcessingService:
         Get video information (duration, resolution, etc.)
         """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                video_path
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode()
-                logger.error(f"ffprobe error: {error_msg}")
-                raise RuntimeError(f"ffprobe failed with error: {error_msg}")
-            
-            import json
-            info = json.loads(stdout.decode())
-            return info
+            info = await probe_service.probe_async(video_path)
+            return info.raw
             
         except Exception as e:
             logger.error(f"Error getting video info: {e}")
@@ -382,14 +526,11 @@ class VideoProcessor:
         Get the duration of a video file in seconds
         """
         try:
-            probe = ffmpeg.probe(video_path)
-            video_stream = next((stream for stream in probe['streams'] 
-                                if stream['codec_type'] == 'video'), None)
-            if video_stream is None:
+            info = probe_service.probe(video_path)
+            if not info.has_video:
                 raise Exception("No video stream found in file")
             
-            duration = float(video_stream['duration'])
-            return duration
+            return info.duration
         except Exception as e:
             raise Exception(f"Error getting video duration: {str(e)}")
     
@@ -398,18 +539,16 @@ class VideoProcessor:
         Get video information (resolution, format, etc.)
         """
         try:
-            probe = ffmpeg.probe(video_path)
-            video_stream = next((stream for stream in probe['streams'] 
-                                if stream['codec_type'] == 'video'), None)
-            if video_stream is None:
+            probe = probe_service.probe(video_path)
+            if not probe.has_video:
                 raise Exception("No video stream found in file")
             
             info = {
-                'width': int(video_stream['width']),
-                'height': int(video_stream['height']),
-                'duration': float(video_stream['duration']),
-                'format': probe['format']['format_name'],
-                'size': int(probe['format']['size'])
+                'width': probe.width,
+                'height': probe.height,
+                'duration': probe.duration,
+                'format': probe.format_name,
+                'size': probe.size
             }
             
             return info
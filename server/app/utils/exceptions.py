@@ -10,6 +10,23 @@ class VideoGenerationError(Exception):
     pass
 
 
+class UploadTooLargeError(VideoGenerationError):
+    """Raised when an upload exceeds the configured size limit while streaming"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the maximum size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class UploadOffsetMismatchError(VideoGenerationError):
+    """Raised when a resumable upload chunk does not start at the received offset"""
+
+    def __init__(self, expected_offset: int, chunk_offset: int):
+        super().__init__(f"Chunk starts at byte {chunk_offset} but the upload has {expected_offset} bytes")
+        self.expected_offset = expected_offset
+        self.chunk_offset = chunk_offset
+
+
 class VideoGenerationErrorCode(str, Enum):
     """Error codes for video generation service"""
     INVALID_INPUT = "INVALID_INPUT"
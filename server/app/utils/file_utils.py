@@ -1,8 +1,13 @@
 import os
 import shutil
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import UploadFile
 from app.config import settings
+from app.utils.exceptions import UploadTooLargeError
+from app.services.metrics import UPLOAD_BYTES, UPLOADS_TOTAL
 from loguru import logger
 
 
@@ -130,4 +135,64 @@ def validate_video_file(video_path: str) -> tuple[bool, str]:
     if file_size > max_size_bytes:
         return False, f"File too large: {file_size} bytes. Maximum size: {settings.max_video_size_mb}MB"
     
-    return True, ""
\ No newline at end of file
+    return True, ""
+
+
+async def stream_upload_to_file(
+    upload_file: UploadFile,
+    destination: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Tuple[int, str]:
+    """
+    Copy an uploaded file to destination in fixed-size chunks.
+    Memory use is bounded by chunk_size regardless of the upload size. The size
+    limit is enforced while streaming and the SHA-256 of the content is computed
+    on the fly. Hashing and disk writes run in a worker thread so the event
+    loop isn't blocked. Returns (size_in_bytes, sha256_hexdigest).
+    """
+    if max_bytes is None:
+        max_bytes = settings.max_video_size_mb * 1024 * 1024
+    if chunk_size is None:
+        chunk_size = settings.upload_chunk_size_kb * 1024
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(destination, "wb") as buffer:
+            while True:
+                chunk = await upload_file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                UPLOAD_BYTES.inc(len(chunk))
+                if size > max_bytes:
+                    UPLOADS_TOTAL.inc(outcome="too_large")
+                    raise UploadTooLargeError(max_bytes)
+                await asyncio.to_thread(_hash_and_write, digest, buffer, chunk)
+    except Exception:
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+
+    UPLOADS_TOTAL.inc(outcome="stored")
+    return size, digest.hexdigest()
+
+
+def _hash_and_write(digest, buffer, chunk: bytes):
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
+def file_sha256(file_path: str, chunk_size: Optional[int] = None) -> str:
+    """
+    SHA-256 of a file on disk, read in fixed-size chunks
+    """
+    chunk_size = chunk_size or settings.upload_chunk_size_kb * 1024
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
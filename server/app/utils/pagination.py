@@ -0,0 +1,44 @@
+import base64
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Build the opaque cursor pointing after the row with id ``last_id``
+    """
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Return the row id a cursor points after, raising ValueError for malformed cursors
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, _, value = base64.urlsafe_b64decode(padded.encode()).decode().partition(":")
+        if kind != "id":
+            raise ValueError
+        return int(value)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def keyset_page(query: Query, id_column, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of ``query`` newest first using keyset pagination.
+
+    Rows are ordered by ``id_column`` descending and the page starts after the
+    cursor's id, so every page is an index range scan of ``limit`` rows no
+    matter how deep it is (unlike OFFSET, which reads and discards every
+    skipped row). Returns (rows, next_cursor); next_cursor is None on the
+    last page.
+    """
+    if cursor:
+        query = query.filter(id_column < decode_cursor(cursor))
+
+    rows = query.order_by(id_column.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
@@ -1,10 +1,15 @@
 from typing import TypedDict, Annotated, List
+import asyncio
 import functools
+import uuid
 from langchain_core.messages import BaseMessage
 from langgraph.graph import StateGraph, END
 from app.services.tts_service import TTSManager
 from app.services.video_service import VideoProcessingService
-from app.models.job import Job
+from app.services.job_service import JobProgressWriter, JobTracker
+from app.services.pipeline import StageTimer
+from app.services.metrics import FFMPEG_DURATION, JOBS_TOTAL
+from app.config import settings
 from sqlalchemy.orm import Session
 import os
 import tempfile
@@ -27,21 +32,33 @@ class VideoGenerationState(TypedDict):
     db_session: Session
     tts_manager: TTSManager
     video_processor: VideoProcessingService
+    stage_timer: StageTimer
+    progress_writer: JobProgressWriter
     error_message: str
     progress: int
 
 
-def validate_inputs(state: VideoGenerationState) -> VideoGenerationState:
+async def set_job_status(state: VideoGenerationState, status: str, progress: int):
+    """
+    Record the current stage without blocking the event loop.
+    Each run owns its session and awaits every call, so the session is never
+    used from two threads at once.
+    """
+    await asyncio.to_thread(state['progress_writer'].update, status, progress)
+
+
+def _write_temp_audio(audio_content: bytes) -> str:
+    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as audio_file:
+        audio_file.write(audio_content)
+        return audio_file.name
+
+
+async def validate_inputs(state: VideoGenerationState) -> VideoGenerationState:
     """Validate input parameters"""
     logger.info("Validating inputs...")
-    db = state['db_session']
     
     # Update job status
-    job = db.query(Job).filter(Job.id == state['job_id']).first()
-    if job:
-        job.status = "VALIDATING"
-        job.progress = 5
-        db.commit()
+    await set_job_status(state, "VALIDATING", 5)
     
     # Validate input video exists
     if not os.path.exists(state['input_video_path']):
@@ -71,7 +88,7 @@ def validate_inputs(state: VideoGenerationState) -> VideoGenerationState:
     return {**state, "progress": 10}
 
 
-def process_text(state: VideoGenerationState) -> VideoGenerationState:
+async def process_text(state: VideoGenerationState) -> VideoGenerationState:
     """Process text (now handles via TTSManager.synthesize_speech)"""
     logger.info("Passing through text to TTSManager...")
     return {
@@ -81,17 +98,12 @@ def process_text(state: VideoGenerationState) -> VideoGenerationState:
     }
 
 
-def generate_audio(state: VideoGenerationState) -> VideoGenerationState:
+async def generate_audio(state: VideoGenerationState) -> VideoGenerationState:
     """Generate audio using TTS service"""
     logger.info("Generating audio...")
-    db = state['db_session']
     
     # Update job status
-    job = db.query(Job).filter(Job.id == state['job_id']).first()
-    if job:
-        job.status = "GENERATING_AUDIO"
-        job.progress = 35
-        db.commit()
+    await set_job_status(state, "GENERATING_AUDIO", 35)
     
     try:
         # Get the processed text (original or translated)
@@ -119,16 +131,18 @@ def generate_audio(state: VideoGenerationState) -> VideoGenerationState:
         
         voice_name = voice_mapping.get(state['target_language'], 'en-US-Standard-C')
         
-        audio_content = tts_manager.synthesize_speech(
-            text_to_speak,
-            state['target_language'],
-            voice_name
-        )
+        # Translation and synthesis are blocking network calls, run them off the loop
+        with state['stage_timer'].stage("narration", bytes_in=len(text_to_speak.encode("utf-8"))) as record:
+            audio_content = await asyncio.to_thread(
+                tts_manager.synthesize_speech,
+                text_to_speak,
+                state['target_language'],
+                voice_name
+            )
+            record["bytes_out"] = len(audio_content)
         
         # Save audio to temporary file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as audio_file:
-            audio_file.write(audio_content)
-            audio_path = audio_file.name
+        audio_path = await asyncio.to_thread(_write_temp_audio, audio_content)
         
         logger.info("Audio generation completed successfully")
         return {
@@ -145,29 +159,31 @@ def generate_audio(state: VideoGenerationState) -> VideoGenerationState:
         }
 
 
-def process_audio(state: VideoGenerationState) -> VideoGenerationState:
+async def process_audio(state: VideoGenerationState) -> VideoGenerationState:
     """Process audio to match video duration"""
     logger.info("Processing audio...")
-    db = state['db_session']
     
     # Update job status
-    job = db.query(Job).filter(Job.id == state['job_id']).first()
-    if job:
-        job.status = "PROCESSING_AUDIO"
-        job.progress = 65
-        db.commit()
+    await set_job_status(state, "PROCESSING_AUDIO", 65)
     
     try:
         video_processor = state['video_processor']
         
-        # Get video duration
-        video_duration = video_processor.get_video_duration(state['input_video_path'])
+        # Adjust audio duration to match video (ffprobe/ffmpeg run as async subprocesses)
+        base, ext = os.path.splitext(state['audio_path'])
+        with state['stage_timer'].stage("fit_audio", bytes_in=os.path.getsize(state['audio_path'])) as record:
+            adjusted_audio_path = await video_processor.adjust_audio_to_video_duration(
+                state['audio_path'],
+                state['input_video_path'],
+                f"{base}_adjusted{ext}"
+            )
+            record["exit_code"] = 0
+            record["bytes_out"] = os.path.getsize(adjusted_audio_path)
+        FFMPEG_DURATION.observe(record["duration"], operation="fit_audio")
         
-        # Adjust audio duration to match video
-        adjusted_audio_path = video_processor.adjust_audio_duration(
-            state['audio_path'],
-            video_duration
-        )
+        # The unadjusted narration is no longer needed
+        if os.path.exists(state['audio_path']):
+            os.remove(state['audio_path'])
         
         logger.info("Audio processing completed successfully")
         return {
@@ -184,26 +200,27 @@ def process_audio(state: VideoGenerationState) -> VideoGenerationState:
         }
 
 
-def merge_video_audio(state: VideoGenerationState) -> VideoGenerationState:
+async def merge_video_audio(state: VideoGenerationState) -> VideoGenerationState:
     """Merge audio and video files"""
     logger.info("Merging video and audio...")
-    db = state['db_session']
     
     # Update job status
-    job = db.query(Job).filter(Job.id == state['job_id']).first()
-    if job:
-        job.status = "MERGING_VIDEO"
-        job.progress = 85
-        db.commit()
+    await set_job_status(state, "MERGING_VIDEO", 85)
     
     try:
         video_processor = state['video_processor']
         
         # Merge video and audio
-        output_path = video_processor.merge_audio_video(
-            state['input_video_path'],
-            state['audio_path']
-        )
+        input_bytes = os.path.getsize(state['input_video_path']) + os.path.getsize(state['audio_path'])
+        with state['stage_timer'].stage("mux", bytes_in=input_bytes) as record:
+            output_path = await video_processor.merge_audio_video(
+                state['input_video_path'],
+                state['audio_path'],
+                os.path.join(settings.upload_folder, f"output_{uuid.uuid4()}.mp4")
+            )
+            record["exit_code"] = 0
+            record["bytes_out"] = os.path.getsize(output_path)
+        FFMPEG_DURATION.observe(record["duration"], operation="mux")
         
         logger.info("Video and audio merging completed successfully")
         return {
@@ -220,22 +237,28 @@ def merge_video_audio(state: VideoGenerationState) -> VideoGenerationState:
         }
 
 
-def update_job_status(state: VideoGenerationState) -> VideoGenerationState:
+def _record_result(state: VideoGenerationState):
+    timer = state['stage_timer']
+    timer.log()
+    if timer.stages:
+        JobTracker(state['db_session']).record_stages(state['job_id'], timer.stages)
+    
+    # Written last so subscribers that re-read the job also see its stages
+    writer = state['progress_writer']
+    if state.get('error_message'):
+        writer.update("FAILED", state['progress'], error_message=state['error_message'])
+    else:
+        writer.update("COMPLETED", state['progress'], output_file_path=state['output_video_path'])
+    JOBS_TOTAL.inc(outcome="failed" if state.get('error_message') else "completed")
+
+
+async def update_job_status(state: VideoGenerationState) -> VideoGenerationState:
     """Update job status based on workflow result"""
     logger.info("Updating job status...")
-    db = state['db_session']
-    
-    job = db.query(Job).filter(Job.id == state['job_id']).first()
-    if job:
-        if state.get('error_message'):
-            job.status = "FAILED"
-            job.error_message = state['error_message']
-        else:
-            job.status = "COMPLETED"
-            job.output_file_path = state['output_video_path']
-        
-        job.progress = state['progress']
-        db.commit()
+    try:
+        await asyncio.to_thread(_record_result, state)
+    except Exception as e:
+        logger.error(f"Could not record workflow result: {str(e)}")
     
     # Clean up temporary files
     try:
@@ -342,9 +365,9 @@ class VideoGenerationWorkflow:
         db = next(get_db())
         
         try:
-            # Initialize services
+            # Initialize services (the ffmpeg availability check spawns a process)
             tts_manager = TTSManager()
-            video_processor = VideoProcessingService()
+            video_processor = await asyncio.to_thread(VideoProcessingService)
             
             # Prepare initial state
             initial_state = VideoGenerationState(
@@ -358,6 +381,8 @@ class VideoGenerationWorkflow:
                 db_session=db,
                 tts_manager=tts_manager,
                 video_processor=video_processor,
+                stage_timer=StageTimer(input_data['job_id']),
+                progress_writer=JobProgressWriter(db, input_data['job_id']),
                 error_message="",
                 progress=0
             )
@@ -0,0 +1,307 @@
+import os
+import hashlib
+import shutil
+import tempfile
+import subprocess
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import app.database as database
+from app.database import Base, get_db
+from app.models.job import Job, JobStage, Setting
+from app.models.upload import StoredFile
+from app.models.user import User
+from app.api.v1 import video_generation
+from app.api.v1.endpoints.auth import get_current_user
+from app.services.logging_service import logging_service
+from app.services.probe_service import MediaInfo
+from app.services.storage_service import content_store
+from app.services.video_service import build_multitrack_mux_command, build_narration_fanout_command, iso639_2
+
+
+VIDEO = b"walkthrough" * 1000
+
+
+@pytest.fixture
+def session_factory():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[
+        User.__table__, Job.__table__, JobStage.__table__, StoredFile.__table__, Setting.__table__
+    ])
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def folder():
+    with tempfile.TemporaryDirectory() as folder:
+        with patch.object(video_generation.settings, "upload_folder", folder), \
+                patch.object(content_store, "root", os.path.join(folder, "objects")):
+            yield folder
+
+
+def make_client(session_factory, credits=1000):
+    app = FastAPI()
+    app.include_router(video_generation.router, prefix="/api/v1")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="agent", credits=credits)
+    return TestClient(app)
+
+
+def submit_batch(client, languages):
+    return client.post(
+        "/api/v1/generate-batch",
+        data={"description_text": "Sunny loft", "target_languages": languages},
+        files={"video_file": ("loft.mp4", VIDEO, "video/mp4")}
+    )
+
+
+class TestFanoutCommand:
+    def test_video_is_read_once_for_every_output(self):
+        """Test that N narrations share one video input and one ffmpeg run"""
+        cmd = build_narration_fanout_command(
+            "video.mp4", [("en.wav", "en.mp4"), ("te.wav", "te.mp4"), ("hi.wav", "hi.mp4")], 12.5
+        )
+
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-i"]
+        assert inputs == ["video.mp4", "en.wav", "te.wav", "hi.wav"]
+        assert cmd.count("0:v:0") == 3
+        assert cmd.count("-c:v") == 3 and "libx264" not in cmd
+        for index, output in enumerate(("en.mp4", "te.mp4", "hi.mp4"), start=1):
+            position = cmd.index(output)
+            assert cmd[position - 8:position - 6] == ["-map", f"[narration{index}]"]
+
+
+class TestGenerateBatch:
+    """Test the multi-language batch endpoint"""
+
+    def test_one_job_per_language(self, session_factory, folder):
+        """Test that a batch stores the video once and creates a job per language"""
+        client = make_client(session_factory)
+        with patch.object(video_generation.job_executor, "submit_batch") as submit:
+            response = submit_batch(client, "en, te,hi,en")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [job["target_language"] for job in body["jobs"]] == ["en", "te", "hi"]
+        submit.assert_called_once()
+        assert submit.call_args.args[0] == [job["id"] for job in body["jobs"]]
+
+        db = session_factory()
+        jobs = db.query(Job).filter(Job.batch_id == body["batch_id"]).all()
+        assert len(jobs) == 3
+        assert len({job.input_file_path for job in jobs}) == 1
+        assert content_store.get(db, hashlib.sha256(VIDEO).hexdigest()).ref_count == 3
+        db.close()
+
+        status = client.get(f"/api/v1/batch/{body['batch_id']}")
+        assert [job["id"] for job in status.json()["jobs"]] == [job["id"] for job in body["jobs"]]
+
+    def test_credits_cover_every_language(self, session_factory, folder):
+        """Test that a batch is refused unless the user can pay for every video"""
+        client = make_client(session_factory, credits=400)
+        with patch.object(video_generation.job_executor, "submit_batch") as submit:
+            response = submit_batch(client, "en,te,hi")
+
+        assert response.status_code == 403
+        submit.assert_not_called()
+
+    def test_language_list_is_validated(self, session_factory, folder):
+        """Test empty and oversized language lists"""
+        client = make_client(session_factory)
+        assert submit_batch(client, " , ").status_code == 400
+        with patch.object(video_generation.settings, "max_batch_languages", 2):
+            assert submit_batch(client, "en,te,hi").status_code == 400
+
+    def test_output_mode_is_validated(self, session_factory, folder):
+        """Test that unknown output modes are rejected"""
+        client = make_client(session_factory)
+        response = client.post(
+            "/api/v1/generate-batch",
+            data={"description_text": "Sunny loft", "target_languages": "en,te", "output_mode": "mkv"},
+            files={"video_file": ("loft.mp4", VIDEO, "video/mp4")}
+        )
+        assert response.status_code == 400
+
+
+def seed_batch(session_factory, folder):
+    """A user, a stored video and one pending job per language"""
+    db = session_factory()
+    db.add(User(id=1, username="agent", email="agent@example.com", hashed_password="x", credits=1000))
+    video_path = os.path.join(folder, "loft.mp4")
+    with open(video_path, "wb") as f:
+        f.write(VIDEO)
+    jobs = [Job(status="PENDING", input_file_path=video_path, description_text="Sunny loft",
+                target_language=language, batch_id="batch") for language in ("en", "te", "hi")]
+    db.add_all(jobs)
+    db.commit()
+    job_ids = [job.id for job in jobs]
+    db.close()
+    return video_path, job_ids
+
+
+async def run_batch(session_factory, folder, video_path, job_ids, output_mode="separate", size=(None, None),
+                    resolution=None):
+    """Run the batch worker with narration, probing and ffmpeg faked; returns (probes, ffmpeg runs)"""
+    async def fake_narration(job_id, timer, text, language, voice):
+        if language == "te":
+            raise RuntimeError("translation unavailable")
+        with timer.stage("narration"):
+            path = os.path.join(folder, f"{language}.wav")
+            with open(path, "wb") as f:
+                f.write(b"RIFF")
+        return path
+
+    async def fake_probe(path):
+        probes.append(path)
+        return MediaInfo(path=path, duration=12.0, video_codec="h264", width=size[0], height=size[1])
+
+    def fake_ffmpeg(cmd, **kwargs):
+        ffmpeg_runs.append(cmd)
+        for output in (arg for arg in cmd if arg.startswith((os.path.join(folder, "output_"), os.path.join(folder, "scaled_")))):
+            with open(output, "wb") as f:
+                f.write(b"mp4")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    probes, ffmpeg_runs = [], []
+    with patch.object(database, "get_db", lambda: iter([session_factory()])), \
+            patch.object(video_generation, "generate_narration", fake_narration), \
+            patch.object(video_generation.probe_service, "probe_async", fake_probe), \
+            patch.object(video_generation.subprocess, "run", fake_ffmpeg), \
+            patch.object(logging_service, "log"):
+        await video_generation.process_batch_with_narration(
+            "batch", job_ids, video_path, "Sunny loft", ["en", "te", "hi"], 1, output_mode, resolution
+        )
+    return probes, ffmpeg_runs
+
+
+class TestProcessBatch:
+    @pytest.mark.asyncio
+    async def test_probe_and_mux_run_once(self, session_factory, folder):
+        """Test that the batch probes and muxes once and isolates a failed narration"""
+        video_path, job_ids = seed_batch(session_factory, folder)
+        probes, ffmpeg_runs = await run_batch(session_factory, folder, video_path, job_ids)
+
+        assert probes == [video_path]
+        assert len(ffmpeg_runs) == 1
+
+        db = session_factory()
+        en, te, hi = (db.get(Job, job_id) for job_id in job_ids)
+        assert (en.status, hi.status, te.status) == ("COMPLETED", "COMPLETED", "FAILED")
+        assert "translation unavailable" in te.error_message
+        assert os.path.exists(en.output_file_path) and en.output_file_path != hi.output_file_path
+        assert db.get(User, 1).credits == 600
+        assert {stage.stage for stage in en.stages} == {"probe", "narration", "mux"}
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_finished_stages_report_progress(self, session_factory, folder):
+        """Test that narration and video preparation move progress on without a status change"""
+        video_path, job_ids = seed_batch(session_factory, folder)
+        with patch("app.services.job_service.progress_broker") as broker:
+            await run_batch(session_factory, folder, video_path, job_ids)
+
+        en_updates = [call.args[1:3] for call in broker.publish.call_args_list if call.args[0] == job_ids[0]]
+        assert en_updates == [
+            ("PROCESSING", 10), ("GENERATING_AUDIO", 30), ("GENERATING_AUDIO", 43),
+            ("GENERATING_AUDIO", 56), ("MERGING_VIDEO", 70), ("COMPLETED", 100)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_multitrack_jobs_share_one_output(self, session_factory, folder):
+        """Test that multitrack mode writes one file carrying every narrated language"""
+        video_path, job_ids = seed_batch(session_factory, folder)
+        _, ffmpeg_runs = await run_batch(session_factory, folder, video_path, job_ids, "multitrack")
+
+        cmd = ffmpeg_runs[0]
+        assert "language=eng" in cmd and "language=hin" in cmd and "language=tel" not in cmd
+
+        db = session_factory()
+        en, te, hi = (db.get(Job, job_id) for job_id in job_ids)
+        assert en.output_file_path == hi.output_file_path
+        assert cmd[-1] == en.output_file_path
+        assert te.status == "FAILED" and te.output_file_path is None
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_scaled_video_is_muxed_by_copy(self, session_factory, folder):
+        """Test that the batch scales the video once, next to the narrations, and copies it into every output"""
+        video_path, job_ids = seed_batch(session_factory, folder)
+        with patch.object(video_generation.settings, "enable_video_transcode", True):
+            _, ffmpeg_runs = await run_batch(session_factory, folder, video_path, job_ids,
+                                             size=(3840, 2160), resolution="720p")
+
+        transcode, mux = ffmpeg_runs
+        assert "libx264" in transcode and "-an" in transcode
+        assert mux[mux.index("-i") + 1] == transcode[-1] and "libx264" not in mux
+        assert not os.path.exists(transcode[-1])
+
+        db = session_factory()
+        en = db.get(Job, job_ids[0])
+        assert en.status == "COMPLETED"
+        assert [stage.stage for stage in en.stages if stage.stage != "narration"] == ["probe", "transcode", "mux"]
+        db.close()
+
+
+class TestMultitrackCommand:
+    def test_tracks_are_language_tagged(self):
+        """Test that every narration becomes a tagged audio track of one output"""
+        cmd = build_multitrack_mux_command(
+            "video.mp4", [("en", "en.wav"), ("te", "te.wav"), ("hi", "hi.wav")], "out.mp4", 12.5
+        )
+
+        assert cmd[-1] == "out.mp4" and cmd.count("out.mp4") == 1
+        assert cmd.count("0:v:0") == 1
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"] == \
+            ["0:v:0", "[narration1]", "[narration2]", "[narration3]"]
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg.startswith("-metadata:s:a:")] == \
+            ["language=eng", "language=tel", "language=hin"]
+        assert cmd[cmd.index("-disposition:a:0") + 1] == "default"
+
+    def test_iso639_2(self):
+        assert iso639_2("TE") == "tel"
+        assert iso639_2("deu") == "deu"
+        assert iso639_2("xx") == "und"
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                        reason="FFmpeg and ffprobe are required to mux a real file")
+    def test_ffprobe_sees_every_track(self, folder):
+        """Test the muxed file with ffprobe: one video stream, one tagged audio stream per language"""
+        video_path = os.path.join(folder, "video.mp4")
+        subprocess.run([
+            'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=duration=3:size=320x180:rate=25',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p', video_path
+        ], capture_output=True, check=True)
+        narrations = []
+        for language, frequency in (("en", 440), ("te", 660)):
+            audio_path = os.path.join(folder, f"{language}.wav")
+            subprocess.run([
+                'ffmpeg', '-y', '-f', 'lavfi', '-i', f'sine=frequency={frequency}:duration=2', audio_path
+            ], capture_output=True, check=True)
+            narrations.append((language, audio_path))
+
+        output_path = os.path.join(folder, "multitrack.mp4")
+        result = subprocess.run(build_multitrack_mux_command(video_path, narrations, output_path, 3.0),
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+        probe = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-show_entries', 'stream=codec_type:stream_tags=language',
+            '-of', 'csv=p=0', output_path
+        ], capture_output=True, text=True)
+        assert probe.stdout.split() == ["video,und", "audio,eng", "audio,tel"]
@@ -0,0 +1,240 @@
+import os
+import hashlib
+import tempfile
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+import app.database as database
+from app.database import Base, get_db
+from app.models.job import Job, JobStage
+from app.models.upload import StoredFile
+from app.models.user import User
+from app.api.v1 import video_generation
+from app.api.v1.endpoints.auth import get_current_user
+from app.services import job_service
+from app.services.job_executor import JobExecutor
+from app.services.job_service import JobTracker
+from app.services.storage_service import ContentStore, content_store
+
+
+VIDEO = b"walkthrough" * 1000
+VIDEO_SHA256 = hashlib.sha256(VIDEO).hexdigest()
+
+
+@pytest.fixture
+def engine():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def session_factory(engine):
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__, JobStage.__table__, StoredFile.__table__])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def folder():
+    with tempfile.TemporaryDirectory() as folder:
+        yield folder
+
+
+def write_upload(folder, name, content=VIDEO):
+    path = os.path.join(folder, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+class TestContentStore:
+    """Test content-addressed input storage"""
+
+    def test_duplicate_content_stored_once(self, session_factory, folder):
+        """Test that identical uploads share one file and count references"""
+        store = ContentStore(root=os.path.join(folder, "objects"))
+        db = session_factory()
+
+        first = store.add(db, write_upload(folder, "a.mp4"), VIDEO_SHA256)
+        second_upload = write_upload(folder, "b.mp4")
+        second = store.add(db, second_upload, VIDEO_SHA256)
+
+        assert first.file_path == second.file_path
+        assert second.ref_count == 2
+        assert not os.path.exists(second_upload)
+        assert db.query(StoredFile).count() == 1
+        db.close()
+
+    def test_file_deleted_with_last_reference(self, session_factory, folder):
+        """Test that releasing keeps the file until nothing references it"""
+        store = ContentStore(root=os.path.join(folder, "objects"))
+        db = session_factory()
+        stored_path = store.add(db, write_upload(folder, "a.mp4"), VIDEO_SHA256).file_path
+        store.add(db, write_upload(folder, "b.mp4"), VIDEO_SHA256)
+
+        assert store.release(db, VIDEO_SHA256) is False
+        assert os.path.exists(stored_path)
+        assert store.release(db, VIDEO_SHA256) is True
+        assert not os.path.exists(stored_path)
+        assert store.get(db, VIDEO_SHA256) is None
+        db.close()
+
+    def test_cleanup_keeps_shared_inputs(self, session_factory, folder):
+        """Test that cleanup_old_jobs only deletes an input once no job uses it"""
+        db = session_factory()
+        with patch.object(content_store, "root", os.path.join(folder, "objects")):
+            stored_path = content_store.add(db, write_upload(folder, "a.mp4"), VIDEO_SHA256).file_path
+            content_store.add(db, write_upload(folder, "b.mp4"), VIDEO_SHA256)
+
+            old = datetime.utcnow() - timedelta(days=10)
+            old_job = Job(status="COMPLETED", input_file_path=stored_path, input_sha256=VIDEO_SHA256,
+                          description_text="Old", target_language="en", created_at=old, updated_at=old)
+            new_job = Job(status="COMPLETED", input_file_path=stored_path, input_sha256=VIDEO_SHA256,
+                          description_text="New", target_language="fr")
+            db.add_all([old_job, new_job])
+            db.commit()
+
+            tracker = JobTracker(db)
+            assert tracker.cleanup_old_jobs(days_old=7) == 1
+            assert os.path.exists(stored_path)
+
+            tracker.delete_job(new_job.id)
+            assert not os.path.exists(stored_path)
+        db.close()
+
+    def test_release_and_add_from_separate_processes(self, session_factory, folder):
+        """Test that an add racing the last release stores a fresh copy rather than losing it"""
+        root = os.path.join(folder, "objects")
+        # Separate instances don't share a lock, like two server processes
+        releasing, adding = ContentStore(root=root), ContentStore(root=root)
+        db = session_factory()
+        stored_path = releasing.add(db, write_upload(folder, "a.mp4"), VIDEO_SHA256).file_path
+        removing, removed = threading.Event(), threading.Event()
+        remove = os.remove
+
+        def slow_remove(path):
+            removing.set()
+            removed.wait(timeout=5)
+            remove(path)
+
+        def add_again():
+            other = session_factory()
+            try:
+                adding.add(other, write_upload(folder, "b.mp4"), VIDEO_SHA256)
+            finally:
+                other.close()
+
+        with patch("app.services.storage_service.os.remove", side_effect=slow_remove):
+            releaser = threading.Thread(target=lambda: releasing.release(db, VIDEO_SHA256))
+            releaser.start()
+            assert removing.wait(timeout=5)
+            adder = threading.Thread(target=add_again)
+            adder.start()
+            time.sleep(0.1)
+            removed.set()
+            releaser.join(timeout=10)
+            adder.join(timeout=10)
+        db.close()
+
+        db = session_factory()
+        assert content_store.get(db, VIDEO_SHA256).ref_count == 1
+        assert os.path.exists(stored_path)
+        db.close()
+
+    def test_running_job_keeps_its_input_until_it_finishes(self, session_factory, folder):
+        """Test that deleting a running job defers releasing its input to the end of the job"""
+        db = session_factory()
+        pool = JobExecutor(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def running_job():
+            started.set()
+            release.wait(timeout=5)
+
+        with patch.object(content_store, "root", os.path.join(folder, "objects")), \
+                patch.object(job_service, "job_executor", pool), \
+                patch.object(job_service, "SessionLocal", session_factory):
+            stored_path = content_store.add(db, write_upload(folder, "a.mp4"), VIDEO_SHA256).file_path
+            job = Job(status="PROCESSING", input_file_path=stored_path, input_sha256=VIDEO_SHA256,
+                      description_text="Running", target_language="en")
+            db.add(job)
+            db.commit()
+            future = pool.submit(job.id, running_job)
+            assert started.wait(timeout=5)
+
+            assert JobTracker(db).delete_job(job.id) is True
+            assert db.get(Job, job.id) is None
+            assert os.path.exists(stored_path)
+
+            release.set()
+            future.result(timeout=5)
+            pool.shutdown(wait=True)
+            assert not os.path.exists(stored_path)
+        db.close()
+
+    def test_generate_reuses_identical_upload(self, session_factory, folder):
+        """Test that re-uploading the same video points both jobs at one file"""
+        app = FastAPI()
+        app.include_router(video_generation.router, prefix="/api/v1")
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: User(id=1, username="agent", credits=1000)
+        client = TestClient(app)
+
+        with patch.object(video_generation.settings, "upload_folder", folder), \
+                patch.object(content_store, "root", os.path.join(folder, "objects")), \
+                patch.object(video_generation.job_executor, "submit"):
+            ids = [
+                client.post(
+                    "/api/v1/generate",
+                    data={"description_text": "Sunny loft", "target_language": language},
+                    files={"video_file": ("loft.mp4", VIDEO, "video/mp4")}
+                ).json()["id"]
+                for language in ("en", "de")
+            ]
+
+        db = session_factory()
+        jobs = [db.get(Job, job_id) for job_id in ids]
+        assert jobs[0].input_file_path == jobs[1].input_file_path
+        assert {job.input_sha256 for job in jobs} == {VIDEO_SHA256}
+        assert content_store.get(db, VIDEO_SHA256).ref_count == 2
+        assert sorted(os.listdir(folder)) == ["objects"]
+        db.close()
+
+
+class TestSchemaUpgrade:
+    def test_create_all_tables_leaves_existing_tables_to_alembic(self, engine):
+        """Test that startup doesn't alter an existing table, or fail on indexes for columns it lacks"""
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE jobs (id INTEGER PRIMARY KEY, status VARCHAR(50) NOT NULL, "
+                "input_file_path VARCHAR(500) NOT NULL, description_text TEXT NOT NULL, "
+                "target_language VARCHAR(10) NOT NULL, output_file_path VARCHAR(500), "
+                "created_at DATETIME, updated_at DATETIME, error_message TEXT, progress INTEGER)"
+            ))
+
+        with patch.object(database, "engine", engine):
+            database.create_all_tables()
+
+        columns = {column["name"] for column in inspect(engine).get_columns("jobs")}
+        indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+        assert "input_sha256" not in columns
+        assert "ix_jobs_input_sha256" not in indexes
+        assert "ix_jobs_status_id" in indexes
+        assert "stored_files" in inspect(engine).get_table_names()
@@ -0,0 +1,123 @@
+import os
+import time
+import tempfile
+import threading
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, create_db_engine, sqlite_pragmas
+from app.models.job import Job
+from app.services.job_service import percentile
+
+
+DURATION = 1.0
+READERS = 4
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    yield path
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def run_mixed_load(engine):
+    """
+    Commit job progress updates on one thread while others read the job
+    list, like workers and API requests sharing the database.
+    Returns (writes, read latencies in ms, errors).
+    """
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(Job(input_file_path=f"{i}.mp4", description_text="House", target_language="en") for i in range(200))
+        db.commit()
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    writes = 0
+
+    def writer():
+        nonlocal writes
+        with Session() as db:
+            progress = 0
+            while not stop.is_set():
+                progress = (progress + 1) % 100
+                db.execute(update(Job).where(Job.id == 1 + progress).values(status="PROCESSING", progress=progress))
+                # Hold the write transaction briefly, as a job committing several rows would
+                time.sleep(0.002)
+                db.commit()
+                writes += 1
+
+    def reader():
+        with Session() as db:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.query(Job).order_by(Job.id.desc()).limit(50).all()
+                    db.commit()
+                except OperationalError as e:
+                    errors.append(str(e))
+                    db.rollback()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return writes, latencies, errors
+
+
+class TestDatabaseProfile:
+    """Test the SQLite performance profile"""
+
+    def test_pragmas_applied(self, db_path):
+        """Test that every connection gets the configured pragmas"""
+        engine = create_db_engine(f"sqlite:///{db_path}")
+        with engine.connect() as conn:
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+            synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+            busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+            mmap_size = conn.execute(text("PRAGMA mmap_size")).scalar()
+        engine.dispose()
+
+        expected = sqlite_pragmas()
+        assert journal_mode == expected["journal_mode"].lower()
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == expected["busy_timeout"]
+        assert mmap_size == expected["mmap_size"]
+
+    def test_concurrent_reads_and_writes(self, db_path):
+        """Benchmark API-style reads against committing progress writes in WAL and rollback-journal mode"""
+        rollback_path = db_path + ".rollback"
+        try:
+            rollback = run_mixed_load(create_db_engine(
+                f"sqlite:///{rollback_path}",
+                pragmas={**sqlite_pragmas(), "journal_mode": "DELETE", "synchronous": "FULL"}
+            ))
+        finally:
+            for suffix in ("", "-journal"):
+                if os.path.exists(rollback_path + suffix):
+                    os.remove(rollback_path + suffix)
+        wal = run_mixed_load(create_db_engine(f"sqlite:///{db_path}"))
+
+        for name, (writes, latencies, errors) in (("rollback journal", rollback), ("wal", wal)):
+            print(
+                f"\n{name}: {writes} writes, {len(latencies)} reads, "
+                f"read p50 {percentile(latencies, 50):.2f}ms p99 {percentile(latencies, 99):.2f}ms, "
+                f"{len(errors)} errors"
+            )
+
+        # Readers no longer hold shared locks that stall the writer's commits
+        wal_writes, wal_latencies, wal_errors = wal
+        assert not wal_errors
+        assert wal_latencies
+        assert wal_writes > rollback[0]
@@ -0,0 +1,122 @@
+import pytest
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from app.services.video_service import build_narration_mux_command
+
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="FFmpeg and ffprobe are required for the mux benchmark"
+)
+
+
+class CommandRecorder:
+    """Run commands through subprocess.run while counting process launches"""
+
+    def __init__(self):
+        self.launches = 0
+
+    def run(self, cmd):
+        self.launches += 1
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+
+def probe_duration(recorder, path):
+    result = recorder.run([
+        'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
+        '-of', 'csv=p=0', path
+    ])
+    return float(result.stdout.strip())
+
+
+def legacy_multi_pass(recorder, video_path, audio_path, output_path):
+    """The previous narration path: probe audio, probe video, probe audio again,
+    write an adjusted WAV, then mux"""
+    probe_duration(recorder, audio_path)
+    video_duration = probe_duration(recorder, video_path)
+    audio_duration = probe_duration(recorder, audio_path)
+
+    if abs(audio_duration - video_duration) > 0.1:
+        adjusted_audio_path = audio_path.replace('.wav', '_adjusted.wav')
+        if audio_duration > video_duration:
+            adjust_cmd = ['ffmpeg', '-i', audio_path, '-t', str(video_duration), '-y', adjusted_audio_path]
+        else:
+            adjust_cmd = ['ffmpeg', '-i', audio_path, '-af', f'apad=pad_dur={video_duration - audio_duration}',
+                          '-y', adjusted_audio_path]
+        recorder.run(adjust_cmd)
+        audio_path = adjusted_audio_path
+
+    recorder.run([
+        'ffmpeg', '-y', '-i', video_path, '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0', '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k',
+        output_path
+    ])
+
+
+def single_pass(recorder, video_path, audio_path, output_path):
+    """The filtergraph path: one probe of the video, one ffmpeg invocation"""
+    video_duration = probe_duration(recorder, video_path)
+    recorder.run(build_narration_mux_command(video_path, audio_path, output_path, video_duration))
+
+
+def directory_bytes(directory, exclude):
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name not in exclude
+    )
+
+
+@pytest.fixture(params=[3, 8], ids=["pad", "trim"])
+def media_dir(request):
+    """Create a 5 second test video and a narration shorter or longer than it"""
+    directory = tempfile.mkdtemp()
+    subprocess.run([
+        'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=duration=5:size=640x360:rate=25',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', os.path.join(directory, 'video.mp4')
+    ], capture_output=True, check=True)
+    subprocess.run([
+        'ffmpeg', '-y', '-f', 'lavfi', '-i', f'sine=frequency=440:duration={request.param}',
+        '-ac', '1', '-acodec', 'pcm_s16le', os.path.join(directory, 'narration.wav')
+    ], capture_output=True, check=True)
+    yield directory
+    shutil.rmtree(directory)
+
+
+class TestNarrationMuxBenchmark:
+    def test_single_pass_vs_multi_pass(self, media_dir):
+        """Compare process launches, wall time and bytes written for both mux paths"""
+        video_path = os.path.join(media_dir, 'video.mp4')
+        audio_path = os.path.join(media_dir, 'narration.wav')
+        inputs = {'video.mp4', 'narration.wav'}
+
+        legacy = CommandRecorder()
+        start = time.perf_counter()
+        legacy_multi_pass(legacy, video_path, audio_path, os.path.join(media_dir, 'legacy.mp4'))
+        legacy_seconds = time.perf_counter() - start
+        legacy_bytes = directory_bytes(media_dir, inputs)
+
+        fused = CommandRecorder()
+        start = time.perf_counter()
+        single_pass(fused, video_path, audio_path, os.path.join(media_dir, 'single.mp4'))
+        single_seconds = time.perf_counter() - start
+        single_bytes = directory_bytes(media_dir, inputs) - legacy_bytes
+
+        print(
+            f"\nlegacy: {legacy.launches} processes, {legacy_seconds:.3f}s, {legacy_bytes} bytes written"
+            f"\nsingle: {fused.launches} processes, {single_seconds:.3f}s, {single_bytes} bytes written"
+        )
+
+        assert fused.launches == 2
+        assert fused.launches < legacy.launches
+        assert single_bytes < legacy_bytes
+
+        # Both paths must produce output that matches the video duration
+        checker = CommandRecorder()
+        legacy_duration = probe_duration(checker, os.path.join(media_dir, 'legacy.mp4'))
+        single_duration = probe_duration(checker, os.path.join(media_dir, 'single.mp4'))
+        assert single_duration == pytest.approx(5.0, abs=0.2)
+        assert single_duration == pytest.approx(legacy_duration, abs=0.2)
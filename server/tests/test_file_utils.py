@@ -0,0 +1,87 @@
+import pytest
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+from fastapi import UploadFile
+from app.utils import file_utils
+from app.utils.file_utils import stream_upload_to_file
+from app.utils.exceptions import UploadTooLargeError
+
+
+class TrackingStream(io.BytesIO):
+    """BytesIO that records the largest single read request"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.largest_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+@pytest.fixture
+def destination():
+    """Provide a destination path that is removed after the test"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "upload.mp4")
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+    os.rmdir(directory)
+
+
+class TestStreamUploadToFile:
+    @pytest.mark.asyncio
+    async def test_copies_content_and_hashes(self, destination):
+        """Test that the file is copied intact and hashed on the fly"""
+        data = os.urandom(300 * 1024)
+        upload = UploadFile(file=io.BytesIO(data), filename="tour.mp4")
+
+        size, sha256 = await stream_upload_to_file(upload, destination, max_bytes=len(data), chunk_size=64 * 1024)
+
+        assert size == len(data)
+        assert sha256 == hashlib.sha256(data).hexdigest()
+        with open(destination, "rb") as f:
+            assert f.read() == data
+
+    @pytest.mark.asyncio
+    async def test_reads_in_bounded_chunks(self, destination):
+        """Test that no read pulls more than chunk_size bytes into memory"""
+        stream = TrackingStream(os.urandom(256 * 1024))
+        upload = UploadFile(file=stream, filename="tour.mp4")
+
+        await stream_upload_to_file(upload, destination, max_bytes=1024 * 1024, chunk_size=16 * 1024)
+
+        assert stream.largest_read == 16 * 1024
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_upload(self, destination):
+        """Test that the size limit is enforced while streaming and the partial file removed"""
+        upload = UploadFile(file=io.BytesIO(b"\x00" * 5000), filename="tour.mp4")
+
+        with pytest.raises(UploadTooLargeError):
+            await stream_upload_to_file(upload, destination, max_bytes=4096, chunk_size=1024)
+
+        assert not os.path.exists(destination)
+
+    @pytest.mark.asyncio
+    async def test_writes_off_the_event_loop(self, destination):
+        """Test that chunks are hashed and written on a worker thread, not the loop's"""
+        loop_thread = threading.get_ident()
+        writers = set()
+        write = file_utils._hash_and_write
+
+        def recording_write(digest, buffer, chunk):
+            writers.add(threading.get_ident())
+            write(digest, buffer, chunk)
+
+        upload = UploadFile(file=io.BytesIO(os.urandom(64 * 1024)), filename="tour.mp4")
+        with patch.object(file_utils, "_hash_and_write", recording_write):
+            await stream_upload_to_file(upload, destination, max_bytes=1024 * 1024, chunk_size=16 * 1024)
+
+        assert writers and loop_thread not in writers
@@ -0,0 +1,94 @@
+import pytest
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.services.http_client import HTTPClientPool
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    """Keep-alive stub that answers like the Gemini generateContent API"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"candidates": [{"content": {"parts": [{"text": "ok"}]}}]}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run the stub server on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_concurrent_jobs(post, url, jobs=4, requests_per_job=10):
+    def job():
+        for _ in range(requests_per_job):
+            response = post(url, data=b'{"contents": []}')
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for future in [pool.submit(job) for _ in range(jobs)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+class TestHTTPClientPool:
+    def test_session_is_shared(self):
+        """Test that the pool hands out one keep-alive session"""
+        pool = HTTPClientPool()
+        assert pool.session() is pool.session()
+        pool.close()
+
+    def test_default_timeout_applied(self, stub_server):
+        """Test that configured timeouts are used when none is passed"""
+        pool = HTTPClientPool(connect_timeout=1.5, read_timeout=7.0)
+        assert pool.timeout == (1.5, 7.0)
+        url = f"http://127.0.0.1:{stub_server.server_address[1]}/v1beta/models/gemini-pro:generateContent"
+        assert pool.post(url, data=b"{}").json()["candidates"][0]["content"]["parts"][0]["text"] == "ok"
+        pool.close()
+
+    def test_pooling_saves_handshakes_under_concurrent_jobs(self, stub_server):
+        """Test that concurrent jobs reuse pooled connections instead of reconnecting per call"""
+        url = f"http://127.0.0.1:{stub_server.server_address[1]}/v1beta/models/gemini-pro:generateContent"
+
+        bare_seconds = run_concurrent_jobs(lambda u, **kw: requests.post(u, timeout=5, **kw), url)
+        bare_connections = stub_server.connections
+
+        stub_server.connections = 0
+        pool = HTTPClientPool(pool_maxsize=4)
+        pooled_seconds = run_concurrent_jobs(pool.post, url)
+        pooled_connections = stub_server.connections
+        pool.close()
+
+        print(
+            f"\nbare requests.post: {bare_connections} connections, {bare_seconds:.3f}s"
+            f"\npooled session:     {pooled_connections} connections, {pooled_seconds:.3f}s"
+        )
+
+        assert bare_connections == 40
+        assert pooled_connections <= 4
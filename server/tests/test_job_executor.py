@@ -0,0 +1,159 @@
+import pytest
+import threading
+import time
+from app.schemas.request import JobStatus
+from app.services.job_executor import JobExecutor
+
+
+@pytest.fixture
+def executor():
+    """Create a small JobExecutor for testing"""
+    pool = JobExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class TestJobExecutorSubmit:
+    def test_runs_plain_function(self, executor):
+        """Test that a synchronous callable runs on a worker thread"""
+        future = executor.submit(1, lambda x: x * 2, 21)
+        assert future.result(timeout=5) == 42
+
+    def test_runs_coroutine_function(self, executor):
+        """Test that coroutine functions are driven on the worker's own loop"""
+        async def job(value):
+            return value + 1
+
+        future = executor.submit(2, job, 1)
+        assert future.result(timeout=5) == 2
+
+    def test_does_not_run_on_calling_thread(self, executor):
+        """Test that jobs never execute on the submitting thread"""
+        caller = threading.get_ident()
+        future = executor.submit(3, threading.get_ident)
+        assert future.result(timeout=5) != caller
+
+
+class TestJobExecutorConcurrency:
+    def test_honours_max_workers(self, executor):
+        """Test that no more than max_workers jobs run at the same time"""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def job():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+
+        futures = [executor.submit(i, job) for i in range(6)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert running["peak"] == 2
+
+    def test_stats_accounting(self, executor):
+        """Test queued/running/finished counters"""
+        release = threading.Event()
+
+        def blocking_job():
+            release.wait(timeout=5)
+
+        def failing_job():
+            raise RuntimeError("boom")
+
+        blockers = [executor.submit(i, blocking_job) for i in range(3)]
+        time.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats["running"] == 2
+        assert stats["queued"] == 1
+
+        release.set()
+        for future in blockers:
+            future.result(timeout=5)
+
+        failed = executor.submit(99, failing_job)
+        with pytest.raises(RuntimeError):
+            failed.result(timeout=5)
+
+        stats = executor.stats()
+        assert stats["queued"] == 0
+        assert stats["running"] == 0
+        assert stats["completed"] == 3
+        assert stats["failed"] == 1
+        assert stats["active_jobs"] == {}
+
+    def test_reported_failure_is_counted(self, executor):
+        """Test that a job returning FAILED counts as failed without raising"""
+        assert executor.submit(1, lambda: JobStatus.FAILED).result(timeout=5) == "FAILED"
+        executor.submit(2, lambda: "COMPLETED").result(timeout=5)
+
+        stats = executor.stats()
+        assert (stats["completed"], stats["failed"]) == (1, 1)
+
+    def test_batch_counts_each_job(self, executor):
+        """Test that a batch runs once but is accounted for per job"""
+        release = threading.Event()
+        calls = []
+
+        def batch_job(job_ids):
+            calls.append(job_ids)
+            release.wait(timeout=5)
+
+        blockers = [executor.submit(job_id, release.wait, 5) for job_id in (1, 2)]
+        batch = executor.submit_batch([3, 4, 5], batch_job, [3, 4, 5])
+        time.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats["queued"] == 3
+        assert stats["active_jobs"] == {1: "RUNNING", 2: "RUNNING", 3: "QUEUED", 4: "QUEUED", 5: "QUEUED"}
+        finished = threading.Event()
+        assert executor.when_finished(5, finished.set)
+
+        release.set()
+        for future in blockers + [batch]:
+            future.result(timeout=5)
+
+        assert calls == [[3, 4, 5]]
+        assert finished.wait(timeout=5)
+        stats = executor.stats()
+        assert (stats["queued"], stats["running"], stats["completed"]) == (0, 0, 5)
+
+    def test_submit_after_shutdown_leaves_counters_alone(self):
+        """Test that a rejected submit is not left counted as queued"""
+        pool = JobExecutor(max_workers=1)
+        pool.shutdown(wait=True)
+
+        with pytest.raises(RuntimeError):
+            pool.submit_batch([1, 2], lambda: None)
+
+        stats = pool.stats()
+        assert (stats["queued"], stats["active_jobs"]) == (0, {})
+        assert not pool.when_finished(1, lambda: None)
+
+
+class TestJobExecutorShutdown:
+    def test_cancel_futures_returns_queued_jobs(self):
+        """Test that shutdown drops queued jobs, finishes running ones and reports what it dropped"""
+        pool = JobExecutor(max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait(timeout=5)
+
+        running = pool.submit(1, blocking_job)
+        queued = [pool.submit(job_id, blocking_job) for job_id in (2, 3)]
+        assert started.wait(timeout=5)
+        threading.Timer(0.05, release.set).start()
+
+        assert pool.shutdown(wait=True, cancel_futures=True) == [2, 3]
+        assert running.done() and not running.cancelled()
+        assert all(future.cancelled() for future in queued)
+        stats = pool.stats()
+        assert (stats["queued"], stats["completed"], stats["cancelled"]) == (0, 1, 2)
+        assert stats["active_jobs"] == {}
@@ -2,7 +2,9 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
-from app.services.job_service import JobTracker, get_job_tracker
+from unittest.mock import patch
+from sqlalchemy import event
+from app.services.job_service import JobProgressWriter, JobTracker, get_job_tracker
 from app.models.job import Job
 from app.schemas.request import JobStatus
 import os
@@ -229,7 +231,7 @@ class TestListJobs:
         )
         
         # List all jobs
-        jobs = job_tracker.list_jobs()
+        jobs, _ = job_tracker.list_jobs_page()
         
         # Verify both jobs are returned
         assert len(jobs) == 2
@@ -255,8 +257,8 @@ class TestListJobs:
         job_tracker.update_job_status(job2.id, "PROCESSING")
         
         # List jobs with PENDING status
-        pending_jobs = job_tracker.list_jobs(status="PENDING")
-        processing_jobs = job_tracker.list_jobs(status="PROCESSING")
+        pending_jobs, _ = job_tracker.list_jobs_page(status="PENDING")
+        processing_jobs, _ = job_tracker.list_jobs_page(status="PROCESSING")
         
         # Verify filtering works
         assert len(pending_jobs) == 1
@@ -264,8 +266,8 @@ class TestListJobs:
         assert len(processing_jobs) == 1
         assert processing_jobs[0].id == job2.id
     
-    def test_list_jobs_with_limit_and_offset(self, job_tracker, db_session):
-        """Test listing jobs with limit and offset"""
+    def test_list_jobs_with_limit_and_cursor(self, job_tracker, db_session):
+        """Test listing jobs a page at a time"""
         # Create multiple jobs
         for i in range(5):
             job_tracker.create_job(
@@ -275,12 +277,13 @@ class TestListJobs:
             )
         
         # List jobs with limit
-        limited_jobs = job_tracker.list_jobs(limit=3)
+        limited_jobs, cursor = job_tracker.list_jobs_page(limit=3)
         assert len(limited_jobs) == 3
         
-        # List jobs with offset
-        offset_jobs = job_tracker.list_jobs(limit=3, offset=2)
-        assert len(offset_jobs) <= 3  # Could be less if there aren't enough jobs
+        # The cursor continues after the first page
+        next_jobs, _ = job_tracker.list_jobs_page(limit=3, cursor=cursor)
+        assert len(next_jobs) <= 3  # Could be less if there aren't enough jobs
+        assert not {job.id for job in next_jobs} & {job.id for job in limited_jobs}
 
 
 class TestDeleteJob:
@@ -418,6 +421,231 @@ class TestFileOperationsInCleanup:
                         pass  # File might already be deleted
 
 
+    def test_cleanup_keeps_shared_output(self, job_tracker, db_session):
+        """Test that an output shared by a batch is deleted with the last job using it"""
+        with tempfile.NamedTemporaryFile(delete=False) as output_file:
+            output_file_path = output_file.name
+        
+        try:
+            old = datetime.utcnow() - timedelta(days=10)
+            for language, updated_at in (("en", old), ("te", old), ("hi", datetime.utcnow())):
+                db_session.add(Job(
+                    status="COMPLETED",
+                    input_file_path="/path/to/video.mp4",
+                    output_file_path=output_file_path,
+                    description_text="Multi-track property video",
+                    target_language=language,
+                    batch_id="batch",
+                    updated_at=updated_at
+                ))
+            db_session.commit()
+            
+            assert job_tracker.cleanup_old_jobs(days_old=7) == 2
+            assert os.path.exists(output_file_path)
+            
+            assert job_tracker.cleanup_old_jobs(days_old=-1) == 1
+            assert not os.path.exists(output_file_path)
+        
+        finally:
+            if os.path.exists(output_file_path):
+                os.remove(output_file_path)
+
+
+class TestStageTimings:
+    def _stage(self, name, duration, **extra):
+        now = datetime.utcnow()
+        return {"stage": name, "started_at": now, "ended_at": now + timedelta(seconds=duration),
+                "duration": duration, **extra}
+
+    def test_record_and_get_stages(self, job_tracker):
+        """Test that StageTimer records are persisted in order"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        job_tracker.record_stages(job.id, [
+            self._stage("probe", 0.1, bytes_in=2048, exit_code=0),
+            self._stage("mux", 1.5, bytes_in=4096, bytes_out=3000, exit_code=0)
+        ])
+
+        stages = job_tracker.get_job_stages(job.id)
+        assert [stage.stage for stage in stages] == ["probe", "mux"]
+        assert stages[1].bytes_out == 3000
+        assert stages[1].exit_code == 0
+
+    def test_nested_stages_keep_their_parent(self, job_tracker):
+        """Test that nested stages are persisted with their parent and reported apart from top-level ones"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        job_tracker.record_stages(job.id, [
+            self._stage("translate", 0.5, parent="narration"),
+            self._stage("narration", 2.0, parent=None),
+            self._stage("translate", 0.1, parent=None)
+        ])
+
+        assert [(stage.stage, stage.parent) for stage in job_tracker.get_job_stages(job.id)] == [
+            ("translate", "narration"), ("narration", None), ("translate", None)
+        ]
+        percentiles = job_tracker.stage_percentiles()
+        assert percentiles["narration/translate"]["p50"] == 0.5
+        assert percentiles["translate"] == {"count": 1, "p50": 0.1, "p95": 0.1, "p99": 0.1}
+
+    def test_stages_deleted_with_job(self, job_tracker, db_session):
+        """Test that deleting a job removes its stage records"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        job_tracker.record_stages(job.id, [self._stage("narration", 2.0)])
+
+        job_tracker.delete_job(job.id)
+
+        assert job_tracker.get_job_stages(job.id) == []
+
+    def test_stage_percentiles(self, job_tracker):
+        """Test p50/p95/p99 aggregation per stage"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        job_tracker.record_stages(job.id, [self._stage("mux", float(i)) for i in range(1, 101)])
+        job_tracker.record_stages(job.id, [self._stage("probe", 0.2)])
+
+        percentiles = job_tracker.stage_percentiles()
+        assert percentiles["mux"] == {"count": 100, "p50": 50.0, "p95": 95.0, "p99": 99.0}
+        assert percentiles["probe"]["p99"] == 0.2
+
+
+class TestFailUnfinished:
+    def test_queued_jobs_and_their_batches_are_failed(self, job_tracker, db_session):
+        """Test that cancelled jobs, and the batch a cancelled job heads, are marked FAILED"""
+        single = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        batch = [job_tracker.create_job("/path/to/input.mp4", "Test description", language)
+                 for language in ("en", "te")]
+        done = job_tracker.create_job("/path/to/input.mp4", "Test description", "hi")
+        for job in batch + [done]:
+            job.batch_id = "batch"
+        done.status = "COMPLETED"
+        other = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        db_session.commit()
+
+        assert job_tracker.fail_unfinished([single.id, batch[0].id], "Server shut down") == 3
+
+        db_session.expire_all()
+        assert [job_tracker.get_job(job.id).status for job in (single, *batch, done, other)] == \
+            ["FAILED", "FAILED", "FAILED", "COMPLETED", "PENDING"]
+        assert job_tracker.get_job(single.id).error_message == "Server shut down"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJobProgressWriter:
+    """Test coalesced job progress writes"""
+
+    def _count_updates(self):
+        updates = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE jobs"):
+                updates.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        return updates, lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    def test_rapid_updates_are_coalesced(self, job_tracker, db_session):
+        """Test that progress updates inside the interval share one UPDATE"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        clock = FakeClock()
+        writer = JobProgressWriter(db_session, job.id, min_interval=1.0, clock=clock)
+        updates, stop = self._count_updates()
+        try:
+            assert writer.update("PROCESSING", 10) is True
+            assert writer.update("PROCESSING", 20) is False
+            assert writer.update("PROCESSING", 25) is False
+            clock.now = 1.5
+            assert writer.update("PROCESSING", 30) is True
+        finally:
+            stop()
+
+        assert len(updates) == 2
+        db_session.expire_all()
+        stored = job_tracker.get_job(job.id)
+        assert (stored.status, stored.progress) == ("PROCESSING", 30)
+
+    def test_report_keeps_status_and_is_coalesced(self, job_tracker, db_session):
+        """Test that progress-only reports keep the current status and share one UPDATE"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        clock = FakeClock()
+        writer = JobProgressWriter(db_session, job.id, min_interval=1.0, clock=clock)
+        updates, stop = self._count_updates()
+        try:
+            assert writer.update("GENERATING_AUDIO", 30) is True
+            assert writer.report(43) is False
+            assert writer.report(56) is False
+            clock.now = 1.5
+            assert writer.report(60) is True
+        finally:
+            stop()
+
+        assert len(updates) == 2
+        db_session.expire_all()
+        stored = job_tracker.get_job(job.id)
+        assert (stored.status, stored.progress) == ("GENERATING_AUDIO", 60)
+
+    def test_status_change_always_written(self, job_tracker, db_session):
+        """Test that a new status is written inside the interval, carrying any coalesced progress"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        writer = JobProgressWriter(db_session, job.id, min_interval=60, clock=FakeClock())
+        updates, stop = self._count_updates()
+        try:
+            assert writer.update("PROCESSING", 10) is True
+            assert writer.update("GENERATING_AUDIO", 30) is True
+            assert writer.update("GENERATING_AUDIO", 40) is False
+            assert writer.update("MERGING_VIDEO", 70) is True
+        finally:
+            stop()
+
+        assert len(updates) == 3
+        db_session.expire_all()
+        stored = job_tracker.get_job(job.id)
+        assert (stored.status, stored.progress) == ("MERGING_VIDEO", 70)
+
+    def test_terminal_status_always_written(self, job_tracker, db_session):
+        """Test that completion is written even inside the interval"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        writer = JobProgressWriter(db_session, job.id, min_interval=60, clock=FakeClock())
+
+        writer.update("PROCESSING", 10)
+        writer.update("MERGING_VIDEO", 70)
+        assert writer.update("COMPLETED", 100, output_file_path="/path/to/output.mp4") is True
+
+        db_session.expire_all()
+        stored = job_tracker.get_job(job.id)
+        assert (stored.status, stored.progress, stored.output_file_path) == ("COMPLETED", 100, "/path/to/output.mp4")
+        assert writer.writes == 3
+
+    def test_flush_writes_pending(self, job_tracker, db_session):
+        """Test that flush writes a coalesced update and skips unchanged values"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        writer = JobProgressWriter(db_session, job.id, min_interval=60, clock=FakeClock())
+        writer.update("PROCESSING", 10)
+        writer.update("PROCESSING", 50)
+
+        assert writer.flush() is True
+        assert writer.flush() is False
+        db_session.expire_all()
+        assert job_tracker.get_job(job.id).progress == 50
+
+    def test_every_update_is_published(self, job_tracker, db_session):
+        """Test that coalesced updates still reach stream subscribers"""
+        job = job_tracker.create_job("/path/to/input.mp4", "Test description", "en")
+        writer = JobProgressWriter(db_session, job.id, min_interval=60, clock=FakeClock())
+
+        with patch("app.services.job_service.progress_broker") as broker:
+            writer.update("PROCESSING", 10)
+            writer.update("GENERATING_AUDIO", 30)
+
+        assert [call.args[1:3] for call in broker.publish.call_args_list] == [
+            ("PROCESSING", 10), ("GENERATING_AUDIO", 30)
+        ]
+
+
 class TestGetJobTrackerFunction:
     def test_get_job_tracker_function(self, db_session):
         """Test the get_job_tracker function"""
@@ -0,0 +1,117 @@
+import os
+import time
+import tempfile
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.system import SystemLog
+from app.services.logging_service import LoggingService
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory bound to a throwaway SQLite database"""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[SystemLog.__table__])
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+    os.remove(path)
+
+
+def count_rows(session_factory):
+    db = session_factory()
+    try:
+        return db.query(SystemLog).count()
+    finally:
+        db.close()
+
+
+class TestBufferedLogging:
+    """Test the batched system log sink"""
+
+    def test_log_does_not_touch_caller_session(self, session_factory):
+        """Test that logging never commits the caller's transaction"""
+        service = LoggingService(session_factory, batch_size=10, flush_interval=60)
+        caller_db = Mock()
+
+        service.log(caller_db, "Job #1 initialized", module="JOBS")
+
+        caller_db.assert_not_called()
+        assert not caller_db.method_calls
+        assert count_rows(session_factory) == 0
+        service.shutdown()
+
+    def test_full_batch_is_flushed_in_background(self, session_factory):
+        """Test that reaching batch_size wakes the flusher"""
+        service = LoggingService(session_factory, batch_size=5, flush_interval=60)
+
+        for i in range(5):
+            service.log(None, f"message {i}")
+
+        deadline = time.monotonic() + 5
+        while count_rows(session_factory) < 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert count_rows(session_factory) == 5
+        service.shutdown()
+
+    def test_interval_flush(self, session_factory):
+        """Test that a partial batch is written after flush_interval"""
+        service = LoggingService(session_factory, batch_size=100, flush_interval=0.1)
+        service.log(None, "lonely message", level="WARNING")
+
+        deadline = time.monotonic() + 5
+        while count_rows(session_factory) < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert count_rows(session_factory) == 1
+        service.shutdown()
+
+    def test_get_logs_sees_buffered_rows(self, session_factory):
+        """Test that get_logs flushes before reading"""
+        service = LoggingService(session_factory, batch_size=100, flush_interval=60)
+        service.log(None, "first")
+        service.log(None, "second", level="SUCCESS", module="AUTH")
+
+        db = session_factory()
+        try:
+            logs = service.get_logs(db, limit=10)
+        finally:
+            db.close()
+
+        assert {log.message for log in logs} == {"first", "second"}
+        service.shutdown()
+
+    def test_back_pressure_drops_when_full(self, session_factory):
+        """Test that a full queue blocks briefly off the event loop and then drops the row"""
+        service = LoggingService(session_factory, batch_size=100, flush_interval=60,
+                                 max_queue=2, enqueue_timeout=0.2)
+
+        assert service.log(None, "one") is not None
+        assert service.log(None, "two") is not None
+        started = time.perf_counter()
+        assert service.log(None, "three") is None
+        assert time.perf_counter() - started >= 0.2
+        assert service.pending() == 2
+
+        service.shutdown()
+        assert count_rows(session_factory) == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_never_blocks_the_event_loop(self, session_factory):
+        """Test that log() on an event loop drops straight away instead of waiting"""
+        service = LoggingService(session_factory, batch_size=100, flush_interval=60,
+                                 max_queue=1, enqueue_timeout=5)
+
+        assert service.log(None, "one") is not None
+        started = time.perf_counter()
+        with patch("app.services.logging_service.LOG_ROWS_DROPPED") as dropped:
+            assert service.log(None, "two") is None
+        assert time.perf_counter() - started < 0.1
+        dropped.inc.assert_called_once()
+
+        service.shutdown()
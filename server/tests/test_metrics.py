@@ -0,0 +1,76 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import system
+from app.services.metrics import MetricsRegistry, STAGE_DURATION
+from app.services.pipeline import StageTimer
+
+
+class TestMetricsRegistry:
+    """Test in-process metrics and their text exposition"""
+
+    def test_counter_with_labels(self):
+        """Test that counters accumulate per label set"""
+        registry = MetricsRegistry(prefix="test")
+        attempts = registry.counter("tts_attempts_total", "TTS attempts", ["engine", "outcome"])
+
+        attempts.inc(engine="gtts", outcome="success")
+        attempts.inc(engine="gtts", outcome="success")
+        attempts.inc(engine="openai", outcome="failure")
+
+        output = registry.render()
+        assert "# TYPE test_tts_attempts_total counter" in output
+        assert 'test_tts_attempts_total{engine="gtts",outcome="success"} 2' in output
+        assert 'test_tts_attempts_total{engine="openai",outcome="failure"} 1' in output
+
+    def test_wrong_labels_rejected(self):
+        """Test that label names must match the declaration"""
+        registry = MetricsRegistry(prefix="test")
+        counter = registry.counter("uploads_total", "Uploads", ["outcome"])
+
+        with pytest.raises(ValueError):
+            counter.inc(result="stored")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, sum and count lines"""
+        registry = MetricsRegistry(prefix="test")
+        histogram = registry.histogram("mux_seconds", "Mux time", buckets=(1.0, 5.0))
+
+        for value in (0.5, 1.0, 3.0, 10.0):
+            histogram.observe(value)
+
+        output = registry.render()
+        assert 'test_mux_seconds_bucket{le="1"} 2' in output
+        assert 'test_mux_seconds_bucket{le="5"} 3' in output
+        assert 'test_mux_seconds_bucket{le="+Inf"} 4' in output
+        assert "test_mux_seconds_sum 14.5" in output
+        assert "test_mux_seconds_count 4" in output
+
+    def test_gauge_set_and_registration_is_idempotent(self):
+        """Test gauges and that registering a name twice returns the same metric"""
+        registry = MetricsRegistry(prefix="test")
+        queued = registry.gauge("jobs_queued", "Queued jobs")
+        queued.set(3)
+        queued.dec()
+
+        assert registry.gauge("jobs_queued", "Queued jobs") is queued
+        assert "test_jobs_queued 2" in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics scrape endpoint"""
+
+    def test_stage_timings_exposed(self):
+        """Test that stage durations recorded by StageTimer are scraped"""
+        before = STAGE_DURATION.count(stage="metrics-test")
+        with StageTimer(job_id=1).stage("metrics-test"):
+            pass
+
+        app = FastAPI()
+        app.include_router(system.router, prefix="/api/v1")
+        response = TestClient(app).get("/api/v1/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert STAGE_DURATION.count(stage="metrics-test") == before + 1
+        assert 'estatevision_job_stage_duration_seconds_count{stage="metrics-test"}' in response.text
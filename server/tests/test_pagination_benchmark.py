@@ -0,0 +1,166 @@
+import os
+import time
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.job import Job
+from app.models.system import SystemLog
+from app.services.job_service import JobTracker
+from app.services.logging_service import LoggingService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+ROWS = 100_000
+PAGE = 50
+
+
+@pytest.fixture(scope="module")
+def seeded_engine():
+    """SQLite database seeded with a large jobs and system_logs table"""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__, SystemLog.__table__])
+
+    start = datetime(2026, 1, 1)
+    statuses = ["COMPLETED", "FAILED", "PROCESSING", "PENDING"]
+    with engine.begin() as conn:
+        conn.execute(insert(Job), [
+            {
+                "status": statuses[i % len(statuses)],
+                "input_file_path": f"uploads/{i}.mp4",
+                "description_text": "Sunny three bedroom house",
+                "target_language": "en",
+                "created_at": start + timedelta(seconds=i),
+                "progress": 100
+            } for i in range(ROWS)
+        ])
+        conn.execute(insert(SystemLog), [
+            {"level": "INFO", "module": "JOBS", "message": f"Job #{i} queued", "timestamp": start + timedelta(seconds=i)}
+            for i in range(ROWS)
+        ])
+    yield engine
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def db_session(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    yield session
+    session.close()
+
+
+def capture_statements(engine):
+    """Record (sql, params) of every statement executed on the engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def query_plan(engine, statement, parameters):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class TestCursorHelpers:
+    def test_cursor_round_trip(self):
+        """Test that cursors are opaque and decode to the last id"""
+        cursor = encode_cursor(12345)
+        assert "12345" not in cursor
+        assert decode_cursor(cursor) == 12345
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestKeysetPaginationBenchmark:
+    def test_pages_walk_without_gaps(self, db_session):
+        """Test that consecutive pages are contiguous and newest first"""
+        tracker = JobTracker(db_session)
+        first, cursor = tracker.list_jobs_page(limit=PAGE)
+        second, _ = tracker.list_jobs_page(limit=PAGE, cursor=cursor)
+
+        ids = [job.id for job in first + second]
+        assert ids == list(range(ROWS, ROWS - 2 * PAGE, -1))
+
+    def test_last_page_has_no_cursor(self, db_session):
+        """Test that the final page ends the walk"""
+        jobs, cursor = JobTracker(db_session).list_jobs_page(limit=PAGE, cursor=encode_cursor(PAGE // 2))
+        assert len(jobs) == PAGE // 2 - 1
+        assert cursor is None
+
+    @pytest.mark.parametrize("status", [None, "FAILED"])
+    def test_job_pages_use_index(self, seeded_engine, db_session, status):
+        """Test that deep job pages are index range scans, not table scans"""
+        statements, stop = capture_statements(seeded_engine)
+        try:
+            JobTracker(db_session).list_jobs_page(status=status, limit=PAGE, cursor=encode_cursor(ROWS // 2))
+        finally:
+            stop()
+
+        plan = query_plan(seeded_engine, *statements[-1])
+        print(f"\njobs status={status}: {plan}")
+        assert "SCAN" not in plan
+        assert "USING INTEGER PRIMARY KEY" in plan or "USING INDEX ix_jobs_status_id" in plan
+
+    def test_deep_pages_cost_the_same_as_the_first(self, seeded_engine, db_session):
+        """Compare first and last page fetch times for keyset and OFFSET pagination"""
+        tracker = JobTracker(db_session)
+        deep_cursor = encode_cursor(PAGE + 1)
+
+        keyset_first = best_of(lambda: tracker.list_jobs_page(limit=PAGE))
+        keyset_deep = best_of(lambda: tracker.list_jobs_page(limit=PAGE, cursor=deep_cursor))
+        offset_deep = best_of(lambda: db_session.query(Job).order_by(Job.id.desc()).offset(ROWS - PAGE).limit(PAGE).all())
+
+        print(
+            f"\nkeyset first page: {keyset_first * 1000:.2f}ms"
+            f"\nkeyset last page:  {keyset_deep * 1000:.2f}ms"
+            f"\noffset last page:  {offset_deep * 1000:.2f}ms"
+        )
+
+        assert keyset_deep < keyset_first * 3 + 0.005
+        assert keyset_deep < offset_deep
+
+    def test_log_pages_use_primary_key(self, seeded_engine, db_session):
+        """Test that log pages are fetched by primary key range"""
+        service = LoggingService(sessionmaker(bind=seeded_engine), flush_interval=60)
+        statements, stop = capture_statements(seeded_engine)
+        try:
+            logs, cursor = service.get_logs_page(db_session, limit=PAGE, cursor=encode_cursor(ROWS // 2))
+        finally:
+            stop()
+            service.shutdown()
+
+        assert [log.id for log in logs] == list(range(ROWS // 2 - 1, ROWS // 2 - 1 - PAGE, -1))
+        assert decode_cursor(cursor) == logs[-1].id
+        plan = query_plan(seeded_engine, *statements[-1])
+        assert "SCAN" not in plan
+
+    def test_timestamp_and_created_at_indexed(self, seeded_engine):
+        """Test that the listing indexes exist on a freshly created schema"""
+        with seeded_engine.connect() as conn:
+            job_indexes = {row[1] for row in conn.execute(text("PRAGMA index_list('jobs')"))}
+            log_indexes = {row[1] for row in conn.execute(text("PRAGMA index_list('system_logs')"))}
+
+        assert {"ix_jobs_status_id", "ix_jobs_created_at"} <= job_indexes
+        assert "ix_system_logs_timestamp" in log_indexes
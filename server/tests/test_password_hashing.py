@@ -0,0 +1,94 @@
+import time
+import asyncio
+import bcrypt
+import pytest
+from app.services.auth_service import AuthService
+
+
+LOGINS = 8
+
+
+@pytest.fixture(scope="module")
+def hashed():
+    # Fewer rounds than production to keep the benchmark short
+    return bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds=10)).decode()
+
+
+async def measure(logins):
+    """
+    Run a login burst next to a 5ms heartbeat, like status calls sharing
+    the loop. Returns (elapsed seconds, worst heartbeat delay in ms).
+    """
+    stop = asyncio.Event()
+    worst = 0.0
+
+    async def heartbeat():
+        nonlocal worst
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst = max(worst, (time.perf_counter() - started - 0.005) * 1000)
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    results = await logins()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    assert all(results)
+    return elapsed, worst
+
+
+class TestPasswordPool:
+    """Test that bcrypt runs off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_round_trip(self):
+        """Test the async helpers produce and accept bcrypt hashes"""
+        service = AuthService(password_workers=2)
+        hashed = await service.get_password_hash_async("s3cret")
+
+        assert await service.verify_password_async("s3cret", hashed)
+        assert not await service.verify_password_async("wrong", hashed)
+
+    @pytest.mark.asyncio
+    async def test_pool_is_bounded(self, hashed):
+        """Test that no more than password_workers verifications run at once"""
+        service = AuthService(password_workers=2)
+        running = peak = 0
+
+        def tracked(password, hashed_password):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                return AuthService.verify_password(service, password, hashed_password)
+            finally:
+                running -= 1
+
+        service.verify_password = tracked
+        await asyncio.gather(*(service.verify_password_async("correct horse", hashed) for _ in range(6)))
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_login_burst_keeps_loop_responsive(self, hashed):
+        """Benchmark a login burst verified inline versus on the password pool"""
+        service = AuthService(password_workers=4)
+
+        async def inline():
+            return [service.verify_password("correct horse", hashed) for _ in range(LOGINS)]
+
+        async def pooled():
+            return await asyncio.gather(*(service.verify_password_async("correct horse", hashed) for _ in range(LOGINS)))
+
+        inline_elapsed, inline_lag = await measure(inline)
+        pooled_elapsed, pooled_lag = await measure(pooled)
+        print(
+            f"\ninline: {LOGINS / inline_elapsed:.1f} logins/s, worst loop delay {inline_lag:.1f}ms"
+            f"\npooled: {LOGINS / pooled_elapsed:.1f} logins/s, worst loop delay {pooled_lag:.1f}ms"
+        )
+
+        # Inline verification blocks the loop for the whole burst
+        assert inline_lag > inline_elapsed * 1000 * 0.8
+        assert pooled_lag < inline_lag / 4
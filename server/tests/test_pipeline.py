@@ -0,0 +1,95 @@
+import time
+import asyncio
+import pytest
+from app.services.pipeline import StageTimer, run_concurrently, timed_stage
+
+
+class TestStageTimer:
+    """Test per-stage wall-clock timings"""
+
+    def test_stage_records_duration(self):
+        """Test that a timed block is recorded with start, end and duration"""
+        timer = StageTimer(job_id=1)
+        with timer.stage("mux"):
+            time.sleep(0.05)
+
+        record = timer.stages[0]
+        assert record["stage"] == "mux"
+        assert record["duration"] >= 0.05
+        assert record["end"] == pytest.approx(record["start"] + record["duration"])
+
+    def test_stage_recorded_when_block_fails(self):
+        """Test that failing stages are still timed"""
+        timer = StageTimer(job_id=1)
+        with pytest.raises(ValueError):
+            with timer.stage("tts"):
+                raise ValueError("synthesis failed")
+
+        assert timer.summary()["stages"].keys() == {"tts"}
+
+    @pytest.mark.asyncio
+    async def test_nested_stages_reported_from_worker_threads(self):
+        """Test that timed_stage inside a stage records against the active timer"""
+        timer = StageTimer(job_id=1)
+
+        def synthesize():
+            with timed_stage("translate", bytes_in=10) as record:
+                record["bytes_out"] = 12
+            return b"audio"
+
+        with timer.stage("narration"):
+            await asyncio.to_thread(synthesize)
+
+        nested, outer = timer.stages
+        assert (nested["stage"], nested["parent"], nested["bytes_out"]) == ("translate", "narration", 12)
+        assert outer["parent"] is None
+        assert timer.summary()["sequential"] == round(outer["duration"], 3)
+
+    def test_timed_stage_without_timer_is_noop(self):
+        """Test that services can be called outside of a timed job"""
+        with timed_stage("translate") as record:
+            record["bytes_out"] = 1
+
+
+class TestRunConcurrently:
+    """Test the stage scheduler"""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        """Test that blocking stages run side by side and join"""
+        timer = StageTimer(job_id=1)
+
+        async def stage(name, delay, value):
+            with timer.stage(name):
+                await asyncio.to_thread(time.sleep, delay)
+            return value
+
+        results = await run_concurrently(
+            audio_path=stage("tts", 0.3, "narration.wav"),
+            video_duration=stage("probe", 0.2, 12.5)
+        )
+
+        summary = timer.summary()
+        assert results == {"audio_path": "narration.wav", "video_duration": 12.5}
+        assert summary["sequential"] >= 0.5
+        assert summary["elapsed"] < summary["sequential"]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_other_stages(self):
+        """Test that the first error propagates unwrapped and siblings are cancelled"""
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def failing():
+            raise RuntimeError("ffprobe failed with error: bad input")
+
+        with pytest.raises(RuntimeError, match="bad input"):
+            await run_concurrently(video_duration=failing(), audio_path=slow())
+
+        assert cancelled.is_set()
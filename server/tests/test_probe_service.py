@@ -0,0 +1,203 @@
+import os
+import json
+import asyncio
+import time
+import tempfile
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.probe_service import MediaInfo, ProbeService
+
+
+FFPROBE_OUTPUT = {
+    "format": {"duration": "12.500000", "format_name": "mov,mp4,m4a,3gp,3g2,mj2", "size": "2048"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+         "avg_frame_rate": "30000/1001", "duration": "12.480000"},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2}
+    ]
+}
+
+
+@pytest.fixture
+def media_file():
+    """Create a temporary file to stand in for a media file"""
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
+        temp_file.write(b'\x00' * 2048)
+    yield temp_file.name
+    if os.path.exists(temp_file.name):
+        os.remove(temp_file.name)
+
+
+def completed(data=FFPROBE_OUTPUT, returncode=0, stderr=b''):
+    return Mock(returncode=returncode, stdout=json.dumps(data).encode(), stderr=stderr)
+
+
+class TestMediaInfo:
+    """Test parsing of ffprobe JSON output"""
+
+    def test_from_ffprobe(self):
+        """Test that streams and format fields are parsed"""
+        info = MediaInfo.from_ffprobe("clip.mp4", FFPROBE_OUTPUT)
+
+        assert info.duration == 12.5
+        assert info.size == 2048
+        assert (info.video_codec, info.width, info.height) == ("h264", 1920, 1080)
+        assert info.frame_rate == pytest.approx(29.97, abs=0.01)
+        assert (info.audio_codec, info.sample_rate, info.channels) == ("aac", 48000, 2)
+        assert info.has_video and info.has_audio
+        assert info.raw == FFPROBE_OUTPUT
+
+    def test_duration_falls_back_to_streams(self):
+        """Test that stream durations are used when the container has none"""
+        data = {"format": {}, "streams": [{"codec_type": "audio", "codec_name": "pcm_s16le", "duration": "3.2"}]}
+        info = MediaInfo.from_ffprobe("narration.wav", data)
+
+        assert info.duration == 3.2
+        assert not info.has_video
+
+
+class TestProbeService:
+    """Test the shared, cached ffprobe runner"""
+
+    def test_probe_runs_ffprobe_once_per_file_version(self, media_file):
+        """Test that repeated probes of an unchanged file hit the cache"""
+        service = ProbeService(max_entries=8)
+
+        with patch('app.services.probe_service.subprocess.run', return_value=completed()) as mock_run:
+            first = service.probe(media_file)
+            second = service.probe(media_file)
+
+        assert mock_run.call_count == 1
+        assert first is second
+        assert service.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_modified_file_is_probed_again(self, media_file):
+        """Test that a rewritten file invalidates its cached metadata"""
+        service = ProbeService(max_entries=8)
+
+        with patch('app.services.probe_service.subprocess.run', return_value=completed()) as mock_run:
+            service.probe(media_file)
+            with open(media_file, 'ab') as f:
+                f.write(b'\x00' * 16)
+            service.probe(media_file)
+
+        assert mock_run.call_count == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache stays within max_entries"""
+        service = ProbeService(max_entries=2)
+        paths = []
+        try:
+            for _ in range(3):
+                with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
+                    temp_file.write(b'\x00')
+                paths.append(temp_file.name)
+
+            with patch('app.services.probe_service.subprocess.run', return_value=completed()) as mock_run:
+                for path in paths:
+                    service.probe(path)
+                service.probe(paths[0])
+
+            assert mock_run.call_count == 4
+            assert service.stats()["entries"] == 2
+        finally:
+            for path in paths:
+                os.remove(path)
+
+    def test_probe_error_is_not_cached(self, media_file):
+        """Test that ffprobe failures raise and are retried on the next call"""
+        service = ProbeService(max_entries=8)
+
+        with patch('app.services.probe_service.subprocess.run',
+                   return_value=completed(returncode=1, stderr=b'invalid data')) as mock_run:
+            with pytest.raises(RuntimeError, match="ffprobe failed with error: invalid data"):
+                service.probe(media_file)
+            with pytest.raises(RuntimeError):
+                service.probe(media_file)
+
+        assert mock_run.call_count == 2
+
+    def test_concurrent_misses_run_ffprobe_once(self, media_file):
+        """Test that threads missing on the same file wait for a single ffprobe run"""
+        service = ProbeService(max_entries=8)
+        release = threading.Event()
+
+        def slow_ffprobe(*args, **kwargs):
+            release.wait(timeout=5)
+            return completed()
+
+        with patch('app.services.probe_service.subprocess.run', side_effect=slow_ffprobe) as mock_run:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [pool.submit(service.probe, media_file) for _ in range(4)]
+                while service.stats()["hits"] + service.stats()["misses"] < 4:
+                    time.sleep(0.01)
+                release.set()
+                results = [future.result() for future in futures]
+
+        assert mock_run.call_count == 1
+        assert all(result is results[0] for result in results)
+        assert service.stats() == {"entries": 1, "hits": 3, "misses": 1}
+
+    def test_concurrent_waiters_share_a_probe_error(self, media_file):
+        """Test that a failed probe is raised to every waiter and not cached"""
+        service = ProbeService(max_entries=8)
+        release = threading.Event()
+
+        def failing_ffprobe(*args, **kwargs):
+            release.wait(timeout=5)
+            return completed(returncode=1, stderr=b'invalid data')
+
+        with patch('app.services.probe_service.subprocess.run', side_effect=failing_ffprobe) as mock_run:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(service.probe, media_file) for _ in range(2)]
+                while service.stats()["hits"] + service.stats()["misses"] < 2:
+                    time.sleep(0.01)
+                release.set()
+                for future in futures:
+                    with pytest.raises(RuntimeError, match="invalid data"):
+                        future.result()
+
+        assert mock_run.call_count == 1
+        assert service.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_misses_run_ffprobe_once(self, media_file):
+        """Test that coroutines missing on the same file share one ffprobe process"""
+        service = ProbeService(max_entries=8)
+        release = asyncio.Event()
+
+        async def communicate():
+            await release.wait()
+            return json.dumps(FFPROBE_OUTPUT).encode(), b''
+
+        mock_process = AsyncMock()
+        mock_process.returncode = 0
+        mock_process.communicate = communicate
+
+        with patch('app.services.probe_service.asyncio.create_subprocess_exec', return_value=mock_process) as mock_create:
+            tasks = [asyncio.create_task(service.probe_async(media_file)) for _ in range(3)]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+        mock_create.assert_called_once()
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_async_and_sync_callers_share_results(self, media_file):
+        """Test that probe_async fills the cache used by probe"""
+        service = ProbeService(max_entries=8)
+        mock_process = AsyncMock()
+        mock_process.returncode = 0
+        mock_process.communicate = AsyncMock(return_value=(json.dumps(FFPROBE_OUTPUT).encode(), b''))
+
+        with patch('app.services.probe_service.asyncio.create_subprocess_exec', return_value=mock_process) as mock_create:
+            info = await service.probe_async(media_file)
+
+        with patch('app.services.probe_service.subprocess.run') as mock_run:
+            assert service.probe(media_file) is info
+
+        mock_create.assert_called_once()
+        mock_run.assert_not_called()
@@ -0,0 +1,129 @@
+import json
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import jobs
+from app.services.progress_broker import ProgressBroker
+
+
+def parse_events(body: str):
+    return [
+        json.loads(block.split("data: ", 1)[1])
+        for block in body.split("\n\n") if block.startswith("event: progress")
+    ]
+
+
+class TestProgressBroker:
+    """Test the in-process job progress broker"""
+
+    @pytest.mark.asyncio
+    async def test_publish_from_worker_thread(self):
+        """Test that events published on another thread reach the subscriber's loop"""
+        broker = ProgressBroker()
+        queue = broker.subscribe(7)
+
+        worker = threading.Thread(target=broker.publish, args=(7, "PROCESSING", 10))
+        worker.start()
+        worker.join()
+
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        assert event == {"id": 7, "status": "PROCESSING", "progress": 10, "error_message": None}
+        broker.unsubscribe(7, queue)
+
+    @pytest.mark.asyncio
+    async def test_other_jobs_not_delivered(self):
+        """Test that subscribers only see their own job"""
+        broker = ProgressBroker()
+        queue = broker.subscribe(1)
+
+        broker.publish(2, "PROCESSING", 10)
+        await asyncio.sleep(0)
+
+        assert queue.empty()
+        broker.unsubscribe(1, queue)
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_keeps_latest(self):
+        """Test that a full queue drops the oldest event"""
+        broker = ProgressBroker(queue_size=2)
+        queue = broker.subscribe(1)
+
+        for progress in (10, 30, 70):
+            broker.publish(1, "PROCESSING", progress)
+        await asyncio.sleep(0)
+
+        assert [queue.get_nowait()["progress"] for _ in range(queue.qsize())] == [30, 70]
+        broker.unsubscribe(1, queue)
+
+    @pytest.mark.asyncio
+    async def test_listen_stops_on_terminal_status(self):
+        """Test keep-alive ticks and that the stream ends on completion"""
+        broker = ProgressBroker()
+        queue = broker.subscribe(1)
+
+        async def publish_later():
+            await asyncio.sleep(0.05)
+            broker.publish(1, "MERGING_VIDEO", 70)
+            broker.publish(1, "COMPLETED", 100)
+
+        task = asyncio.create_task(publish_later())
+        received = [event async for event in broker.listen(queue, keepalive=0.01)]
+        await task
+
+        assert received[0] is None
+        assert [event["status"] for event in received if event] == ["MERGING_VIDEO", "COMPLETED"]
+        broker.unsubscribe(1, queue)
+        assert broker.subscriber_count() == 0
+
+
+class TestProgressStreamEndpoint:
+    """Test the server-sent events endpoint"""
+
+    def make_client(self):
+        app = FastAPI()
+        app.include_router(jobs.router, prefix="/api/v1")
+        return TestClient(app)
+
+    def test_unknown_job(self):
+        """Test that streaming a missing job returns 404"""
+        with patch.object(jobs, "_current_progress", return_value=None):
+            response = self.make_client().get("/api/v1/status/99/stream")
+
+        assert response.status_code == 404
+        assert jobs.progress_broker.subscriber_count(99) == 0
+
+    def test_finished_job_sends_snapshot_and_closes(self):
+        """Test that a finished job gets one event and the stream ends"""
+        snapshot = {"id": 5, "status": "COMPLETED", "progress": 100, "error_message": None, "output_file_path": "out.mp4"}
+        with patch.object(jobs, "_current_progress", return_value=snapshot):
+            response = self.make_client().get("/api/v1/status/5/stream")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert parse_events(response.text) == [snapshot]
+
+    def test_transitions_are_pushed(self):
+        """Test that published transitions are streamed until completion"""
+        snapshot = {"id": 6, "status": "PROCESSING", "progress": 10, "error_message": None, "output_file_path": None}
+
+        def worker():
+            deadline = time.monotonic() + 5
+            while jobs.progress_broker.subscriber_count(6) == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            jobs.progress_broker.publish(6, "MERGING_VIDEO", 70)
+            jobs.progress_broker.publish(6, "COMPLETED", 100, output_file_path="out.mp4")
+
+        thread = threading.Thread(target=worker)
+        with patch.object(jobs, "_current_progress", return_value=snapshot):
+            thread.start()
+            response = self.make_client().get("/api/v1/status/6/stream")
+        thread.join()
+
+        events = parse_events(response.text)
+        assert [(event["status"], event["progress"]) for event in events] == [
+            ("PROCESSING", 10), ("MERGING_VIDEO", 70), ("COMPLETED", 100)
+        ]
+        assert jobs.progress_broker.subscriber_count(6) == 0
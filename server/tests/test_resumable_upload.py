@@ -0,0 +1,219 @@
+import os
+import hashlib
+import tempfile
+import threading
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_db
+from app.models.job import Job
+from app.models.upload import StoredFile, UploadSession
+from app.models.user import User
+from app.api.v1 import video_generation
+from app.api.v1.endpoints import uploads
+from app.api.v1.endpoints.auth import get_current_user
+from app.services.storage_service import content_store
+from app.services import upload_service as upload_service_module
+from app.services.upload_service import UploadService, parse_content_range, upload_service
+
+
+VIDEO = os.urandom(250_000)
+CHUNK = 100_000
+
+
+@pytest.fixture
+def session_factory():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__, UploadSession.__table__, StoredFile.__table__])
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def upload_folder():
+    with tempfile.TemporaryDirectory() as folder:
+        with patch.object(upload_service, "upload_folder", folder), \
+                patch.object(content_store, "root", os.path.join(folder, "objects")):
+            yield folder
+
+
+@pytest.fixture
+def client(session_factory, upload_folder):
+    app = FastAPI()
+    app.include_router(uploads.router, prefix="/api/v1")
+    app.include_router(video_generation.router, prefix="/api/v1")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="agent", credits=1000)
+    return TestClient(app)
+
+
+def put_chunk(client, upload_id, start, end):
+    return client.put(
+        f"/api/v1/uploads/{upload_id}",
+        content=VIDEO[start:end],
+        headers={"Content-Range": f"bytes {start}-{end - 1}/{len(VIDEO)}"}
+    )
+
+
+def upload_all(client):
+    upload_id = client.post("/api/v1/uploads", json={"filename": "walkthrough.mp4", "size": len(VIDEO)}).json()["upload_id"]
+    for start in range(0, len(VIDEO), CHUNK):
+        assert put_chunk(client, upload_id, start, min(start + CHUNK, len(VIDEO))).status_code == 200
+    assert client.post(f"/api/v1/uploads/{upload_id}/complete").status_code == 200
+    return upload_id
+
+
+class TestResumableUpload:
+    """Test the chunked, resumable upload protocol"""
+
+    def test_content_range_parsing(self):
+        """Test that Content-Range headers are validated"""
+        assert parse_content_range("bytes 0-99/250") == (0, 99, 250)
+        for header in ("bytes 10-5/250", "bytes 0-250/250", "0-99/250", ""):
+            with pytest.raises(ValueError):
+                parse_content_range(header)
+
+    def test_resume_after_dropped_chunk(self, client, upload_folder):
+        """Test that a client can ask for the offset and resume from it"""
+        created = client.post("/api/v1/uploads", json={"filename": "walkthrough.mp4", "size": len(VIDEO)})
+        assert created.status_code == 201
+        upload_id = created.json()["upload_id"]
+
+        assert put_chunk(client, upload_id, 0, CHUNK).json()["offset"] == CHUNK
+
+        # The client lost track and resends from too far ahead
+        conflict = put_chunk(client, upload_id, 2 * CHUNK, len(VIDEO))
+        assert conflict.status_code == 409
+        assert conflict.json()["detail"]["offset"] == CHUNK
+
+        offset = client.get(f"/api/v1/uploads/{upload_id}").json()["offset"]
+        assert put_chunk(client, upload_id, offset, len(VIDEO)).json()["offset"] == len(VIDEO)
+
+        completed = client.post(f"/api/v1/uploads/{upload_id}/complete").json()
+        assert completed["status"] == "COMPLETE"
+        assert completed["sha256"] == hashlib.sha256(VIDEO).hexdigest()
+
+        stored = os.path.join(upload_folder, f"{upload_id}_walkthrough.mp4")
+        with open(stored, "rb") as f:
+            assert f.read() == VIDEO
+
+    def test_incomplete_upload_cannot_finish(self, client):
+        """Test that completing before every byte has arrived is rejected"""
+        upload_id = client.post("/api/v1/uploads", json={"filename": "walkthrough.mp4", "size": len(VIDEO)}).json()["upload_id"]
+        put_chunk(client, upload_id, 0, CHUNK)
+
+        assert client.post(f"/api/v1/uploads/{upload_id}/complete").status_code == 409
+
+    def test_rejects_unsupported_format_and_size(self, client):
+        """Test that sessions are validated up front"""
+        assert client.post("/api/v1/uploads", json={"filename": "notes.txt", "size": 10}).status_code == 400
+        too_big = 10 ** 12
+        assert client.post("/api/v1/uploads", json={"filename": "a.mp4", "size": too_big}).status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_written_off_the_event_loop(self, session_factory, upload_folder):
+        """Test that a chunk's file I/O runs on worker threads, not the loop's"""
+        service = UploadService(upload_folder=upload_folder)
+        db = session_factory()
+        upload = service.create_session(db, 1, "walkthrough.mp4", len(VIDEO))
+        loop_thread = threading.get_ident()
+        io_threads = set()
+        open_at = upload_service_module._open_at
+
+        class RecordingFile:
+            def __init__(self, f):
+                self.f = f
+
+            def write(self, chunk):
+                io_threads.add(threading.get_ident())
+                return self.f.write(chunk)
+
+            def close(self):
+                io_threads.add(threading.get_ident())
+                self.f.close()
+
+        async def body():
+            yield VIDEO[:CHUNK]
+
+        with patch.object(upload_service_module, "_open_at", lambda *args: RecordingFile(open_at(*args))):
+            await service.append_chunk(db, upload, 0, len(VIDEO), body())
+
+        assert io_threads and loop_thread not in io_threads
+        assert upload.received_bytes == CHUNK
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_chunk_keeps_received_bytes(self, session_factory, upload_folder):
+        """Test that bytes written before a connection drops count towards the offset"""
+        service = UploadService(upload_folder=upload_folder)
+        db = session_factory()
+        upload = service.create_session(db, 1, "walkthrough.mp4", len(VIDEO))
+
+        async def dropped_connection():
+            yield VIDEO[:30_000]
+            yield VIDEO[30_000:60_000]
+            raise ConnectionResetError("client went away")
+
+        with pytest.raises(ConnectionResetError):
+            await service.append_chunk(db, upload, 0, len(VIDEO), dropped_connection())
+
+        assert service.get_session(db, upload.id, 1).received_bytes == 60_000
+        assert os.path.getsize(upload.file_path) == 60_000
+        db.close()
+
+    def test_generate_from_upload(self, client, session_factory):
+        """Test that a completed upload becomes a job's input exactly once"""
+        upload_id = upload_all(client)
+        form = {"upload_id": upload_id, "description_text": "Sunny loft", "target_language": "en"}
+
+        with patch.object(video_generation.job_executor, "submit") as submit:
+            response = client.post("/api/v1/generate-from-upload", data=form)
+            again = client.post("/api/v1/generate-from-upload", data=form)
+
+        assert response.status_code == 200
+        assert again.status_code == 409
+        submit.assert_called_once()
+
+        db = session_factory()
+        job = db.get(Job, response.json()["id"])
+        assert job.input_sha256 == hashlib.sha256(VIDEO).hexdigest()
+        assert job.input_file_path == content_store.get(db, job.input_sha256).file_path
+        db.close()
+
+    def test_failed_store_keeps_upload(self, client, session_factory):
+        """Test that an upload isn't consumed unless its file made it into the store"""
+        upload_id = upload_all(client)
+        form = {"upload_id": upload_id, "description_text": "Sunny loft", "target_language": "en"}
+
+        with patch.object(video_generation.job_executor, "submit") as submit:
+            with patch.object(content_store, "add", side_effect=OSError("disk full")):
+                failed = client.post("/api/v1/generate-from-upload", data=form)
+            retried = client.post("/api/v1/generate-from-upload", data=form)
+
+        assert failed.status_code == 500
+        assert retried.status_code == 200
+        submit.assert_called_once()
+        db = session_factory()
+        assert db.get(UploadSession, upload_id).status == "CONSUMED"
+        db.close()
+
+    def test_uploads_are_private(self, client):
+        """Test that another user's upload id is not found"""
+        upload_id = client.post("/api/v1/uploads", json={"filename": "walkthrough.mp4", "size": len(VIDEO)}).json()["upload_id"]
+        client.app.dependency_overrides[get_current_user] = lambda: User(id=2, username="other", credits=1000)
+
+        assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 404
@@ -0,0 +1,204 @@
+import os
+import shutil
+import tempfile
+import subprocess
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import app.database as database
+from app.database import Base, get_db
+from app.models.job import Job, JobStage, Setting
+from app.models.upload import StoredFile
+from app.models.user import User
+from app.api.v1 import video_generation
+from app.api.v1.endpoints.auth import get_current_user
+from app.services.logging_service import logging_service
+from app.services.probe_service import MediaInfo
+from app.services.video_service import (
+    VideoTranscode, build_narration_mux_command, build_stream_copy_command, build_transcode_command,
+    parse_resolution, plan_transcode
+)
+
+
+def media(width, height):
+    return MediaInfo(path="video.mp4", duration=12.0, video_codec="h264", width=width, height=height)
+
+
+@pytest.fixture
+def session_factory():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[
+        User.__table__, Job.__table__, JobStage.__table__, StoredFile.__table__, Setting.__table__
+    ])
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def transcode_enabled():
+    with patch.object(video_generation.settings, "enable_video_transcode", True):
+        yield
+
+
+@pytest.fixture
+def folder():
+    with tempfile.TemporaryDirectory() as folder:
+        with patch.object(video_generation.settings, "upload_folder", folder):
+            yield folder
+
+
+class TestTranscodePlan:
+    """Test when the output is scaled and when the video is copied"""
+
+    def test_parse_resolution(self):
+        assert parse_resolution("720p") == 720
+        assert parse_resolution(" 1080P ") == 1080
+        assert parse_resolution("4k") == 2160
+        assert parse_resolution("original") is None
+        for value in ("720", "hd720", "99999p", ""):
+            with pytest.raises(ValueError):
+                parse_resolution(value)
+
+    def test_larger_source_is_scaled(self, transcode_enabled):
+        """Test that a 4K recording is scaled down on its shorter side, portrait or landscape"""
+        with patch.object(video_generation.settings, "video_transcode_crf", 26):
+            landscape = plan_transcode(media(3840, 2160), "720p")
+            portrait = plan_transcode(media(2160, 3840), "1080p")
+
+        assert landscape == VideoTranscode(height=720, preset="veryfast", crf=26, threads=0)
+        assert portrait.height == 1080
+
+    def test_matching_source_is_copied(self, transcode_enabled):
+        """Test that sources at or below the target, or unknown sizes, skip the transcode"""
+        assert plan_transcode(media(1280, 720), "720p") is None
+        assert plan_transcode(media(1080, 1920), "1080p") is None
+        assert plan_transcode(media(640, 360), "720p") is None
+        assert plan_transcode(media(None, None), "720p") is None
+        assert plan_transcode(media(3840, 2160), "original") is None
+
+    def test_transcode_is_opt_in(self):
+        """Test that sources are copied at their own resolution unless transcoding is enabled"""
+        assert plan_transcode(media(3840, 2160), "720p") is None
+
+    def test_transcode_encodes_video_only(self):
+        """Test that the transcode writes a video-only intermediate the mux can stream-copy"""
+        transcode = VideoTranscode(height=720, preset="faster", crf=24, threads=4)
+        cmd = build_transcode_command("video.mp4", "scaled.mp4", transcode)
+
+        assert cmd[-1] == "scaled.mp4" and "-an" in cmd
+        assert cmd[cmd.index("-vf") + 1] == transcode.scale_filter()
+        assert cmd[cmd.index("-c:v") + 1] == "libx264"
+        assert cmd[cmd.index("-preset") + 1] == "faster"
+        assert cmd[cmd.index("-crf") + 1] == "24"
+        assert cmd[cmd.index("-threads") + 1] == "4"
+
+        mux = build_narration_mux_command("scaled.mp4", "narration.wav", "out.mp4", 12.0)
+        assert mux[mux.index("-c:v") + 1] == "copy" and "libx264" not in mux
+
+    def test_copy_keeps_original_audio(self):
+        """Test that copying a scaled intermediate takes the audio from the original"""
+        cmd = build_stream_copy_command("scaled.mp4", "out.mp4", audio_source="video.mp4")
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-i"] == ["scaled.mp4", "video.mp4"]
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"] == ["0:v:0", "1:a?"]
+
+
+class TestTranscodeInWorker:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size, stages", [((3840, 2160), ["probe", "transcode", "mux"]),
+                                              ((1280, 720), ["probe", "mux"])])
+    async def test_requested_resolution_reaches_ffmpeg(self, session_factory, folder, transcode_enabled,
+                                                       size, stages):
+        """Test that the job's resolution decides whether the video is scaled before the mux"""
+        db = session_factory()
+        db.add(User(id=1, username="agent", email="agent@example.com", hashed_password="x", credits=1000))
+        video_path = os.path.join(folder, "loft.mp4")
+        with open(video_path, "wb") as f:
+            f.write(b"video")
+        job = Job(status="PENDING", input_file_path=video_path, description_text="Sunny loft", target_language="en")
+        db.add(job)
+        db.commit()
+        job_id = job.id
+        db.close()
+
+        async def fake_probe(path):
+            return media(*size)
+
+        def fake_ffmpeg(cmd, **kwargs):
+            ffmpeg_runs.append(cmd)
+            with open(cmd[-1], "wb") as f:
+                f.write(b"mp4")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        ffmpeg_runs = []
+        with patch.object(database, "get_db", lambda: iter([session_factory()])), \
+                patch.object(video_generation.probe_service, "probe_async", fake_probe), \
+                patch.object(video_generation.subprocess, "run", fake_ffmpeg), \
+                patch.object(logging_service, "log"):
+            await video_generation.process_video_with_narration(
+                job_id, video_path, "Sunny loft", "en", 1, False, "720p"
+            )
+
+        db = session_factory()
+        job = db.get(Job, job_id)
+        assert job.status == "COMPLETED"
+        assert [s.stage for s in job.stages] == stages
+        assert len(ffmpeg_runs) == len(stages) - 1
+        assert ("libx264" in ffmpeg_runs[0]) == ("transcode" in stages)
+        # The output is always a stream copy; the scaled intermediate is cleaned up
+        assert "libx264" not in ffmpeg_runs[-1]
+        assert [name for name in os.listdir(folder) if name.startswith("scaled_")] == []
+        db.close()
+
+    def test_unsupported_resolution_is_rejected(self, session_factory, folder):
+        """Test that /generate refuses a resolution it can't produce before storing the upload"""
+        app = FastAPI()
+        app.include_router(video_generation.router, prefix="/api/v1")
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: User(id=1, username="agent", credits=1000)
+        with patch.object(video_generation.job_executor, "submit") as submit:
+            response = TestClient(app).post(
+                "/api/v1/generate",
+                data={"description_text": "Sunny loft", "target_language": "en", "resolution": "8kk"},
+                files={"video_file": ("loft.mp4", b"video", "video/mp4")}
+            )
+
+        assert response.status_code == 400
+        submit.assert_not_called()
+        assert os.listdir(folder) == []
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="FFmpeg and ffprobe are required to transcode a real file")
+class TestTranscodeWithFfmpeg:
+    def test_output_is_scaled(self, folder):
+        """Test that the transcoded output has the requested shorter side"""
+        video_path = os.path.join(folder, "video.mp4")
+        subprocess.run([
+            'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=duration=2:size=640x360:rate=25',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p', video_path
+        ], capture_output=True, check=True)
+        output_path = os.path.join(folder, "scaled.mp4")
+
+        result = subprocess.run(build_transcode_command(video_path, output_path, VideoTranscode(height=240)),
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+        probe = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-select_streams', 'v:0', '-show_entries', 'stream=width,height',
+            '-of', 'csv=p=0', output_path
+        ], capture_output=True, text=True)
+        assert probe.stdout.strip() == "426,240"
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models.translation import TranslationMemo
+from app.services.translation_cache import TranslationCache, split_sentences, translate_sentences
+
+
+@pytest.fixture
+def cache():
+    """Create a TranslationCache backed by an in-memory database"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield TranslationCache(session_factory=sessionmaker(bind=engine))
+    Base.metadata.drop_all(bind=engine)
+
+
+class FakeTranslator:
+    """Upper-cases text and answers numbered blocks line by line"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, text):
+        self.requests.append(text)
+        return text.upper()
+
+
+class TestSplitSentences:
+    def test_split_keeps_separators(self):
+        """Test sentence splitting on punctuation, preserving whitespace"""
+        pairs = split_sentences("Spacious 3BHK. Modular kitchen!\n\nClose to metro?")
+        assert pairs == [
+            ("Spacious 3BHK.", " "),
+            ("Modular kitchen!", "\n\n"),
+            ("Close to metro?", "")
+        ]
+
+
+class TestTranslationCache:
+    def test_only_misses_are_sent(self, cache):
+        """Test that memoized sentences are not sent to the backend again"""
+        translator = FakeTranslator()
+        first = cache.translate("Spacious 3BHK. Modular kitchen.", "te", translator)
+        assert first == "SPACIOUS 3BHK. MODULAR KITCHEN."
+        assert len(translator.requests) == 1
+
+        translator.requests.clear()
+        second = cache.translate("Modular kitchen. Sea view.", "te", translator)
+        assert second == "MODULAR KITCHEN. SEA VIEW."
+        assert translator.requests == ["Sea view."]
+        assert cache.stats() == {"hits": 1, "misses": 3}
+
+    def test_languages_are_separate(self, cache):
+        """Test that a memo for one language is not reused for another"""
+        translator = FakeTranslator()
+        cache.translate("Sea view.", "te", translator)
+        cache.translate("Sea view.", "hi", translator)
+        assert len(translator.requests) == 2
+
+    def test_failures_are_not_memoized(self, cache):
+        """Test that a failing backend leaves nothing in the memo"""
+        def failing(text):
+            raise Exception("Gemini API Error: 500")
+
+        with pytest.raises(Exception):
+            cache.translate("Sea view.", "te", failing)
+
+        session = cache.session_factory()
+        assert session.query(TranslationMemo).count() == 0
+        session.close()
+
+    def test_put_many_writes_once_and_skips_stored_rows(self, cache):
+        """Test that a batch of memos is one INSERT and one commit, even when some already exist"""
+        cache.put_many({"Sea view.": "SEA VIEW."}, "te")
+        engine = cache.session_factory.kw["bind"]
+        statements, commits = [], []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+        event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+        cache.put_many({"Sea view.": "OTHER.", "Sea  view.": "OTHER.", "Metro nearby.": "METRO NEARBY."}, "te")
+
+        assert len([statement for statement in statements if statement.startswith("INSERT")]) == 1
+        assert len(commits) == 1
+        assert cache.get_many(["Sea view.", "Metro nearby."], "te") == {
+            "Sea view.": "SEA VIEW.", "Metro nearby.": "METRO NEARBY."
+        }
+
+
+class TestTranslateSentences:
+    def test_falls_back_when_numbering_is_lost(self):
+        """Test per-sentence fallback when the batched reply cannot be matched"""
+        calls = []
+
+        def translator(text):
+            calls.append(text)
+            return "unnumbered reply" if "[1]" in text else text.upper()
+
+        result = translate_sentences(["One.", "Two."], translator)
+        assert result == {"One.": "ONE.", "Two.": "TWO."}
+        assert len(calls) == 3
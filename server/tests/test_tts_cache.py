@@ -0,0 +1,98 @@
+import pytest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from app.services.tts_cache import TTSCache
+from app.services.simple_tts import SimpleTTSService
+
+
+@pytest.fixture
+def cache_dir():
+    """Create a temporary cache directory"""
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestTTSCacheKeys:
+    def test_key_depends_on_every_field(self):
+        """Test that text, language, voice and engine all change the key"""
+        base = TTSCache.make_key("Spacious 3BHK", "te", "nova", "gtts")
+        assert base == TTSCache.make_key("Spacious 3BHK", "te", "nova", "gtts")
+        assert base != TTSCache.make_key("Spacious 2BHK", "te", "nova", "gtts")
+        assert base != TTSCache.make_key("Spacious 3BHK", "hi", "nova", "gtts")
+        assert base != TTSCache.make_key("Spacious 3BHK", "te", "onyx", "gtts")
+        assert base != TTSCache.make_key("Spacious 3BHK", "te", "nova", "openai")
+
+
+class TestTTSCacheStorage:
+    def test_miss_then_hit(self, cache_dir):
+        """Test hit/miss counters around a store"""
+        cache = TTSCache(cache_dir=cache_dir, max_bytes=1024)
+        assert cache.lookup("hello", "en", "nova", ["gtts"]) is None
+
+        cache.store("hello", "en", "nova", "gtts", b"RIFFdata")
+        assert cache.lookup("hello", "en", "nova", ["openai", "gtts"]) == b"RIFFdata"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_evicts_least_recently_used(self, cache_dir):
+        """Test that the size bound evicts the least recently used entry"""
+        cache = TTSCache(cache_dir=cache_dir, max_bytes=250)
+        cache.store("a", "en", "nova", "gtts", b"a" * 100)
+        cache.store("b", "en", "nova", "gtts", b"b" * 100)
+        cache.lookup("a", "en", "nova", ["gtts"])  # "b" is now least recently used
+        cache.store("c", "en", "nova", "gtts", b"c" * 100)
+
+        assert cache.lookup("b", "en", "nova", ["gtts"]) is None
+        assert cache.lookup("a", "en", "nova", ["gtts"]) == b"a" * 100
+        assert cache.lookup("c", "en", "nova", ["gtts"]) == b"c" * 100
+        assert cache.stats()["evictions"] == 1
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_survives_restart(self, cache_dir):
+        """Test that entries written by one instance are found by the next"""
+        TTSCache(cache_dir=cache_dir, max_bytes=1024).store("hello", "en", "nova", "gtts", b"audio")
+        reloaded = TTSCache(cache_dir=cache_dir, max_bytes=1024)
+        assert reloaded.lookup("hello", "en", "nova", ["gtts"]) == b"audio"
+
+
+class TestSimpleTTSServiceCaching:
+    def test_repeat_narration_skips_translation_and_synthesis(self, cache_dir):
+        """Test that a repeated narration is served from the cache"""
+        cache = TTSCache(cache_dir=cache_dir, max_bytes=1024 * 1024)
+        service = SimpleTTSService()
+
+        with patch('app.services.simple_tts.tts_cache', cache), \
+             patch.object(service, 'translate_text', return_value="translated") as mock_translate, \
+             patch.object(service, '_generate_gtts', return_value=b"RIFFaudio") as mock_gtts:
+            first = service.synthesize_speech("Lovely villa", "te", "nova")
+            second = service.synthesize_speech("Lovely villa", "te", "nova")
+
+        assert first == second == b"RIFFaudio"
+        assert mock_translate.call_count == 1
+        assert mock_gtts.call_count == 1
+
+    def test_failed_translation_is_not_cached(self, cache_dir):
+        """Test that speech synthesized from untranslated text isn't served for the target language"""
+        cache = TTSCache(cache_dir=cache_dir, max_bytes=1024 * 1024)
+        service = SimpleTTSService()
+        text = "Spacious flat. Great view."
+
+        def synthesize(spoken_text, language):
+            return spoken_text.encode("utf-8")
+
+        with patch('app.services.simple_tts.tts_cache', cache), \
+             patch.object(service, 'translate_text', side_effect=[text, "విశాలమైన ఫ్లాట్."]), \
+             patch.object(service, '_generate_gtts', side_effect=synthesize):
+            fallback = service.synthesize_speech(text, "te", "nova")
+            translated = service.synthesize_speech(text, "te", "nova")
+
+        assert fallback == text.encode("utf-8")
+        assert translated == "విశాలమైన ఫ్లాట్.".encode("utf-8")
+        assert cache.stats()["hits"] == 0
+        assert cache.lookup(text, "te", "nova", ["gtts"]) == translated
@@ -0,0 +1,117 @@
+import pytest
+import threading
+import time
+from unittest.mock import patch
+from unittest.mock import Mock
+from app.services.audio_utils import pcm_to_wav, concat_wav, read_wav, decode_to_wav
+from app.services.simple_tts import SimpleTTSService, chunk_text
+
+
+def tone_wav(value: int, frames: int, sample_rate: int = 44100) -> bytes:
+    """Build a mono 16-bit WAV whose samples all equal value"""
+    return pcm_to_wav(value.to_bytes(2, "little", signed=True) * frames, sample_rate=sample_rate)
+
+
+class TestChunkText:
+    def test_chunks_respect_sentence_boundaries(self):
+        """Test that chunks are sentence-aligned and within the limit"""
+        text = "Spacious 3BHK apartment. Modular kitchen with chimney. Close to the metro station."
+        chunks = chunk_text(text, 60)
+        assert chunks == [
+            "Spacious 3BHK apartment. Modular kitchen with chimney.",
+            "Close to the metro station."
+        ]
+
+    def test_long_sentence_split_at_words(self):
+        """Test that an over-long sentence is broken at word boundaries"""
+        chunks = chunk_text("word " * 50, 40)
+        assert all(len(chunk) <= 40 for chunk in chunks)
+        assert " ".join(chunks).split() == ["word"] * 50
+
+    def test_full_text_is_kept(self):
+        """Test that nothing is truncated for long descriptions"""
+        text = " ".join(f"Sentence number {i} about the property." for i in range(200))
+        chunks = chunk_text(text, 600)
+        assert " ".join(chunks) == text
+
+
+class TestConcatWav:
+    def test_concatenates_pcm_in_order(self):
+        """Test that PCM frames are joined in order without gaps"""
+        joined = concat_wav([tone_wav(1, 100), tone_wav(2, 50), tone_wav(3, 25)])
+        params, frames = read_wav(joined)
+        assert params == (1, 2, 44100)
+        assert len(frames) == 175 * 2
+        assert frames[:2] == (1).to_bytes(2, "little")
+        assert frames[200:202] == (2).to_bytes(2, "little")
+        assert frames[-2:] == (3).to_bytes(2, "little")
+
+    def test_rejects_mismatched_formats(self):
+        """Test that chunks with different sample rates are not joined"""
+        with pytest.raises(ValueError):
+            concat_wav([tone_wav(1, 10, 44100), tone_wav(1, 10, 24000)])
+
+
+class TestDecodeToWav:
+    def test_pipes_audio_through_ffmpeg(self):
+        """Test that compressed audio goes in on stdin and PCM comes back on stdout"""
+        result = Mock(returncode=0, stdout=b"\x01\x00" * 441, stderr=b"")
+        with patch('app.services.audio_utils.subprocess.run', return_value=result) as mock_run:
+            wav = decode_to_wav(b"ID3fake-mp3", input_format="mp3")
+
+        cmd = mock_run.call_args[0][0]
+        assert mock_run.call_args[1]["input"] == b"ID3fake-mp3"
+        assert cmd[cmd.index('-i') + 1] == 'pipe:0'
+        assert cmd[-1] == 'pipe:1'
+        params, frames = read_wav(wav)
+        assert params == (1, 2, 44100)
+        assert len(frames) == 882
+
+    def test_raises_on_ffmpeg_error(self):
+        """Test that decode failures surface as errors"""
+        result = Mock(returncode=1, stdout=b"", stderr=b"Invalid data found")
+        with patch('app.services.audio_utils.subprocess.run', return_value=result):
+            with pytest.raises(RuntimeError, match="Invalid data found"):
+                decode_to_wav(b"garbage", input_format="mp3")
+
+
+class TestChunkedSynthesis:
+    def test_chunks_synthesized_concurrently_and_joined_in_order(self):
+        """Test that chunks run in parallel and the output keeps their order"""
+        service = SimpleTTSService()
+        chunks = ["First.", "Second.", "Third.", "Fourth."]
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def generate(chunk):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return tone_wav(chunks.index(chunk) + 1, 10)
+
+        audio = service._synthesize_chunks(generate, chunks, max_workers=4)
+
+        _, frames = read_wav(audio)
+        values = [int.from_bytes(frames[i:i + 2], "little") for i in range(0, len(frames), 20)]
+        assert values == [1, 2, 3, 4]
+        assert active["peak"] > 1
+
+    def test_long_description_is_not_truncated(self):
+        """Test that every chunk of a long description reaches the engine"""
+        service = SimpleTTSService()
+        text = " ".join(f"Room {i} has a large window." for i in range(150))
+        spoken = []
+
+        def fake_gtts(chunk, language_code="en"):
+            spoken.append(chunk)
+            return tone_wav(0, 10)
+
+        with patch('app.services.simple_tts.settings.enable_tts_cache', False), \
+             patch.object(service, '_generate_gtts', side_effect=fake_gtts):
+            service.synthesize_speech(text, "en", "nova")
+
+        assert len(spoken) > 1
+        assert " ".join(sorted(spoken, key=text.index)) == text
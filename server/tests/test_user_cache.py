@@ -0,0 +1,120 @@
+import os
+import tempfile
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.user import User
+from app.services.auth_service import auth_service
+from app.services.user_cache import UserCache, user_cache
+from app.api.v1.endpoints.auth import get_current_user
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory bound to a throwaway SQLite database with one user"""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[User.__table__])
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(User(username="agent", email="agent@example.com", hashed_password="x",
+                    credits=1000, last_credits_refresh=datetime.now(timezone.utc)))
+        db.commit()
+    user_cache.clear()
+    yield factory
+    user_cache.clear()
+    engine.dispose()
+    os.remove(path)
+
+
+@pytest.fixture
+def token():
+    return auth_service.create_access_token(data={"sub": "1"})
+
+
+def count_statements(session_factory):
+    """Collect statements run against the users table"""
+    statements = []
+    engine = session_factory.kw["bind"]
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "users" in statement:
+            statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestUserCache:
+    """Test caching of authenticated users"""
+
+    def test_repeat_requests_skip_the_query(self, session_factory, token):
+        """Test that only the first request for a token loads the user"""
+        statements, stop = count_statements(session_factory)
+        try:
+            for _ in range(5):
+                with session_factory() as db:
+                    user = get_current_user(token, db)
+                    assert (user.username, user.credits) == ("agent", 1000)
+        finally:
+            stop()
+
+        assert statements == ["SELECT"]
+
+    def test_cached_user_is_usable_in_session(self, session_factory, token):
+        """Test that a user rebuilt from the cache can be modified and committed"""
+        with session_factory() as db:
+            get_current_user(token, db)
+        with session_factory() as db:
+            user = get_current_user(token, db)
+            user.full_name = "Estate Agent"
+            db.commit()
+
+        with session_factory() as db:
+            assert db.get(User, 1).full_name == "Estate Agent"
+
+    def test_credit_change_invalidates(self, session_factory, token):
+        """Test that deducting credits drops the cached entry"""
+        with session_factory() as db:
+            get_current_user(token, db)
+
+        with session_factory() as db:
+            db.get(User, 1).credits -= 200
+            db.commit()
+
+        assert user_cache.get(1) is None
+        with session_factory() as db:
+            assert get_current_user(token, db).credits == 800
+
+    def test_daily_refresh_writes_once(self, session_factory, token):
+        """Test that the credit refresh is a single conditional write per day"""
+        with session_factory() as db:
+            user = db.get(User, 1)
+            user.credits = 0
+            user.last_credits_refresh = datetime.now(timezone.utc) - timedelta(days=1)
+            db.commit()
+
+        statements, stop = count_statements(session_factory)
+        try:
+            for _ in range(3):
+                with session_factory() as db:
+                    assert get_current_user(token, db).credits == 1000
+        finally:
+            stop()
+
+        assert statements.count("UPDATE") == 1
+
+    def test_entries_expire(self):
+        """Test TTL expiry and the size bound"""
+        now = [0.0]
+        cache = UserCache(ttl=10, max_entries=2, clock=lambda: now[0])
+        for user_id in (1, 2, 3):
+            cache.put(User(id=user_id, username=f"user{user_id}", email=f"{user_id}@example.com"))
+
+        assert cache.get(1) is None
+        assert cache.get(3)["username"] == "user3"
+        now[0] = 11
+        assert cache.get(3) is None
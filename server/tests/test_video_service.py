@@ -166,7 +166,7 @@ class TestExtractDurations:
             # Mock the subprocess to return a duration
             mock_process = AsyncMock()
             mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(b'123.45', b''))
+            mock_process.communicate = AsyncMock(return_value=(b'{"format": {"duration": "123.45"}, "streams": []}', b''))
             
             with patch('app.services.video_service.asyncio.create_subprocess_exec') as mock_create:
                 mock_create.return_value = mock_process
@@ -210,7 +210,7 @@ class TestExtractDurations:
             # Mock the subprocess to return a duration
             mock_process = AsyncMock()
             mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(b'98.76', b''))
+            mock_process.communicate = AsyncMock(return_value=(b'{"format": {"duration": "98.76"}, "streams": []}', b''))
             
             with patch('app.services.video_service.asyncio.create_subprocess_exec') as mock_create:
                 mock_create.return_value = mock_process
@@ -0,0 +1,115 @@
+import os
+import time
+import asyncio
+import tempfile
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from app.services.job_service import JobProgressWriter
+from app.services.pipeline import StageTimer
+from app.workflows.video_generation import (
+    compiled_workflow,
+    generate_audio,
+    merge_video_audio,
+    process_audio
+)
+
+
+@pytest.fixture
+def sample_video_file():
+    """Create a temporary video file for testing"""
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
+        temp_file.write(b'\x00' * 1000)
+    yield temp_file.name
+    if os.path.exists(temp_file.name):
+        os.remove(temp_file.name)
+
+
+def make_state(video_path, tts_manager=None, video_processor=None, job_id=1):
+    """Build a workflow state with a session that finds no job row"""
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = None
+    return {
+        "input_video_path": video_path,
+        "description_text": "A bright two bedroom apartment.",
+        "target_language": "en",
+        "processed_text": "",
+        "audio_path": "",
+        "output_video_path": "",
+        "job_id": job_id,
+        "db_session": db,
+        "tts_manager": tts_manager,
+        "video_processor": video_processor,
+        "stage_timer": StageTimer(job_id),
+        "progress_writer": JobProgressWriter(db, job_id),
+        "error_message": "",
+        "progress": 0
+    }
+
+
+def slow_tts(delay):
+    """TTS manager whose synthesis blocks like a network call"""
+    def synthesize_speech(text, language, voice):
+        time.sleep(delay)
+        return b'audio'
+    return Mock(synthesize_speech=Mock(side_effect=synthesize_speech))
+
+
+class TestAsyncWorkflowNodes:
+    """Test that workflow nodes offload blocking work"""
+
+    @pytest.mark.asyncio
+    async def test_generate_audio_runs_concurrently(self, sample_video_file):
+        """Test that two blocking TTS calls overlap instead of serialising"""
+        delay = 0.3
+        states = [make_state(sample_video_file, slow_tts(delay), job_id=i) for i in range(2)]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(generate_audio(state) for state in states))
+        elapsed = time.perf_counter() - start
+
+        try:
+            assert all(not result['error_message'] for result in results)
+            assert elapsed < delay * 1.8
+        finally:
+            for result in results:
+                if os.path.exists(result['audio_path']):
+                    os.remove(result['audio_path'])
+
+    @pytest.mark.asyncio
+    async def test_audio_and_merge_use_async_video_service(self, sample_video_file):
+        """Test that process_audio and merge_video_audio await VideoProcessingService"""
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as audio_file:
+            audio_path = audio_file.name
+
+        def write_output(*args):
+            with open(args[-1], 'wb') as f:
+                f.write(b'\x00' * 10)
+            return args[-1]
+
+        video_processor = Mock()
+        video_processor.adjust_audio_to_video_duration = AsyncMock(side_effect=write_output)
+        video_processor.merge_audio_video = AsyncMock(side_effect=write_output)
+
+        state = make_state(sample_video_file, video_processor=video_processor)
+        state['audio_path'] = audio_path
+
+        state = await process_audio(state)
+        assert state['audio_path'].endswith('_adjusted.mp3')
+        assert not os.path.exists(audio_path)
+
+        state = await merge_video_audio(state)
+        os.remove(state['audio_path'])
+        os.remove(state['output_video_path'])
+
+        assert not state['error_message']
+        video_processor.merge_audio_video.assert_awaited_once()
+        assert state['output_video_path'].endswith('.mp4')
+        assert [record['stage'] for record in state['stage_timer'].stages] == ['fit_audio', 'mux']
+        assert state['stage_timer'].stages[1]['bytes_out'] == 10
+
+    @pytest.mark.asyncio
+    async def test_workflow_reports_validation_errors(self):
+        """Test that the compiled graph runs async nodes end to end"""
+        result = await compiled_workflow.ainvoke(make_state('/nonexistent/video.mp4'))
+
+        assert result['error_message'] == "Input video file does not exist"